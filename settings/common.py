@@ -297,6 +297,43 @@ PUBLIC_REGISTER_ENABLED = False
 
 SEARCHES_MAX_RESULTS = 150
 
+# Text search configuration of the projects without search language
+# (None uses the default_text_search_config of the database).
+SEARCHES_TEXT_SEARCH_CONFIG = None
+
+# Persist history entries (diff, values and notifications)
+# on a deferred task instead of on the request.
+HISTORY_DEFERRED_SNAPSHOTS = False
+
+# Seconds after which the pending (deferred) history entries are
+# persisted by the periodic sweeper task.
+HISTORY_PENDING_ENTRIES_MAX_AGE = 60 * 60
+
+# Number of history entries per full snapshot (checkpoint) kept
+# by the compact_history command.
+HISTORY_COMPACT_CHECKPOINT_WINDOW = 500
+
+# Markdown render cache: cache alias of the shared tier, max number
+# of htmls in the per-process tier and timeout of the shared tier.
+MDRENDER_CACHE = "default"
+MDRENDER_CACHE_LOCAL_SIZE = 1000
+MDRENDER_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# Html diffs of descriptions: time budget (seconds) of the character
+# level diff, text size from which diffs are done by lines and
+# timeout of the cached diffs.
+MDRENDER_DIFF_TIMEOUT = 1.0
+MDRENDER_DIFF_LINE_MODE_SIZE = 10000
+MDRENDER_DIFF_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Seconds to wait before invalidating the renders that reference new
+# objects (rendered as missing references), so they are committed.
+MDRENDER_NEW_REFERENCES_INVALIDATION_DELAY = 2
+
+# Seconds to wait before updating the cached stats of a project
+# after a change (changes in the meantime are updated together).
+PROJECT_STATS_UPDATE_DELAY = 10
+
 # NOTE: DON'T INSERT MORE SETTINGS AFTER THIS LINE
 
 #TEST_RUNNER="django.test.runner.DiscoverRunner"
@@ -96,15 +96,33 @@ class IsProjectMemberFilterBackend(FilterBackend):
 
 
 class TagsFilter(FilterBackend):
+    """
+    Filter by tags with the query params:
+
+    - `<filter_name>` or `<filter_name>__all`: objects with all the tags.
+    - `<filter_name>__any`: objects with any of the tags.
+    - `<filter_name>__none`: objects with none of the tags.
+
+    The tags are comma separated.
+    """
+    operators = ("all", "any", "none")
+
     def __init__(self, filter_name='tags'):
         self.filter_name = filter_name
 
-    def _get_tags_queryparams(self, params):
-        return params.get(self.filter_name, "")
+    def _get_tags_queryparams(self, params, operator=None):
+        if operator is None:
+            return params.get(self.filter_name, "")
+        return params.get("{}__{}".format(self.filter_name, operator), "")
 
     def filter_queryset(self, request, queryset, view):
         query_tags = self._get_tags_queryparams(request.QUERY_PARAMS)
         if query_tags:
             queryset = tags.filter(queryset, contains=query_tags)
 
+        for operator in self.operators:
+            query_tags = self._get_tags_queryparams(request.QUERY_PARAMS, operator)
+            if query_tags:
+                queryset = tags.filter(queryset, **{operator: query_tags})
+
         return queryset
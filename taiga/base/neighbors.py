@@ -1,6 +1,8 @@
+from contextlib import closing
 from functools import partial
 from collections import namedtuple
 
+from django.db import connection
 from django.db.models import Q
 
 
@@ -59,6 +61,19 @@ def transform_field_into_lookup(name, value, operator="", operator_if_desc=""):
     return {lookup: value}
 
 
+# Previous and next ids of an object in an ordered query. The subquery
+# numbers its rows with the same ordering, so the window functions
+# don't depend on the order in which the rows are read.
+_NEIGHBORS_SQL = """
+SELECT neighbors.previous_id, neighbors.next_id
+  FROM (SELECT ordered.neighbor_id,
+               LAG(ordered.neighbor_id) OVER (ORDER BY ordered.neighbor_position) AS previous_id,
+               LEAD(ordered.neighbor_id) OVER (ORDER BY ordered.neighbor_position) AS next_id
+          FROM ({sql}) AS ordered) AS neighbors
+ WHERE neighbors.neighbor_id = %s
+"""
+
+
 def get_neighbors(obj, results_set=None):
     """Get the neighbors of a model instance.
 
@@ -72,6 +87,76 @@ def get_neighbors(obj, results_set=None):
     """
     if results_set is None:
         results_set = type(obj).objects.get_queryset()
+
+    neighbors = None
+    if _can_use_window_functions(obj, results_set):
+        neighbors = _get_neighbors_with_window_functions(obj, results_set)
+
+    if neighbors is None:
+        neighbors = _get_neighbors_with_filters(obj, results_set)
+
+    return neighbors
+
+
+def _get_ordering(obj, results_set):
+    return (results_set.query.order_by or []) + list(obj._meta.ordering)
+
+
+def _can_use_window_functions(obj, results_set):
+    """Window functions are used with PostgreSQL, unsliced results sets, not random orderings
+    and models without custom neighbors filters."""
+    if connection.vendor != "postgresql":
+        return False
+    if results_set.query.low_mark or results_set.query.high_mark is not None:
+        return False
+    if "?" in _get_ordering(obj, results_set):
+        return False
+    return not hasattr(obj, "get_neighbors_additional_filters")
+
+
+def _get_neighbors_with_window_functions(obj, results_set):
+    """Get the neighbors with LAG/LEAD over the ordered results set in one query.
+
+    :return: The neighbors or `None` if `obj` is not in the results set (or the results set is
+        ordered by extra selects).
+    """
+    model = results_set.model
+    ordering = _get_ordering(obj, results_set)
+    if not {"id", "-id", "pk", "-pk"}.intersection(ordering):
+        # Untie the objects with the same values of the ordering fields
+        ordering.append("id")
+
+    queryset = results_set.extra(select={"neighbor_id": "{}.id".format(model._meta.db_table)})
+    queryset = queryset.order_by(*ordering)
+    if {name.lstrip("-") for name in ordering}.intersection(queryset.query.extra_select):
+        # Extra selects can't be referenced from the position ordering
+        return None
+
+    sql, params = queryset.values_list("neighbor_id", flat=True).query.sql_with_params()
+    order_by_sql = sql.rsplit(" ORDER BY ", 1)[1]
+    # The ordering includes the id, so dense_rank() numbers the objects like
+    # row_number() but the duplicated rows of an object get the same position
+    # and distinct results sets are still deduplicated.
+    position_sql = "dense_rank() OVER (ORDER BY {})".format(order_by_sql)
+    queryset = queryset.extra(select={"neighbor_position": position_sql})
+    sql, params = queryset.values_list("neighbor_id", "neighbor_position").query.sql_with_params()
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(_NEIGHBORS_SQL.format(sql=sql), tuple(params) + (obj.id,))
+        row = cursor.fetchone()
+
+    if row is None:
+        return None
+
+    previous_id, next_id = row
+    ids = [id for id in row if id is not None]
+    objects = model._default_manager.in_bulk(ids) if ids else {}
+    return Neighbor(objects.get(previous_id), objects.get(next_id))
+
+
+def _get_neighbors_with_filters(obj, results_set):
+    """Get the neighbors with a query for each side, filtering the objects before/after `obj`
+    by the values of the ordering fields."""
     try:
         left = _left_candidates(obj, results_set).reverse()[0]
     except IndexError:
@@ -85,7 +170,7 @@ def get_neighbors(obj, results_set=None):
 
 
 def _get_candidates(obj, results_set, reverse=False):
-    ordering = (results_set.query.order_by or []) + list(obj._meta.ordering)
+    ordering = _get_ordering(obj, results_set)
     main_ordering, rest_ordering = ordering[0], ordering[1:]
     try:
         filters = obj.get_neighbors_additional_filters(results_set, ordering, reverse)
@@ -17,6 +17,9 @@
 from django.forms import widgets
 
 from rest_framework import serializers
+from rest_framework.fields import get_component, is_simple_callable
+
+from taiga.mdrender.service import render_fields
 
 from .neighbors import get_neighbors
 
@@ -46,10 +49,22 @@ class JsonField(serializers.WritableField):
 
 
 class NeighborsSerializerMixin:
+    """
+    Add the neighbors of the object in the filtered list of the view,
+    unless the request has the query param `neighbors=false`.
+    """
+    skip_neighbors_values = ("false", "0")
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields["neighbors"] = serializers.SerializerMethodField("get_neighbors")
+        if not self.skip_neighbors():
+            self.fields["neighbors"] = serializers.SerializerMethodField("get_neighbors")
+
+    def skip_neighbors(self):
+        request = self.context.get("request", None)
+        if request is None:
+            return False
+        return request.QUERY_PARAMS.get("neighbors", "").lower() in self.skip_neighbors_values
 
     def serialize_neighbor(self, neighbor):
         raise NotImplementedError
@@ -66,3 +81,41 @@ class NeighborsSerializerMixin:
             "previous": self.serialize_neighbor(left),
             "next": self.serialize_neighbor(right)
         }
+
+
+class RenderedFieldsSerializerMixin:
+    """
+    Render in batch the markdown fields listed in `rendered_fields`
+    when serializing a list of objects (at top level or nested as a
+    field of other serializer), so `render_field` calls of the
+    serializer methods are served from the instances memo.
+    """
+    rendered_fields = ()
+
+    @property
+    def data(self):
+        if self._data is None and self.many and self.rendered_fields:
+            self.object = list(self.object)
+            render_fields(self.object, *self.rendered_fields)
+        return super().data
+
+    def field_to_native(self, obj, field_name):
+        if not (self.many and self.rendered_fields) or obj is None or self.source == "*":
+            return super().field_to_native(obj, field_name)
+
+        value = obj
+        for component in (self.source or field_name).split("."):
+            if value is None:
+                return None
+            value = get_component(value, component)
+
+        if value is None:
+            return None
+        if is_simple_callable(getattr(value, "all", None)):
+            value = value.all()
+
+        # The same instances are rendered and serialized (related
+        # managers without prefetch return new instances each time).
+        objs = list(value)
+        render_fields(objs, *self.rendered_fields)
+        return [self.to_native(item) for item in objs]
@@ -37,6 +37,17 @@ _filter_contained_by = partial(_filter_bin, operator="<@")
 _filter_overlap = partial(_filter_bin, operator="&&")
 
 
+def _filter_not_overlap(queryset, value):
+    """not (tags && <value>), untagged rows included"""
+    if not isinstance(value, str):
+        value = ",".join(value)
+
+    sql = "NOT coalesce({table_name}.tags && string_to_array(%s, ','), false)"
+    where_clause = sql.format(table_name=get_queryset_table(queryset))
+    queryset = queryset.extra(where=[where_clause], params=[value])
+    return queryset
+
+
 def _filter_index(queryset, index, value):
     """tags[<index>] == <value>"""
     sql = "{table_name}.tags[{index}] = %s"
@@ -104,6 +115,9 @@ def _tags_filter(**filters_map):
 filter = _tags_filter(contains=_filter_contains,
                       contained_by=_filter_contained_by,
                       overlap=_filter_overlap,
+                      all=_filter_contains,
+                      any=_filter_overlap,
+                      none=_filter_not_overlap,
                       len=_filter_len,
                       len__=_filter_len_operator,
                       index__=_filter_index_operator)
@@ -0,0 +1,134 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+from collections import defaultdict
+
+from django.db.models import signals
+from django.db.models.loading import get_model
+from django.dispatch import receiver
+
+
+# Tracked field names by model class
+_tracked_fields = {}
+
+# Tracked field names of models not loaded yet, by (app_label, model_name)
+_pending_tracked_fields = defaultdict(set)
+
+
+def track_fields(model_cls, *field_names):
+    """
+    Remember the values of some fields of the instances of a model as
+    they are loaded from the database (post_init) and after saving them
+    (post_save), so handlers of different apps can detect changes with
+    `get_original_values` without reading the row again.
+
+    The model can be given as "app_label.model_name", then its fields are
+    tracked when it is loaded.
+    """
+    if isinstance(model_cls, str):
+        app_label, model_name = model_cls.split(".", 1)
+        model_cls = get_model(app_label, model_name, seed_cache=False, only_installed=False)
+        if model_cls is None:
+            _pending_tracked_fields[(app_label, model_name.lower())].update(field_names)
+            return
+
+    if model_cls not in _tracked_fields:
+        _tracked_fields[model_cls] = set()
+        dispatch_uid = "original-values-{}.{}".format(model_cls._meta.app_label,
+                                                      model_cls._meta.model_name)
+        signals.post_init.connect(_remember_values_on_init, sender=model_cls,
+                                  dispatch_uid=dispatch_uid + "-init")
+        signals.post_save.connect(_remember_values_on_save, sender=model_cls,
+                                  dispatch_uid=dispatch_uid + "-save")
+
+    _tracked_fields[model_cls].update(field_names)
+
+
+@receiver(signals.class_prepared, dispatch_uid="original-values-class-prepared")
+def _track_pending_fields(sender, **kwargs):
+    key = (sender._meta.app_label, sender._meta.model_name)
+    if key in _pending_tracked_fields:
+        track_fields(sender, *_pending_tracked_fields.pop(key))
+
+
+def _get_attname(model_cls, field_name):
+    return model_cls._meta.get_field(field_name).attname
+
+
+def _remember_values(instance, field_names):
+    original_values = instance.__dict__.setdefault("_original_values", {})
+    for field_name in field_names:
+        attname = _get_attname(instance.__class__, field_name)
+        # Deferred fields are not in the instance __dict__
+        if attname in instance.__dict__:
+            original_values[field_name] = copy.copy(instance.__dict__[attname])
+
+
+def _remember_values_on_init(sender, instance, **kwargs):
+    _remember_values(instance, _tracked_fields[sender])
+
+
+def _remember_values_on_save(sender, instance, update_fields=None, **kwargs):
+    field_names = _tracked_fields[sender]
+    if update_fields is not None:
+        field_names = field_names.intersection(update_fields)
+    _remember_values(instance, field_names)
+
+
+def get_original_values(instance, *field_names):
+    """
+    Get the stored values of some fields of an instance as a
+    {field_name: value} dict (ids for foreign keys), or None if
+    the instance is not saved yet.
+
+    Values of fields not tracked or deferred when the instance
+    was loaded are read from the database.
+    """
+    if instance.pk is None:
+        return None
+
+    original_values = instance.__dict__.setdefault("_original_values", {})
+    missing = [field_name for field_name in field_names if field_name not in original_values]
+    if missing:
+        values = (instance.__class__.objects.filter(pk=instance.pk)
+                                            .values_list(*missing)
+                                            .first())
+        if values is None:
+            return None
+        original_values.update(zip(missing, values))
+
+    return {field_name: original_values[field_name] for field_name in field_names}
+
+
+def get_current_values(instance, *field_names):
+    """
+    Get the values of some fields of an instance in the
+    same format of `get_original_values`.
+    """
+    return {field_name: getattr(instance, _get_attname(instance.__class__, field_name))
+            for field_name in field_names}
+
+
+def has_changed(instance, *field_names):
+    """
+    Check if any of the fields of a saved instance has changed
+    since it was loaded (or saved). Unsaved instances have changed.
+    """
+    original_values = get_original_values(instance, *field_names)
+    if original_values is None:
+        return True
+    return original_values != get_current_values(instance, *field_names)
@@ -0,0 +1,53 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import defaultdict
+
+from django.db.models import signals
+from django.db.models.loading import get_model
+from django.dispatch import receiver
+
+
+# Receivers of models not loaded yet, by (app_label, model_name)
+_pending_receivers = defaultdict(list)
+
+
+def model_receiver(signal, model, *, dispatch_uid):
+    """
+    Like `django.dispatch.receiver` with the sender model given
+    as "app_label.model_name", for modules imported while the
+    models are being loaded (e.g. by mixins of other models).
+    If the model is not loaded yet, the receiver is connected
+    when it is.
+    """
+    app_label, model_name = model.split(".", 1)
+
+    def _decorator(func):
+        model_cls = get_model(app_label, model_name, seed_cache=False, only_installed=False)
+        if model_cls is None:
+            _pending_receivers[(app_label, model_name.lower())].append((signal, func, dispatch_uid))
+        else:
+            signal.connect(func, sender=model_cls, dispatch_uid=dispatch_uid)
+        return func
+
+    return _decorator
+
+
+@receiver(signals.class_prepared, dispatch_uid="model-receiver-class-prepared")
+def _connect_pending_receivers(sender, **kwargs):
+    key = (sender._meta.app_label, sender._meta.model_name)
+    for signal, func, dispatch_uid in _pending_receivers.pop(key, ()):
+        signal.connect(func, sender=sender, dispatch_uid=dispatch_uid)
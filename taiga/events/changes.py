@@ -59,3 +59,27 @@ def emit_change_event_for_model(model_instance, sessionid:str, *,
     backend = backends.get_events_backend()
     return backend.emit_event(json.dumps(data), channel="events")
 
+
+def emit_bulk_change_event_for_models(model_cls, project_id:int, pks:list, sessionid:str, *,
+                                      type:str="create", channel:str="events"):
+    """
+    Emit one change event for several objects of the same
+    model and project (for example, created in bulk).
+    """
+    content_type = _get_type_for_model(model_cls)
+
+    assert content_type in watched_types
+    assert type in ("create", "change", "delete")
+
+    routing_key = "project.{0}".format(project_id)
+
+    data = {"type": "model-changes",
+            "routing_key": routing_key,
+            "session_id": sessionid,
+            "data": {
+                "type": type,
+                "matches": ".".join(content_type),
+                "pks": list(pks)}}
+
+    backend = backends.get_events_backend()
+    return backend.emit_event(json.dumps(data), channel=channel)
@@ -0,0 +1,181 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import get_cache
+from django.utils.encoding import force_bytes
+
+
+class RenderCache:
+    """
+    Two tier cache for rendered markdown: a bounded in-process LRU
+    in front of a shared cache backend.
+
+    Keys include a per-project version, so all renders of a project
+    are invalidated bumping its version (when the users, subjects or
+    slugs embedded in the htmls change). Versions are memoized in
+    process for `version_timeout` seconds.
+    """
+
+    def __init__(self, *, alias=None, local_size=None, timeout=None, version_timeout=10):
+        self._alias = alias
+        self._local_size = local_size
+        self._timeout = timeout
+        self._version_timeout = version_timeout
+
+        self._shared = None
+        self._lock = threading.Lock()
+        self._local = OrderedDict()
+        self._versions = {}
+        self.stats = {"local_hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0}
+
+    @property
+    def shared(self):
+        if self._shared is None:
+            self._shared = get_cache(self._alias or getattr(settings, "MDRENDER_CACHE", "default"))
+        return self._shared
+
+    @property
+    def local_size(self):
+        if self._local_size is not None:
+            return self._local_size
+        return getattr(settings, "MDRENDER_CACHE_LOCAL_SIZE", 1000)
+
+    @property
+    def timeout(self):
+        if self._timeout is not None:
+            return self._timeout
+        return getattr(settings, "MDRENDER_CACHE_TIMEOUT", None)
+
+    def _make_version_key(self, project_id):
+        return "mdrender-version-{}".format(project_id)
+
+    def get_version(self, project_id):
+        now = time.monotonic()
+        memo = self._versions.get(project_id, None)
+        if memo is not None and memo[1] > now:
+            return memo[0]
+
+        key = self._make_version_key(project_id)
+        version = self.shared.get(key, None)
+        if version is None:
+            self.shared.add(key, 1, timeout=None)
+            version = self.shared.get(key, 1)
+
+        self._versions[project_id] = (version, now + self._version_timeout)
+        return version
+
+    def bump_version(self, project_id):
+        key = self._make_version_key(project_id)
+        try:
+            version = self.shared.incr(key)
+        except ValueError:
+            # The version is not in the shared cache yet
+            version = 2
+            self.shared.set(key, version, timeout=None)
+
+        self._versions[project_id] = (version, time.monotonic() + self._version_timeout)
+        return version
+
+    def make_key(self, project, text):
+        return self._make_key(project.id, text)
+
+    def _make_key(self, project_id, text):
+        sha1_hash = hashlib.sha1(force_bytes(text)).hexdigest()
+        return "mdrender-{}-{}-{}".format(project_id, self.get_version(project_id), sha1_hash)
+
+    def _get_local(self, key):
+        with self._lock:
+            value = self._local.get(key, None)
+            if value is not None:
+                self._local.move_to_end(key)
+            return value
+
+    def _set_local(self, key, value):
+        with self._lock:
+            self._local[key] = value
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def get_many(self, project, texts):
+        """
+        Get the cached htmls of a list of texts as a {text: html}
+        dict. Texts without cached html are not included.
+        """
+        keys = {self.make_key(project, text): text for text in texts}
+        result, pending = {}, []
+
+        for key, text in keys.items():
+            value = self._get_local(key)
+            if value is not None:
+                self.stats["local_hits"] += 1
+                result[text] = value
+            else:
+                pending.append(key)
+
+        if pending:
+            shared_values = self.shared.get_many(pending)
+            for key in pending:
+                value = shared_values.get(key, None)
+                if value is not None:
+                    self.stats["shared_hits"] += 1
+                    self._set_local(key, value)
+                    result[keys[key]] = value
+                else:
+                    self.stats["misses"] += 1
+
+        return result
+
+    def set_many(self, project, htmls):
+        """
+        Store a {text: html} dict of renders of a project.
+        """
+        values = {self.make_key(project, text): html for text, html in htmls.items()}
+        for key, value in values.items():
+            self._set_local(key, value)
+        self.shared.set_many(values, timeout=self.timeout)
+
+    def get(self, project, text):
+        return self.get_many(project, [text]).get(text, None)
+
+    def set(self, project, text, html):
+        self.set_many(project, {text: html})
+
+    def delete_many(self, project_id, texts):
+        """
+        Remove the renders of some texts of a project.
+        """
+        keys = [self._make_key(project_id, text) for text in texts]
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+        self.shared.delete_many(keys)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+            self._versions.clear()
+
+
+render_cache = RenderCache()
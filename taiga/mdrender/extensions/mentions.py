@@ -30,9 +30,16 @@ from markdown.util import etree
 from taiga.users.models import User
 
 
+MENTION_RE = r'(?<=^|(?<=[^a-zA-Z0-9-_\.]))@([A-Za-z]+[A-Za-z0-9-]+)'
+
+
 class MentionsExtension(Extension):
+    """
+    Link mentions to users (@<username>). If the markdown instance
+    has a `mentions_lookup` dict (username -> user), users are
+    taken from it instead of queried one by one.
+    """
     def extendMarkdown(self, md, md_globals):
-        MENTION_RE = r'(?<=^|(?<=[^a-zA-Z0-9-_\.]))@([A-Za-z]+[A-Za-z0-9-]+)'
         mentionsPattern = MentionsPattern(MENTION_RE)
         mentionsPattern.md = md
         md.inlinePatterns.add('mentions', mentionsPattern, '_begin')
@@ -42,9 +49,16 @@ class MentionsPattern(Pattern):
     def handleMatch(self, m):
         username = m.group(2)
 
-        try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
+        lookup = getattr(self.md, "mentions_lookup", None)
+        if lookup is not None:
+            user = lookup.get(username, None)
+        else:
+            try:
+                user = User.objects.get(username=username)
+            except User.DoesNotExist:
+                user = None
+
+        if user is None:
             return "@{}".format(username)
 
         url = "/#/profile/{}".format(username)
@@ -30,27 +30,33 @@ from markdown.util import etree
 from taiga.projects.references.services import get_instance_by_ref
 
 
-class TaigaReferencesExtension(Extension):
-    def __init__(self, project, *args, **kwargs):
-        self.project = project
-        return super().__init__(*args, **kwargs)
+TAIGA_REFERENCE_RE = r'(?<=^|(?<=[^a-zA-Z0-9-\[]))#(\d+)'
+
 
+class TaigaReferencesExtension(Extension):
+    """
+    Link references to project objects (#<ref>). The project is
+    read from `md.project` on each render, so the same markdown
+    instance can be reused for different projects. If it has a
+    `references_lookup` dict (ref -> reference), references are
+    taken from it instead of queried one by one.
+    """
     def extendMarkdown(self, md, md_globals):
-        TAIGA_REFERENCE_RE = r'(?<=^|(?<=[^a-zA-Z0-9-\[]))#(\d+)'
-        referencesPattern = TaigaReferencesPattern(TAIGA_REFERENCE_RE, self.project)
+        referencesPattern = TaigaReferencesPattern(TAIGA_REFERENCE_RE)
         referencesPattern.md = md
         md.inlinePatterns.add('taiga-references', referencesPattern, '_begin')
 
 
 class TaigaReferencesPattern(Pattern):
-    def __init__(self, pattern, project):
-        self.project = project
-        super().__init__(pattern)
-
     def handleMatch(self, m):
         obj_ref = m.group(2)
+        project = self.md.project
 
-        instance = get_instance_by_ref(self.project.id, obj_ref)
+        lookup = getattr(self.md, "references_lookup", None)
+        if lookup is not None:
+            instance = lookup.get(int(obj_ref), None)
+        else:
+            instance = get_instance_by_ref(project.id, obj_ref)
         if instance is None:
             return "#{}".format(obj_ref)
 
@@ -69,7 +75,7 @@ class TaigaReferencesPattern(Pattern):
             return "#{}".format(obj_ref)
 
         url = "/#/project/{}/{}/{}".format(
-            self.project.slug,
+            project.slug,
             obj_section,
             obj_ref
         )
@@ -61,6 +61,8 @@ class WikiLinks(Pattern):
     def _getMeta(self):
         """ Return meta data or config data. """
         base_url = self.config['base_url']
+        if callable(base_url):
+            base_url = base_url(self.md)
         end_url = self.config['end_url']
         html_class = self.config['html_class']
         return base_url, end_url, html_class
@@ -0,0 +1,77 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction as tx
+from django.db.models.loading import get_model
+
+from taiga.mdrender import service
+from taiga.mdrender.cache import render_cache
+
+
+class Command(BaseCommand):
+    help = "Render again the stored html of markdown fields (after markdown pipeline changes)."
+
+    option_list = BaseCommand.option_list + (
+        make_option("--chunk-size", action="store", type="int", dest="chunk_size",
+                    default=500, help="Number of objects rendered by transaction."),
+        make_option("--project", action="append", type="int", dest="projects",
+                    default=None, help="Only render objects of this project id (can be repeated)."),
+        make_option("--lazy", action="store_true", dest="lazy", default=False,
+                    help="Only clear the stored html, it will be rendered on read."),
+    )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size should be greater than 0")
+
+        project_ids = options["projects"]
+        if project_ids is None:
+            project_ids = list(get_model("projects", "Project").objects.values_list("id", flat=True))
+
+        for project_id in project_ids:
+            render_cache.bump_version(project_id)
+
+        if options["lazy"]:
+            for project_id in project_ids:
+                service.invalidate_stored_renders(project_id)
+            self.stdout.write("Stored html cleared of {} projects.".format(len(project_ids)))
+            return
+
+        for typename in service.STORED_RENDERS:
+            self.rerender_model(get_model(*typename.split(".")), options["projects"], chunk_size)
+
+    def rerender_model(self, model_cls, project_ids, chunk_size):
+        qs = model_cls.objects.select_related("project").order_by("pk")
+        if project_ids is not None:
+            qs = qs.filter(project_id__in=project_ids)
+
+        last_pk, total = 0, 0
+        while True:
+            objs = list(qs.filter(pk__gt=last_pk)[:chunk_size])
+            if not objs:
+                break
+
+            with tx.atomic():
+                service.rerender_stored_fields(objs)
+
+            last_pk = objs[-1].pk
+            total += len(objs)
+            self.stdout.write("{}: {} objects rendered.".format(model_cls._meta.verbose_name, total))
@@ -14,12 +14,22 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import re
 import hashlib
 import functools
+import threading
+from contextlib import closing
+from contextlib import contextmanager
 
+from django.conf import settings
 from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.db.models.loading import get_model
 from django.utils.encoding import force_bytes
 
+from taiga.deferred import apply_async
+
 from markdown import Markdown
 
 from .extensions.autolink import AutolinkExtension
@@ -30,10 +40,16 @@ from .extensions.strikethrough import StrikethroughExtension
 from .extensions.wikilinks import WikiLinkExtension
 from .extensions.emojify import EmojifyExtension
 from .extensions.mentions import MentionsExtension
+from .extensions.mentions import MENTION_RE
 from .extensions.references import TaigaReferencesExtension
+from .extensions.references import TAIGA_REFERENCE_RE
+from .cache import render_cache
+
+from taiga.projects.references.services import get_instances_by_refs
+from taiga.users.models import User
 
 
-def _make_extensions_list(wikilinks_config=None, project=None):
+def _make_extensions_list(wikilinks_config=None):
     return [AutolinkExtension(),
             AutomailExtension(),
             SemiSaneListExtension(),
@@ -42,7 +58,7 @@ def _make_extensions_list(wikilinks_config=None, project=None):
             WikiLinkExtension(wikilinks_config),
             EmojifyExtension(),
             MentionsExtension(),
-            TaigaReferencesExtension(project),
+            TaigaReferencesExtension(),
             "extra",
             "codehilite"]
 
@@ -53,49 +69,426 @@ import diff_match_patch
 def cache_by_sha(func):
     @functools.wraps(func)
     def _decorator(project, text):
-        sha1_hash = hashlib.sha1(force_bytes(text)).hexdigest()
-        key = "{}-{}".format(sha1_hash, project.id)
-
         # Try to get it from the cache
-        cached = cache.get(key)
+        cached = render_cache.get(project, text)
         if cached is not None:
             return cached
 
         returned_value = func(project, text)
-        cache.set(key, returned_value, timeout=None)
+        render_cache.set(project, text, returned_value)
         return returned_value
 
     return _decorator
 
 
-def _get_markdown(project):
-    wikilinks_config = {"base_url": "#/project/{}/wiki/".format(project.slug),
+def _wikilinks_base_url(md):
+    return "#/project/{}/wiki/".format(md.project.slug)
+
+
+def _make_markdown():
+    wikilinks_config = {"base_url": _wikilinks_base_url,
                         "end_url": ""}
-    extensions = _make_extensions_list(wikilinks_config=wikilinks_config,
-                                       project=project)
+    extensions = _make_extensions_list(wikilinks_config=wikilinks_config)
     md = Markdown(extensions=extensions)
-    md.extracted_data = {"mentions": [], "references": []}
+    md.project = None
+    md.extracted_data = None
+    md.mentions_lookup = None
+    md.references_lookup = None
     return md
 
 
+def _reset_document(md):
+    md.reset()
+
+    # Abbreviations are registered as inline patterns
+    # while converting and are not cleaned by reset()
+    for name in [name for name in md.inlinePatterns if name.startswith("abbr-")]:
+        del md.inlinePatterns[name]
+
+
+def _reset_markdown(md):
+    _reset_document(md)
+    md.project = None
+    md.extracted_data = None
+    md.mentions_lookup = None
+    md.references_lookup = None
+
+
+# Per-process pool of idle markdown engines. Building an engine
+# (extensions, patterns, pygments setup) is much more expensive
+# than rendering a usual description, so engines are reused and
+# the project is set for each render.
+_markdown_pool = []
+_markdown_pool_lock = threading.Lock()
+
+
+@contextmanager
+def _get_markdown(project):
+    with _markdown_pool_lock:
+        md = _markdown_pool.pop() if _markdown_pool else None
+
+    if md is None:
+        md = _make_markdown()
+
+    md.project = project
+    md.extracted_data = {"mentions": [], "references": []}
+
+    try:
+        yield md
+    finally:
+        _reset_markdown(md)
+        with _markdown_pool_lock:
+            if len(_markdown_pool) < getattr(settings, "MDRENDER_POOL_SIZE", 8):
+                _markdown_pool.append(md)
+
+
 @cache_by_sha
 def render(project, text):
-    md = _get_markdown(project)
-    return md.convert(text)
+    with _get_markdown(project) as md:
+        return md.convert(text)
+
+
+def _make_mentions_lookup(texts):
+    usernames = set()
+    for text in texts:
+        usernames.update(re.findall(MENTION_RE, text))
+
+    if not usernames:
+        return {}
+    return {user.username: user for user in User.objects.filter(username__in=usernames)}
+
+
+def _make_references_lookup(project, texts):
+    refs = set()
+    for text in texts:
+        refs.update(int(ref) for ref in re.findall(TAIGA_REFERENCE_RE, text))
+
+    if not refs:
+        return {}
+    return get_instances_by_refs(project.id, refs)
+
+
+def render_many(project, texts):
+    """
+    Render a list of markdown texts of a project, returning the list
+    of htmls. Mentioned users and referenced objects of all texts are
+    fetched in bulk before rendering instead of one by one.
+    """
+    cached = render_cache.get_many(project, texts)
+
+    pending = set(text for text in texts if text not in cached)
+    if pending:
+        rendered = {}
+        with _get_markdown(project) as md:
+            md.mentions_lookup = _make_mentions_lookup(pending)
+            md.references_lookup = _make_references_lookup(project, pending)
+
+            for text in pending:
+                rendered[text] = md.convert(text)
+                _reset_document(md)
+
+        render_cache.set_many(project, rendered)
+        cached.update(rendered)
+
+    return [cached[text] for text in texts]
+
+
+# Markdown fields with a stored html column (`<field>_html`).
+STORED_RENDERS = {
+    "userstories.UserStory": ("description", "blocked_note"),
+    "issues.Issue": ("description", "blocked_note"),
+    "tasks.Task": ("description", "blocked_note"),
+    "wiki.WikiPage": ("content",),
+}
+
+
+def get_stored_fields(model_cls):
+    typename = "{}.{}".format(model_cls._meta.app_label, model_cls._meta.object_name)
+    return STORED_RENDERS.get(typename, ())
+
+
+def _get_stored_html(obj, field_name):
+    """
+    Get the stored html of a field if it is the render of
+    the current value of the field (the one loaded from the
+    database), otherwise None.
+    """
+    loaded_texts = obj.__dict__.get("_stored_render_texts", {})
+    if field_name not in loaded_texts:
+        return None
+
+    if loaded_texts[field_name] != getattr(obj, field_name):
+        return None
+
+    return getattr(obj, "{}_html".format(field_name))
+
+
+def _store_htmls(model_cls, field_name, items):
+    """
+    Store the htmls of a markdown field of several instances of a
+    model with a single UPDATE. `items` is a list of (obj, text, html)
+    tuples, the html of an object is stored only if its text has not
+    changed in the meantime.
+    """
+    html_field_name = "{}_html".format(field_name)
+    values = []
+    for obj, text, html in items:
+        setattr(obj, html_field_name, html)
+        obj.__dict__.setdefault("_stored_render_texts", {})[field_name] = text
+        if obj.pk is not None:
+            values.append((obj.pk, text, html))
+
+    if not values:
+        return
+
+    qn = connection.ops.quote_name
+    sql = """
+    UPDATE {table} SET {html_column} = rendered.html
+      FROM (VALUES {values}) AS rendered (id, text, html)
+     WHERE {table}.id = rendered.id AND
+           {table}.{column} = rendered.text;
+    """.format(table=qn(model_cls._meta.db_table),
+               column=qn(model_cls._meta.get_field(field_name).column),
+               html_column=qn(model_cls._meta.get_field(html_field_name).column),
+               values=", ".join(["(%s, %s, %s)"] * len(values)))
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, [value for row in values for value in row])
+
+
+def _store_pending_htmls(pending):
+    """
+    Store a list of (obj, field_name, text, html) renders with
+    one UPDATE per model and field.
+    """
+    grouped = {}
+    for obj, field_name, text, html in pending:
+        grouped.setdefault((obj.__class__, field_name), []).append((obj, text, html))
+
+    for (model_cls, field_name), items in grouped.items():
+        _store_htmls(model_cls, field_name, items)
+
+
+def _store_html(obj, field_name, text, html):
+    _store_htmls(obj.__class__, field_name, [(obj, text, html)])
+
+
+def render_stored_fields(obj):
+    """
+    Render the markdown fields of an instance into their stored
+    html columns. Used before saving the instance.
+    """
+    rendered = obj.__dict__.setdefault("_rendered_fields", {})
+    loaded_texts = obj.__dict__.setdefault("_stored_render_texts", {})
+
+    for field_name in get_stored_fields(obj.__class__):
+        text = getattr(obj, field_name)
+        if _get_stored_html(obj, field_name) is None:
+            html = render(obj.project, text)
+            setattr(obj, "{}_html".format(field_name), html)
+            loaded_texts[field_name] = text
+        rendered[(field_name, text)] = getattr(obj, "{}_html".format(field_name))
+
+
+def render_fields(objs, *field_names):
+    """
+    Render in batch markdown fields of a list of model instances
+    without stored html, storing and memoizing the results on the
+    instances for `render_field`.
+    """
+    by_project = {}
+    for obj in objs:
+        rendered = obj.__dict__.get("_rendered_fields", {})
+        for field_name in field_names:
+            if (field_name, getattr(obj, field_name)) in rendered:
+                continue
+            if _get_stored_html(obj, field_name) is None:
+                by_project.setdefault(obj.project_id, []).append((obj, field_name))
+
+    to_store = []
+    for pending in by_project.values():
+        project = pending[0][0].project
+        texts = [getattr(obj, field_name) for obj, field_name in pending]
+        htmls = render_many(project, texts)
+
+        for (obj, field_name), text, html in zip(pending, texts, htmls):
+            obj.__dict__.setdefault("_rendered_fields", {})[(field_name, text)] = html
+            if field_name in get_stored_fields(obj.__class__):
+                to_store.append((obj, field_name, text, html))
+
+    _store_pending_htmls(to_store)
+
+
+def rerender_stored_fields(objs):
+    """
+    Render again and store the markdown fields of a list of
+    instances of the same model (e.g. after a change of the markdown
+    pipeline), only the htmls that change are written. Cached renders
+    should be invalidated before.
+    """
+    by_project = {}
+    for obj in objs:
+        by_project.setdefault(obj.project_id, []).append(obj)
+
+    to_store = []
+    for project_objs in by_project.values():
+        project = project_objs[0].project
+        field_names = get_stored_fields(project_objs[0].__class__)
+        texts = [getattr(obj, field_name) for obj in project_objs for field_name in field_names]
+        htmls = iter(render_many(project, texts))
+
+        for obj in project_objs:
+            for field_name in field_names:
+                html = next(htmls)
+                # Unchanged htmls are not written again
+                if getattr(obj, "{}_html".format(field_name)) != html:
+                    to_store.append((obj, field_name, getattr(obj, field_name), html))
+
+    _store_pending_htmls(to_store)
+
+
+def _make_contains_regex(value):
+    # Not followed by a word character, so "#12" doesn't match "#123"
+    # (in PostgreSQL regexps \b is a backspace, not a word boundary).
+    return r"{}(?!\w)".format(re.escape(value))
+
+
+def _filter_containing(qs, field_name, contains):
+    condition = Q()
+    for value in contains:
+        condition |= Q(**{"{}__regex".format(field_name): _make_contains_regex(value)})
+    return qs.filter(condition)
+
+
+def invalidate_stored_renders(project_id, *, contains=None):
+    """
+    Clear the stored html of the objects of a project, all of them
+    or those whose markdown contains any of the `contains` strings
+    (as whole words).
+    They are rendered again when they are read.
+    """
+    for typename, field_names in STORED_RENDERS.items():
+        model_cls = get_model(*typename.split("."))
+        for field_name in field_names:
+            html_field_name = "{}_html".format(field_name)
+            qs = model_cls.objects.filter(project_id=project_id)
+            qs = qs.exclude(**{"{}__isnull".format(html_field_name): True})
+
+            if contains is not None:
+                qs = _filter_containing(qs, field_name, contains)
+
+            qs.update(**{html_field_name: None})
+
+
+def invalidate_new_references_renders(project_id, refs):
+    """
+    Invalidate the renders of the texts of a project that reference
+    just created refs (they were rendered as missing references): the
+    stored htmls of those texts and their cached renders. The render
+    version of the project is not bumped, other renders are still valid.
+    """
+    contains = ["#{}".format(ref) for ref in refs]
+    if not contains:
+        return
+
+    texts = set()
+    for typename, field_names in STORED_RENDERS.items():
+        model_cls = get_model(*typename.split("."))
+        for field_name in field_names:
+            html_field_name = "{}_html".format(field_name)
+            qs = _filter_containing(model_cls.objects.filter(project_id=project_id),
+                                    field_name, contains)
+
+            field_texts = set(qs.values_list(field_name, flat=True))
+            if field_texts:
+                texts.update(field_texts)
+                qs.exclude(**{"{}__isnull".format(html_field_name): True}).update(**{html_field_name: None})
+
+    if texts:
+        render_cache.delete_many(project_id, texts)
+
+
+def defer_new_references_invalidation(project_id, refs):
+    """
+    Run `invalidate_new_references_renders` in a deferred task, it
+    scans the markdown fields of the whole project. It is delayed
+    until the objects of the refs are committed, so the renders of
+    the task can resolve them.
+    """
+    refs = [ref for ref in refs if ref is not None]
+    if not refs:
+        return
+
+    delay = getattr(settings, "MDRENDER_NEW_REFERENCES_INVALIDATION_DELAY", 2)
+    apply_async("mdrender.invalidate_new_references_renders", (project_id, refs), countdown=delay)
+
+
+def invalidate_project_renders(project_id, *, contains=None):
+    """
+    Invalidate the cached renders of a project and its stored
+    html (see `invalidate_stored_renders`).
+    """
+    render_cache.bump_version(project_id)
+    invalidate_stored_renders(project_id, contains=contains)
+
+
+def get_render_cache_stats():
+    """
+    Get the hit, miss and eviction counters of the render cache
+    of this process.
+    """
+    return dict(render_cache.stats)
+
+
+def render_field(obj, field_name):
+    """
+    Render a markdown field of a model instance, memoizing the
+    result on the instance. It allows that serializers and
+    history freezers share the same render of an instance.
+
+    The stored html of the field is used if any, otherwise it is
+    rendered and stored.
+    """
+    text = getattr(obj, field_name)
+    rendered = obj.__dict__.setdefault("_rendered_fields", {})
+
+    key = (field_name, text)
+    if key not in rendered:
+        html = None
+        if field_name in get_stored_fields(obj.__class__):
+            html = _get_stored_html(obj, field_name)
+
+        if html is None:
+            html = render(obj.project, text)
+            if field_name in get_stored_fields(obj.__class__):
+                _store_html(obj, field_name, text, html)
+
+        rendered[key] = html
+    return rendered[key]
+
+
+def share_rendered_fields(obj, other):
+    """
+    Make `other` instance (usually a fresh copy of `obj` from the
+    database) share the rendered fields memo of `obj`.
+    """
+    other._rendered_fields = obj.__dict__.setdefault("_rendered_fields", {})
 
 
 def render_and_extract(project, text):
-    md = _get_markdown(project)
-    result = md.convert(text)
-    return (result, md.extracted_data)
+    with _get_markdown(project) as md:
+        result = md.convert(text)
+        return (result, md.extracted_data)
+
+
+_DIFF_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", "\n": "<br />"})
 
 
 class DiffMatchPatch(diff_match_patch.diff_match_patch):
     def diff_pretty_html(self, diffs):
         html = []
         for (op, data) in diffs:
-            text = (data.replace("&", "&amp;").replace("<", "&lt;")
-                    .replace(">", "&gt;").replace("\n", "<br />"))
+            text = data.translate(_DIFF_HTML_ESCAPE)
             if op == self.DIFF_INSERT:
                 html.append("<ins style=\"background:#e6ffe6;\">%s</ins>" % text)
             elif op == self.DIFF_DELETE:
@@ -104,10 +497,55 @@ class DiffMatchPatch(diff_match_patch.diff_match_patch):
                 html.append("<span>%s</span>" % text)
         return "".join(html)
 
+    def diff_lines(self, text1, text2):
+        """
+        Line level diff: lines are diffed as units, what is much
+        faster than the character level diff on long texts.
+        """
+        chars1, chars2, lines = self.diff_linesToChars(text1, text2)
+        diffs = self.diff_main(chars1, chars2, False)
+        self.diff_charsToLines(diffs, lines)
+        self.diff_cleanupSemantic(diffs)
+        return diffs
 
-def get_diff_of_htmls(html1, html2):
+
+def _make_diffs(html1, html2):
     diffutil = DiffMatchPatch()
-    diff = diffutil.diff_main(html1, html2)
-    return diffutil.diff_pretty_html(diff)
+    diffutil.Diff_Timeout = getattr(settings, "MDRENDER_DIFF_TIMEOUT", 1.0)
+
+    # Fast path for append only edits
+    if html2.startswith(html1):
+        diffs = [(diffutil.DIFF_EQUAL, html1), (diffutil.DIFF_INSERT, html2[len(html1):])]
+        return diffutil, [diff for diff in diffs if diff[1]]
+
+    line_mode_size = getattr(settings, "MDRENDER_DIFF_LINE_MODE_SIZE", 10000)
+    if max(len(html1), len(html2)) > line_mode_size:
+        diffs = diffutil.diff_lines(html1, html2)
+    else:
+        diffs = diffutil.diff_main(html1, html2)
+        diffutil.diff_cleanupSemantic(diffs)
+
+    return diffutil, diffs
+
+
+def get_diff_of_htmls(html1, html2):
+    """
+    Get the html of the diff of two texts. Long texts are diffed by
+    lines and the character level diff is bounded by the
+    MDRENDER_DIFF_TIMEOUT seconds budget. Results are cached.
+    """
+    key = "mdrender-diff-{}-{}".format(hashlib.sha1(force_bytes(html1)).hexdigest(),
+                                       hashlib.sha1(force_bytes(html2)).hexdigest())
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    diffutil, diffs = _make_diffs(html1, html2)
+    result = diffutil.diff_pretty_html(diffs)
+    cache.set(key, result, timeout=getattr(settings, "MDRENDER_DIFF_CACHE_TIMEOUT", 60 * 60 * 24))
+    return result
 
-__all__ = ["render", "get_diff_of_htmls", "render_and_extract"]
+__all__ = ["render", "render_many", "render_field", "render_fields", "get_diff_of_htmls",
+           "render_and_extract", "render_stored_fields", "rerender_stored_fields", "invalidate_project_renders",
+           "invalidate_stored_renders", "invalidate_new_references_renders",
+           "defer_new_references_invalidation", "get_render_cache_stats"]
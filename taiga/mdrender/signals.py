@@ -0,0 +1,183 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from django.db.models.loading import get_model
+from django.db.models import signals
+from django.dispatch import receiver
+
+from taiga.base.utils.original_values import track_fields
+from taiga.base.utils.original_values import get_original_values
+from taiga.base.utils.original_values import get_current_values
+
+from . import service
+
+# Rendered htmls embed user names (mentions), subjects of referenced
+# objects (references) and the project slug (references and wiki
+# links). When any of them change, renders of the affected projects
+# are invalidated: their render cache version is bumped and the
+# stored htmls that can contain them are cleared. New objects only
+# invalidate the renders that reference them.
+
+_RENDERED_VALUES_FIELDS = {
+    "users.User": ("username", "full_name"),
+    "projects.Project": ("slug",),
+    "userstories.UserStory": ("subject", "ref"),
+    "issues.Issue": ("subject", "ref"),
+    "tasks.Task": ("subject", "ref"),
+}
+
+for typename, field_names in _RENDERED_VALUES_FIELDS.items():
+    track_fields(get_model(*typename.split(".")), *field_names)
+
+
+def _get_prev_values(sender, instance, update_fields, field_names):
+    """
+    Get the stored values of the fields if any of them has
+    changed in the instance, otherwise None.
+    """
+    if update_fields is not None and not set(update_fields) & set(field_names):
+        return None
+
+    prev_values = get_original_values(instance, *field_names)
+    if prev_values is None or prev_values == get_current_values(instance, *field_names):
+        return None
+
+    return tuple(prev_values[name] for name in field_names)
+
+
+@receiver(signals.pre_save, sender=get_model("users", "User"),
+          dispatch_uid="mdrender_user_pre_save")
+@receiver(signals.pre_save, sender=get_model("projects", "Project"),
+          dispatch_uid="mdrender_project_pre_save")
+@receiver(signals.pre_save, sender=get_model("userstories", "UserStory"),
+          dispatch_uid="mdrender_userstory_pre_save")
+@receiver(signals.pre_save, sender=get_model("issues", "Issue"),
+          dispatch_uid="mdrender_issue_pre_save")
+@receiver(signals.pre_save, sender=get_model("tasks", "Task"),
+          dispatch_uid="mdrender_task_pre_save")
+def mark_rendered_values_changes(sender, instance, update_fields=None, **kwargs):
+    field_names = _RENDERED_VALUES_FIELDS["{}.{}".format(sender._meta.app_label, sender.__name__)]
+
+    instance._mdrender_prev_values = _get_prev_values(sender, instance, update_fields, field_names)
+
+
+@receiver(signals.post_save, sender=get_model("users", "User"),
+          dispatch_uid="mdrender_user_post_save")
+def invalidate_user_projects_renders(sender, instance, created, **kwargs):
+    prev_values = getattr(instance, "_mdrender_prev_values", None)
+    if prev_values is None:
+        return
+
+    contains = ["@{}".format(prev_values[0]), "@{}".format(instance.username)]
+
+    membership_model = get_model("projects", "Membership")
+    project_ids = membership_model.objects.filter(user=instance).values_list("project_id", flat=True)
+    for project_id in set(project_ids):
+        service.invalidate_project_renders(project_id, contains=contains)
+
+
+@receiver(signals.post_save, sender=get_model("projects", "Project"),
+          dispatch_uid="mdrender_project_post_save")
+def invalidate_renders_on_project_change(sender, instance, created, **kwargs):
+    if getattr(instance, "_mdrender_prev_values", None) is not None:
+        service.invalidate_project_renders(instance.pk)
+
+
+@receiver(signals.post_save, sender=get_model("userstories", "UserStory"),
+          dispatch_uid="mdrender_userstory_post_save")
+@receiver(signals.post_save, sender=get_model("issues", "Issue"),
+          dispatch_uid="mdrender_issue_post_save")
+@receiver(signals.post_save, sender=get_model("tasks", "Task"),
+          dispatch_uid="mdrender_task_post_save")
+def invalidate_referenced_object_project_renders(sender, instance, created, **kwargs):
+    # Objects without ref can't be referenced
+    if instance.ref is None:
+        return
+
+    # Only the renders that reference the ref of new objects change
+    if created:
+        service.defer_new_references_invalidation(instance.project_id, [instance.ref])
+        return
+
+    prev_values = getattr(instance, "_mdrender_prev_values", None)
+    if prev_values is None:
+        return
+
+    refs = {prev_values[1], instance.ref} - {None}
+    service.invalidate_project_renders(instance.project_id,
+                                       contains=["#{}".format(ref) for ref in refs])
+
+
+@receiver(signals.post_delete, sender=get_model("userstories", "UserStory"),
+          dispatch_uid="mdrender_userstory_post_delete")
+@receiver(signals.post_delete, sender=get_model("issues", "Issue"),
+          dispatch_uid="mdrender_issue_post_delete")
+@receiver(signals.post_delete, sender=get_model("tasks", "Task"),
+          dispatch_uid="mdrender_task_post_delete")
+def invalidate_deleted_object_project_renders(sender, instance, **kwargs):
+    if instance.ref is not None:
+        service.invalidate_project_renders(instance.project_id,
+                                           contains=["#{}".format(instance.ref)])
+
+
+# Stored htmls
+
+@receiver(signals.post_init, sender=get_model("userstories", "UserStory"),
+          dispatch_uid="mdrender_userstory_post_init")
+@receiver(signals.post_init, sender=get_model("issues", "Issue"),
+          dispatch_uid="mdrender_issue_post_init")
+@receiver(signals.post_init, sender=get_model("tasks", "Task"),
+          dispatch_uid="mdrender_task_post_init")
+@receiver(signals.post_init, sender=get_model("wiki", "WikiPage"),
+          dispatch_uid="mdrender_wikipage_post_init")
+def remember_stored_render_texts(sender, instance, **kwargs):
+    # Texts of the stored htmls, to detect unsaved changes.
+    # Deferred fields are not in the instance __dict__.
+    instance._stored_render_texts = {name: instance.__dict__[name]
+                                     for name in service.get_stored_fields(sender)
+                                     if name in instance.__dict__}
+
+
+@receiver(signals.pre_save, sender=get_model("userstories", "UserStory"),
+          dispatch_uid="mdrender_userstory_render_pre_save")
+@receiver(signals.pre_save, sender=get_model("issues", "Issue"),
+          dispatch_uid="mdrender_issue_render_pre_save")
+@receiver(signals.pre_save, sender=get_model("tasks", "Task"),
+          dispatch_uid="mdrender_task_render_pre_save")
+@receiver(signals.pre_save, sender=get_model("wiki", "WikiPage"),
+          dispatch_uid="mdrender_wikipage_render_pre_save")
+def render_stored_fields(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None:
+        service.render_stored_fields(instance)
+
+
+@receiver(signals.post_save, sender=get_model("userstories", "UserStory"),
+          dispatch_uid="mdrender_userstory_render_post_save")
+@receiver(signals.post_save, sender=get_model("issues", "Issue"),
+          dispatch_uid="mdrender_issue_render_post_save")
+@receiver(signals.post_save, sender=get_model("tasks", "Task"),
+          dispatch_uid="mdrender_task_render_post_save")
+@receiver(signals.post_save, sender=get_model("wiki", "WikiPage"),
+          dispatch_uid="mdrender_wikipage_render_post_save")
+def render_updated_stored_fields(sender, instance, update_fields=None, **kwargs):
+    # Saves with update_fields don't save the html columns,
+    # so changed fields are rendered and stored afterwards.
+    if update_fields is None:
+        return
+
+    for field_name in set(update_fields) & set(service.get_stored_fields(sender)):
+        service.render_field(instance, field_name)
@@ -43,6 +43,7 @@ from . import services
 from .votes.utils import attach_votescount_to_queryset
 from .votes import services as votes_service
 from .votes import serializers as votes_serializers
+from .issues.api import IssuesFilter
 
 
 class ProjectAdminViewSet(ModelCrudViewSet):
@@ -81,7 +82,12 @@ class ProjectViewSet(ModelCrudViewSet):
     @detail_route(methods=['get'])
     def stats(self, request, pk=None):
         project = self.get_object()
-        return Response(services.get_stats_for_project(project))
+        stats, version = services.get_cached_stats_for_project(project)
+
+        etag = '"{}"'.format(version)
+        if request.META.get("HTTP_IF_NONE_MATCH", None) == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return Response(stats, headers={"ETag": etag})
 
     @detail_route(methods=['post'], permission_classes=(IsAuthenticated,))
     def star(self, request, pk=None):
@@ -103,7 +109,8 @@ class ProjectViewSet(ModelCrudViewSet):
     @detail_route(methods=['get'])
     def issue_filters_data(self, request, pk=None):
         project = self.get_object()
-        return Response(services.get_issues_filters_data(project))
+        active_filters = IssuesFilter().prepare_filters_data(request)
+        return Response(services.get_issues_filters_data(project, active_filters))
 
     @detail_route(methods=['get'])
     def tags(self, request, pk=None):
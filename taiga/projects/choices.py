@@ -18,3 +18,23 @@ VIDEOCONFERENCES_CHOICES = (
     ("appear-in", "AppearIn"),
     ("talky", "Talky"),
 )
+
+# PostgreSQL text search configurations
+SEARCH_LANGUAGES_CHOICES = (
+    ("simple", "Simple"),
+    ("danish", "Danish"),
+    ("dutch", "Dutch"),
+    ("english", "English"),
+    ("finnish", "Finnish"),
+    ("french", "French"),
+    ("german", "German"),
+    ("hungarian", "Hungarian"),
+    ("italian", "Italian"),
+    ("norwegian", "Norwegian"),
+    ("portuguese", "Portuguese"),
+    ("romanian", "Romanian"),
+    ("russian", "Russian"),
+    ("spanish", "Spanish"),
+    ("swedish", "Swedish"),
+    ("turkish", "Turkish"),
+)
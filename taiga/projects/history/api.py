@@ -19,6 +19,8 @@ from django.shortcuts import get_object_or_404
 
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
+from rest_framework.templatetags.rest_framework import replace_query_param
 
 from taiga.base.api import GenericViewSet
 from taiga.base.filters import IsProjectMemberFilterBackend
@@ -59,6 +61,22 @@ class HistoryViewSet(GenericViewSet):
 
         return Response(serializer.data)
 
+    def response_for_cursor(self, queryset, cursor):
+        # Keyset pagination, without count, for
+        # objects with very long history.
+        limit = self.get_paginate_by() or api_settings.PAGINATE_BY
+        entries, next_cursor = services.get_history_page_by_cursor(queryset, cursor, limit=limit)
+
+        headers = {"x-paginated": "true",
+                   "x-paginated-by": limit}
+
+        if next_cursor:
+            url = self.request.build_absolute_uri()
+            headers["X-Pagination-Next"] = replace_query_param(url, "cursor", next_cursor)
+
+        serializer = self.get_serializer(entries, many=True)
+        return Response(serializer.data, headers=headers)
+
     # Just for restframework! Because it raises
     # 404 on main api root if this method not exists.
     def list(self, request):
@@ -67,6 +85,11 @@ class HistoryViewSet(GenericViewSet):
     def retrieve(self, request, pk):
         obj = self.get_object()
         qs = services.get_history_queryset_by_model_instance(obj)
+
+        if "cursor" in self.request.QUERY_PARAMS:
+            cursor = self.request.QUERY_PARAMS["cursor"]
+            return self.response_for_cursor(qs, cursor)
+
         return self.response_for_queryset(qs)
 
 
@@ -0,0 +1,82 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+
+from django.conf import settings
+from django.db import transaction as tx
+from django.db.models.loading import get_model
+
+from taiga.celery import app
+from taiga.projects.notifications import services as notifications_services
+
+from . import services
+
+log = logging.getLogger("taiga.history")
+
+
+@app.task(name="history.persist_pending_entries", bind=True,
+          max_retries=10, default_retry_delay=2)
+def persist_pending_entries(self, key:str, pending_id:int):
+    pending_model = get_model("history", "PendingHistoryEntry")
+
+    with tx.atomic():
+        services._lock_history_key(key)
+
+        # The task can be received before the transaction that
+        # creates the pending entry is commited.
+        uncommitted = services._is_pending_entry_uncommitted(pending_id)
+        if uncommitted:
+            entries = None
+        elif pending_model.objects.filter(id=pending_id, key=key).exists():
+            entries = services.persist_pending_entries(key)
+        else:
+            # Already persisted by other flush of the same key
+            # (or the transaction was rolled back).
+            return
+
+    if uncommitted:
+        if self.request.retries < self.max_retries:
+            # Exponential backoff (about half an hour in total)
+            raise self.retry(countdown=self.default_retry_delay * 2 ** self.request.retries)
+
+        # Left to persist_stale_pending_entries
+        log.warning("History entry %s of %s still uncommitted after %s retries",
+                    pending_id, key, self.max_retries)
+        return
+
+    _send_notifications(key, entries)
+
+
+@app.task(name="history.persist_stale_pending_entries")
+def persist_stale_pending_entries():
+    max_age = getattr(settings, "HISTORY_PENDING_ENTRIES_MAX_AGE", 60 * 60)
+
+    for key in services.get_stale_pending_keys(max_age):
+        with tx.atomic():
+            services._lock_history_key(key)
+            entries = services.persist_pending_entries(key)
+
+        _send_notifications(key, entries)
+
+
+def _send_notifications(key:str, entries:list):
+    obj = services.get_instance_by_key(key)
+    if obj is None:
+        return
+
+    for entry in entries:
+        notifications_services.send_history_notifications(obj, entry)
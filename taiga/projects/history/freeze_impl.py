@@ -15,11 +15,13 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models.loading import get_model
-from django.contrib.contenttypes.models import ContentType
+
 from taiga.base.utils.iterators import as_tuple
-from taiga.base.utils.iterators import as_dict
-from taiga.mdrender.service import render as mdrender
+from taiga.mdrender.service import render_field
 
 import os
 
@@ -27,28 +29,82 @@ import os
 # Values
 ####################
 
-@as_dict
-def _get_generic_values(ids:tuple, *, typename=None, attr:str="name") -> tuple:
-    app_label, model_name = typename.split(".", 1)
-    content_type = ContentType.objects.get(app_label=app_label, model=model_name)
-    model_cls = content_type.model_class()
+# Models (with project and name) that are resolved
+# with the project values cache.
+PROJECT_VALUES_TYPENAMES = ("projects.userstorystatus",
+                             "projects.taskstatus",
+                             "projects.issuestatus",
+                             "projects.issuetype",
+                             "projects.points",
+                             "projects.priority",
+                             "projects.severity",
+                             "users.role",
+                             "milestones.milestone")
+
+
+def _make_project_values_cache_key(project_id:int) -> str:
+    return "history-values-{}".format(project_id)
+
+
+def _load_project_values(project_id:int) -> dict:
+    values = {}
+
+    for typename in PROJECT_VALUES_TYPENAMES:
+        model_cls = get_model(*typename.split(".", 1))
+        qs = model_cls.objects.filter(project_id=project_id).values_list("id", "name")
+        values[typename] = {str(pk): name for pk, name in qs}
 
-    ids = filter(lambda x: x is not None, ids)
-    qs = model_cls.objects.filter(pk__in=ids)
-    for instance in qs:
-        yield str(instance.pk), getattr(instance, attr)
+    membership_model = get_model("projects", "Membership")
+    qs = (membership_model.objects.filter(project_id=project_id, user__isnull=False)
+                                  .select_related("user"))
+    values["users.user"] = {str(m.user.pk): m.user.get_full_name() for m in qs}
+    return values
 
 
-@as_dict
-def _get_users_values(ids:set) -> dict:
-    user_model = get_model("users", "User")
-    ids = filter(lambda x: x is not None, ids)
-    qs = user_model.objects.filter(pk__in=tuple(ids))
+def get_project_values(project) -> dict:
+    """
+    Get the names of statuses, issue types, points, priorities,
+    severities, roles, milestones and members of the project,
+    indexed by typename and id.
 
-    for user in qs:
-        yield str(user.pk), user.get_full_name()
+    It is cached until some of them is changed.
+    """
+    key = _make_project_values_cache_key(project.id)
+    values = cache.get(key)
+
+    if values is None:
+        values = _load_project_values(project.id)
+        timeout = getattr(settings, "HISTORY_VALUES_CACHE_TIMEOUT", 3600)
+        cache.set(key, values, timeout=timeout)
+
+    return values
 
 
+def invalidate_project_values(project_id:int):
+    cache.delete(_make_project_values_cache_key(project_id))
+
+
+def _get_generic_values(ids:tuple, *, typename=None, attr:str="name", project_values=None) -> dict:
+    ids = set(filter(lambda x: x is not None, ids))
+
+    result = {}
+    if project_values is not None:
+        known = project_values.get(typename, {})
+        result = {str(x): known[str(x)] for x in ids if str(x) in known}
+
+    # Objects not found on project values (not longer members,
+    # removed objects...) are resolved from database.
+    missing = tuple(filter(lambda x: str(x) not in result, ids))
+    if missing:
+        model_cls = get_model(*typename.split(".", 1))
+        for instance in model_cls.objects.filter(pk__in=missing):
+            value = getattr(instance, attr)
+            result[str(instance.pk)] = value() if callable(value) else value
+
+    return result
+
+
+_get_users_values = partial(_get_generic_values, typename="users.user", attr="get_full_name")
 _get_us_status_values = partial(_get_generic_values, typename="projects.userstorystatus")
 _get_task_status_values = partial(_get_generic_values, typename="projects.taskstatus")
 _get_issue_status_values = partial(_get_generic_values, typename="projects.issuestatus")
@@ -60,7 +116,18 @@ _get_severity_values = partial(_get_generic_values, typename="projects.severity"
 _get_milestone_values = partial(_get_generic_values, typename="milestones.milestone")
 
 
-def _common_users_values(diff):
+# Diff fields that have values to resolve
+_VALUES_FIELDS = frozenset(["owner", "watchers", "assigned_to", "status", "milestone",
+                            "points", "priority", "severity", "type"])
+
+
+def _get_project_values(project, diff):
+    if project is None or _VALUES_FIELDS.isdisjoint(diff):
+        return None
+    return get_project_values(project)
+
+
+def _common_users_values(diff, project_values=None):
     """
     Groups common values resolver logic of userstories,
     issues and tasks.
@@ -78,24 +145,26 @@ def _common_users_values(diff):
     if "assigned_to" in diff:
         users.update(diff["assigned_to"])
     if users:
-        values["users"] = _get_users_values(users)
+        values["users"] = _get_users_values(users, project_values=project_values)
 
     return values
 
 
-def milestone_values(diff):
-    values = _common_users_values(diff)
+def milestone_values(diff, project=None):
+    pvalues = _get_project_values(project, diff)
+    values = _common_users_values(diff, pvalues)
 
     return values
 
 
-def userstory_values(diff):
-    values = _common_users_values(diff)
+def userstory_values(diff, project=None):
+    pvalues = _get_project_values(project, diff)
+    values = _common_users_values(diff, pvalues)
 
     if "status" in diff:
-        values["status"] = _get_us_status_values(diff["status"])
+        values["status"] = _get_us_status_values(diff["status"], project_values=pvalues)
     if "milestone" in diff:
-        values["milestone"] = _get_milestone_values(diff["milestone"])
+        values["milestone"] = _get_milestone_values(diff["milestone"], project_values=pvalues)
     if "points" in diff:
         points, roles = set(), set()
 
@@ -107,42 +176,45 @@ def userstory_values(diff):
                 points.add(point_id)
                 roles.add(role_id)
 
-        values["roles"] = _get_role_values(roles)
-        values["points"] = _get_points_values(points)
+        values["roles"] = _get_role_values(roles, project_values=pvalues)
+        values["points"] = _get_points_values(points, project_values=pvalues)
 
     return values
 
 
-def issue_values(diff):
-    values = _common_users_values(diff)
+def issue_values(diff, project=None):
+    pvalues = _get_project_values(project, diff)
+    values = _common_users_values(diff, pvalues)
 
     if "status" in diff:
-        values["status"] = _get_issue_status_values(diff["status"])
+        values["status"] = _get_issue_status_values(diff["status"], project_values=pvalues)
     if "milestone" in diff:
-        values["milestone"] = _get_milestone_values(diff["milestone"])
+        values["milestone"] = _get_milestone_values(diff["milestone"], project_values=pvalues)
     if "priority" in diff:
-        values["priority"] = _get_priority_values(diff["priority"])
+        values["priority"] = _get_priority_values(diff["priority"], project_values=pvalues)
     if "severity" in diff:
-        values["severity"] = _get_severity_values(diff["severity"])
+        values["severity"] = _get_severity_values(diff["severity"], project_values=pvalues)
     if "type" in diff:
-        values["issue_type"] = _get_issue_type_values(diff["type"])
+        values["issue_type"] = _get_issue_type_values(diff["type"], project_values=pvalues)
 
     return values
 
 
-def task_values(diff):
-    values = _common_users_values(diff)
+def task_values(diff, project=None):
+    pvalues = _get_project_values(project, diff)
+    values = _common_users_values(diff, pvalues)
 
     if "status" in diff:
-        values["status"] = _get_task_status_values(diff["status"])
+        values["status"] = _get_task_status_values(diff["status"], project_values=pvalues)
     if "milestone" in diff:
-        values["milestone"] = _get_milestone_values(diff["milestone"])
+        values["milestone"] = _get_milestone_values(diff["milestone"], project_values=pvalues)
 
     return values
 
 
-def wikipage_values(diff):
-    values = _common_users_values(diff)
+def wikipage_values(diff, project=None):
+    pvalues = _get_project_values(project, diff)
+    values = _common_users_values(diff, pvalues)
     return values
 
 
@@ -199,11 +271,8 @@ def milestone_freezer(milestone) -> dict:
 
 
 def userstory_freezer(us) -> dict:
-    rp_cls = get_model("userstories", "RolePoints")
-    rpqsd = rp_cls.objects.filter(user_story=us)
-
     points = {}
-    for rp in rpqsd:
+    for rp in us.role_points.all():
         points[str(rp.role_id)] = rp.points_id
 
     snapshot = {
@@ -215,12 +284,12 @@ def userstory_freezer(us) -> dict:
         "order": us.order,
         "subject": us.subject,
         "description": us.description,
-        "description_html": mdrender(us.project, us.description),
+        "description_html": render_field(us, "description"),
         "assigned_to": us.assigned_to_id,
         "milestone": us.milestone_id,
         "client_requirement": us.client_requirement,
         "team_requirement": us.team_requirement,
-        "watchers": [x.id for x in us.watchers.all()],
+        "watchers": [x.pk for x in us.watchers.all()],
         "attachments": extract_attachments(us),
         "tags": us.tags,
         "points": points,
@@ -241,7 +310,7 @@ def issue_freezer(issue) -> dict:
         "milestone": issue.milestone_id,
         "subject": issue.subject,
         "description": issue.description,
-        "description_html": mdrender(issue.project, issue.description),
+        "description_html": render_field(issue, "description"),
         "assigned_to": issue.assigned_to_id,
         "watchers": [x.pk for x in issue.watchers.all()],
         "attachments": extract_attachments(issue),
@@ -259,7 +328,7 @@ def task_freezer(task) -> dict:
         "milestone": task.milestone_id,
         "subject": task.subject,
         "description": task.description,
-        "description_html": mdrender(task.project, task.description),
+        "description_html": render_field(task, "description"),
         "assigned_to": task.assigned_to_id,
         "watchers": [x.pk for x in task.watchers.all()],
         "attachments": extract_attachments(task),
@@ -276,7 +345,7 @@ def wikipage_freezer(wiki) -> dict:
         "slug": wiki.slug,
         "owner": wiki.owner_id,
         "content": wiki.content,
-        "content_html": mdrender(wiki.project, wiki.content),
+        "content_html": render_field(wiki, "content"),
         "watchers": [x.pk for x in wiki.watchers.all()],
         "attachments": extract_attachments(wiki),
     }
@@ -0,0 +1,68 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import datetime
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from taiga.projects.history import services
+
+
+class Command(BaseCommand):
+    help = ("Compact history: keep a full snapshot every few entries and "
+            "optionally archive old entries.")
+
+    option_list = BaseCommand.option_list + (
+        make_option("--chunk-size", action="store", type="int", dest="chunk_size",
+                    default=500, help="Number of history keys processed by transaction."),
+        make_option("--checkpoint-window", action="store", type="int", dest="checkpoint_window",
+                    default=None, help="Number of entries per full snapshot (checkpoint)."),
+        make_option("--archive-days", action="store", type="int", dest="archive_days",
+                    default=None, help="Archive entries older than this number of days."),
+    )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size should be greater than 0")
+
+        checkpoint_window = options["checkpoint_window"]
+        if checkpoint_window is not None and checkpoint_window <= 0:
+            raise CommandError("--checkpoint-window should be greater than 0")
+
+        archive_before = None
+        if options["archive_days"] is not None:
+            delta = datetime.timedelta(days=options["archive_days"])
+            archive_before = timezone.now() - delta
+
+        totals = {"keys": 0, "snapshots": 0, "checkpoints": 0, "archived": 0, "bytes": 0}
+
+        for keys in services.iter_history_keys(chunk_size):
+            stats = services.compact_history_keys(keys, archive_before=archive_before,
+                                                  checkpoint_window=checkpoint_window)
+
+            totals["keys"] += len(keys)
+            for name, value in stats.items():
+                totals[name] += value
+
+            msg = ("Processed {keys} keys: {snapshots} snapshots dropped, {checkpoints} checkpoints "
+                   "created, {archived} entries archived.")
+            self.stdout.write(msg.format(**totals))
+
+        msg = "Space reclaimed: {:.2f} MB (pending of VACUUM)."
+        self.stdout.write(msg.format(totals["bytes"] / (1024 * 1024)))
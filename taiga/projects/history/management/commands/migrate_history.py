@@ -14,65 +14,244 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import logging
 import sys
+from contextlib import closing
+from functools import partial
+from multiprocessing import Pool
+from optparse import make_option
 
+from django.core.exceptions import ObjectDoesNotExist
 from django.core.management.base import BaseCommand, CommandError
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db import connections
 from django.db import transaction as tx
+from django.db.models import Q
 from django.db.models.loading import get_model
-from django.core.paginator import Paginator
 
-from reversion import get_unique_for_object
+from reversion.models import Version
 
-from taiga.projects.history.services import take_snapshot
+from taiga.projects.history import services
 
+log = logging.getLogger("taiga.history")
+
+# Typenames of models with reversion history
+TYPENAMES = ("tasks.task", "userstories.userstory", "issues.issue", "wiki.wikipage")
+
+
+def clear_history():
+    get_model("history", "HistoryEntry").objects.all().delete()
+    get_model("history", "LastSnapshot").objects.all().delete()
+    get_model("history", "HistoryMigrationCheckpoint").objects.all().delete()
+
+
+def get_last_migrated_object_id(typename:str) -> int:
+    """
+    Get the id of the last migrated object of a type from its
+    checkpoint, saved in the same transaction that the entries.
+    """
+    checkpoint_model = get_model("history", "HistoryMigrationCheckpoint")
+    checkpoint = checkpoint_model.objects.filter(typename=typename).first()
+    return checkpoint.last_object_id if checkpoint else None
+
+
+def save_checkpoint(typename:str, last_object_id:int):
+    checkpoint_model = get_model("history", "HistoryMigrationCheckpoint")
+    qs = checkpoint_model.objects.filter(typename=typename)
+    if not qs.update(last_object_id=last_object_id):
+        checkpoint_model.objects.create(typename=typename, last_object_id=last_object_id)
+
+
+def restore_created_at(dates:list):
+    """
+    Set the date of the revisions, as (entry id, date) tuples, to
+    bulk created entries (`created_at` is filled on insert).
+    """
+    if not dates:
+        return
+
+    sql = """
+    UPDATE history_historyentry
+       SET created_at = v.created_at
+      FROM (VALUES {}) AS v (id, created_at)
+     WHERE history_historyentry.id = v.id
+    """.format(", ".join(["(%s, %s::timestamp with time zone)"] * len(dates)))
+
+    params = [value for date in dates for value in date]
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, params)
+
+
+def iter_object_versions(model_cls, *, start_after:int=None, chunk_size:int=1000):
+    """
+    Stream the reversion versions of the existing objects of a model, in
+    chunks ordered by object and version id, yielding (object_id, versions)
+    tuples.
+    """
+    content_type = ContentType.objects.get_for_model(model_cls)
+    # Only the history of existing objects is migrated
+    qs = (Version.objects.filter(content_type=content_type,
+                                 object_id_int__in=model_cls.objects.values("pk"))
+                         .select_related("revision", "revision__user")
+                         .order_by("object_id_int", "pk"))
+
+    last_object_id, last_pk = start_after, None
+    current_id, current_versions = None, []
+
+    while True:
+        chunk_qs = qs
+        if last_pk is not None:
+            chunk_qs = chunk_qs.filter(Q(object_id_int__gt=last_object_id) |
+                                       Q(object_id_int=last_object_id, pk__gt=last_pk))
+        elif last_object_id is not None:
+            chunk_qs = chunk_qs.filter(object_id_int__gt=last_object_id)
+
+        versions = list(chunk_qs[:chunk_size])
+        if not versions:
+            break
+
+        for version in versions:
+            if version.object_id_int != current_id:
+                if current_versions:
+                    yield current_id, current_versions
+                current_id, current_versions = version.object_id_int, []
+            current_versions.append(version)
+
+        last_object_id, last_pk = versions[-1].object_id_int, versions[-1].pk
+
+    if current_versions:
+        yield current_id, current_versions
 
-class Command(BaseCommand):
-    help = 'Migrate reversion history to new history system.'
 
-    def efficient_queryset_iter(queryset):
-        paginator = Paginator(queryset, 20)
-        for page_num in paginator.page_range:
-            page = paginator.page(page)
-            for element in page.object_list:
-                yield element
+def make_object_entries(typename:str, versions:list, projects:dict) -> tuple:
+    """
+    Build in memory the history entries of one object from its
+    versions. Returns the entries and the LastSnapshot of the object.
+    """
+    state, partial_diffs = None, 0
+    entries = []
 
-    def iter_object_with_version(self, model_cls):
-        qs = model_cls.objects.all()
+    for version in versions:
+        if version.revision is None:
+            continue
 
-        for obj in qs:
-            revs = get_unique_for_object(obj)
-            for rev in revs:
-                yield obj, rev
+        obj = version.object_version.object
+        if obj.project_id not in projects:
+            projects[obj.project_id] = get_model("projects", "Project").objects.get(pk=obj.project_id)
+        obj.project = projects[obj.project_id]
 
-    def handle_generic_model(self, app_name, model):
-        model_cls = get_model(app_name, model)
+        new_fobj = services.freeze_model_instance(obj, refresh=False)
+        need_real_snapshot = state is None or services.is_checkpoint_needed(partial_diffs)
 
-        for obj, rev in self.iter_object_with_version(model_cls):
-            msg = "Processing app:{0} model:{1} pk:{2} revid:{3}."
-            print(msg.format(app_name, model.lower(), obj.id, rev.id), file=sys.stderr)
+        entry = services.build_history_entry(typename, state, new_fobj,
+                                             need_real_snapshot=need_real_snapshot,
+                                             project=obj.project,
+                                             comment=version.revision.comment,
+                                             user=services.make_user_data(version.revision.user))
+        if entry is None:
+            continue
 
-            oldobj = rev.object_version.object
-            if rev.revision is None:
-                continue
+        entry.created_at = version.revision.date_created
+        entries.append(entry)
 
-            comment = rev.revision.comment
-            user = rev.revision.user
-            hentry = take_snapshot(oldobj, user=user, comment=comment)
+        state = new_fobj
+        partial_diffs = 0 if need_real_snapshot else partial_diffs + 1
 
-            if hentry is None:
-                continue
+    if state is None:
+        return entries, None
 
-            hentry.created_at = rev.revision.date_created
-            hentry.save()
+    snapshot_model = get_model("history", "LastSnapshot")
+    return entries, snapshot_model(key=state.key, snapshot=state.snapshot,
+                                   partial_diffs=partial_diffs)
 
-    def clear_history(self):
-        model_cls = get_model("history", "HistoryEntry")
-        model_cls.objects.all().delete()
 
-    @tx.atomic
+@tx.atomic
+def save_batch(typename:str, last_object_id:int, entries:list, snapshots:list):
+    entry_model = get_model("history", "HistoryEntry")
+    snapshot_model = get_model("history", "LastSnapshot")
+
+    dates = [(entry.id, entry.created_at) for entry in entries]
+    entry_model.objects.bulk_create(entries)
+    restore_created_at(dates)
+    snapshot_model.objects.bulk_create(snapshots)
+    save_checkpoint(typename, last_object_id)
+
+
+def migrate_model(typename:str, *, batch_size:int=1000) -> tuple:
+    """
+    Migrate the reversion history of all objects of a model,
+    resuming from the last migrated object.
+    """
+    model_cls = get_model(*typename.split(".", 1))
+    start_after = get_last_migrated_object_id(typename)
+
+    projects = {}
+    entries, snapshots = [], []
+    last_object_id = None
+    total = 0
+
+    for object_id, versions in iter_object_versions(model_cls, start_after=start_after,
+                                                    chunk_size=batch_size):
+        last_object_id = object_id
+        try:
+            object_entries, snapshot = make_object_entries(typename, versions, projects)
+        except ObjectDoesNotExist as e:
+            # Old versions can reference removed objects
+            log.warning("%s: object %s skipped: %s", typename, object_id, e)
+            continue
+
+        if snapshot is None:
+            continue
+
+        entries.extend(object_entries)
+        snapshots.append(snapshot)
+
+        # Batches are only saved on object boundaries, so
+        # objects are always migrated completely.
+        if len(entries) >= batch_size:
+            save_batch(typename, last_object_id, entries, snapshots)
+            total += len(entries)
+            print("{0}: migrated until object {1} ({2} entries).".format(typename, object_id, total),
+                  file=sys.stderr)
+            entries, snapshots = [], []
+
+    if last_object_id is not None:
+        save_batch(typename, last_object_id, entries, snapshots)
+        total += len(entries)
+
+    return typename, total
+
+
+class Command(BaseCommand):
+    help = 'Migrate reversion history to new history system.'
+
+    option_list = BaseCommand.option_list + (
+        make_option("--batch-size", action="store", type="int", dest="batch_size",
+                    default=1000, help="Number of history entries saved by transaction."),
+        make_option("--resume", action="store_true", dest="resume", default=False,
+                    help="Continue a previous (interrupted) migration."),
+        make_option("--processes", action="store", type="int", dest="processes",
+                    default=1, help="Number of processes (one model per process)."),
+    )
+
     def handle(self, *args, **options):
-        self.clear_history()
-        self.handle_generic_model("tasks", "Task")
-        self.handle_generic_model("userstories", "UserStory")
-        self.handle_generic_model("issues", "Issue")
-        self.handle_generic_model("wiki", "WikiPage")
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size should be greater than 0")
+
+        if not options["resume"]:
+            clear_history()
+
+        migrate_fn = partial(migrate_model, batch_size=options["batch_size"])
+
+        if options["processes"] > 1:
+            # Each process should open its own database connection
+            for conn in connections.all():
+                conn.close()
+            with Pool(options["processes"]) as pool:
+                results = pool.map(migrate_fn, TYPENAMES)
+        else:
+            results = map(migrate_fn, TYPENAMES)
+
+        for typename, total in results:
+            self.stdout.write("{0}: {1} history entries migrated.".format(typename, total))
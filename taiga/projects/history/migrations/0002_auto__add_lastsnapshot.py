@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from south.utils import datetime_utils as datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'LastSnapshot'
+        db.create_table('history_lastsnapshot', (
+            ('key', self.gf('django.db.models.fields.CharField')(primary_key=True, max_length=255)),
+            ('snapshot', self.gf('django_pgjson.fields.JsonField')(null=True, default=None)),
+            ('partial_diffs', self.gf('django.db.models.fields.IntegerField')(default=0)),
+            ('modified_at', self.gf('django.db.models.fields.DateTimeField')(blank=True, auto_now=True)),
+        ))
+        db.send_create_signal('history', ['LastSnapshot'])
+
+
+    def backwards(self, orm):
+        # Deleting model 'LastSnapshot'
+        db.delete_table('history_lastsnapshot')
+
+
+    models = {
+        'history.historyentry': {
+            'Meta': {'object_name': 'HistoryEntry', 'ordering': "['created_at']"},
+            'comment': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'comment_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'created_at': ('django.db.models.fields.DateTimeField', [], {'blank': 'True', 'auto_now_add': 'True'}),
+            'diff': ('django_pgjson.fields.JsonField', [], {'null': 'True', 'default': 'None'}),
+            'id': ('django.db.models.fields.CharField', [], {'unique': 'True', 'default': "'b6d8a4e2-56c1-11e4-8f3d-b499ba5650c0'", 'max_length': '255', 'primary_key': 'True'}),
+            'is_snapshot': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'key': ('django.db.models.fields.CharField', [], {'blank': 'True', 'null': 'True', 'default': 'None', 'max_length': '255'}),
+            'snapshot': ('django_pgjson.fields.JsonField', [], {'null': 'True', 'default': 'None'}),
+            'type': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'user': ('django_pgjson.fields.JsonField', [], {'blank': 'True', 'null': 'True', 'default': 'None'}),
+            'values': ('django_pgjson.fields.JsonField', [], {'null': 'True', 'default': 'None'})
+        },
+        'history.lastsnapshot': {
+            'Meta': {'object_name': 'LastSnapshot'},
+            'key': ('django.db.models.fields.CharField', [], {'primary_key': 'True', 'max_length': '255'}),
+            'modified_at': ('django.db.models.fields.DateTimeField', [], {'blank': 'True', 'auto_now': 'True'}),
+            'partial_diffs': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'snapshot': ('django_pgjson.fields.JsonField', [], {'null': 'True', 'default': 'None'})
+        }
+    }
+
+    complete_apps = ['history']
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+from south.utils import datetime_utils as datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'PendingHistoryEntry'
+        db.create_table('history_pendinghistoryentry', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('key', self.gf('django.db.models.fields.CharField')(max_length=255, db_index=True)),
+            ('project', self.gf('django.db.models.fields.related.ForeignKey')(blank=True, null=True, related_name='+', to=orm['projects.Project'])),
+            ('user', self.gf('django_pgjson.fields.JsonField')(blank=True, null=True, default=None)),
+            ('comment', self.gf('django.db.models.fields.TextField')(blank=True)),
+            ('snapshot', self.gf('django_pgjson.fields.JsonField')(null=True, default=None)),
+            ('created_at', self.gf('django.db.models.fields.DateTimeField')(blank=True, auto_now_add=True)),
+        ))
+        db.send_create_signal('history', ['PendingHistoryEntry'])
+
+
+    def backwards(self, orm):
+        # Deleting model 'PendingHistoryEntry'
+        db.delete_table('history_pendinghistoryentry')
+
+
+    models = {
+        'auth.permission': {
+            'Meta': {'ordering': "('content_type__app_label', 'content_type__model', 'codename')", 'unique_together': "(('content_type', 'codename'),)", 'object_name': 'Permission'},
+            'codename': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '50'})
+        },
+        'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'db_table': "'django_content_type'", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType'},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        'history.historyentry': {
+            'Meta': {'object_name': 'HistoryEntry', 'ordering': "['created_at']"},
+            'comment': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'comment_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'created_at': ('django.db.models.fields.DateTimeField', [], {'blank': 'True', 'auto_now_add': 'True'}),
+            'diff': ('django_pgjson.fields.JsonField', [], {'null': 'True', 'default': 'None'}),
+            'id': ('django.db.models.fields.CharField', [], {'unique': 'True', 'default': "'b6d8a4e2-56c1-11e4-8f3d-b499ba5650c0'", 'max_length': '255', 'primary_key': 'True'}),
+            'is_snapshot': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'key': ('django.db.models.fields.CharField', [], {'blank': 'True', 'null': 'True', 'default': 'None', 'max_length': '255'}),
+            'snapshot': ('django_pgjson.fields.JsonField', [], {'null': 'True', 'default': 'None'}),
+            'type': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'user': ('django_pgjson.fields.JsonField', [], {'blank': 'True', 'null': 'True', 'default': 'None'}),
+            'values': ('django_pgjson.fields.JsonField', [], {'null': 'True', 'default': 'None'})
+        },
+        'history.lastsnapshot': {
+            'Meta': {'object_name': 'LastSnapshot'},
+            'key': ('django.db.models.fields.CharField', [], {'primary_key': 'True', 'max_length': '255'}),
+            'modified_at': ('django.db.models.fields.DateTimeField', [], {'blank': 'True', 'auto_now': 'True'}),
+            'partial_diffs': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'snapshot': ('django_pgjson.fields.JsonField', [], {'null': 'True', 'default': 'None'})
+        },
+        'history.pendinghistoryentry': {
+            'Meta': {'object_name': 'PendingHistoryEntry'},
+            'comment': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'created_at': ('django.db.models.fields.DateTimeField', [], {'blank': 'True', 'auto_now_add': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'key': ('django.db.models.fields.CharField', [], {'max_length': '255', 'db_index': 'True'}),
+            'project': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'null': 'True', 'related_name': "'+'", 'to': "orm['projects.Project']"}),
+            'snapshot': ('django_pgjson.fields.JsonField', [], {'null': 'True', 'default': 'None'}),
+            'user': ('django_pgjson.fields.JsonField', [], {'blank': 'True', 'null': 'True', 'default': 'None'})
+        },
+        'projects.issuestatus': {
+            'Meta': {'ordering': "['project', 'order', 'name']", 'unique_together': "(('project', 'name'),)", 'object_name': 'IssueStatus'},
+            'color': ('django.db.models.fields.CharField', [], {'max_length': '20', 'default': "'#999999'"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_closed': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'order': ('django.db.models.fields.IntegerField', [], {'default': '10'}),
+            'project': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'issue_statuses'", 'to': "orm['projects.Project']"})
+        },
+        'projects.issuetype': {
+            'Meta': {'ordering': "['project', 'order', 'name']", 'unique_together': "(('project', 'name'),)", 'object_name': 'IssueType'},
+            'color': ('django.db.models.fields.CharField', [], {'max_length': '20', 'default': "'#999999'"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'order': ('django.db.models.fields.IntegerField', [], {'default': '10'}),
+            'project': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'issue_types'", 'to': "orm['projects.Project']"})
+        },
+        'projects.membership': {
+            'Meta': {'ordering': "['project', 'role']", 'unique_together': "(('user', 'project'),)", 'object_name': 'Membership'},
+            'created_at': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'email': ('django.db.models.fields.EmailField', [], {'max_length': '255', 'null': 'True', 'blank': 'True', 'default': 'None'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'project': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'memberships'", 'to': "orm['projects.Project']"}),
+            'role': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'memberships'", 'to': "orm['users.Role']"}),
+            'token': ('django.db.models.fields.CharField', [], {'max_length': '60', 'null': 'True', 'blank': 'True', 'default': 'None'}),
+            'user': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['users.User']", 'related_name': "'memberships'", 'null': 'True', 'blank': 'True', 'default': 'None'})
+        },
+        'projects.points': {
+            'Meta': {'ordering': "['project', 'order', 'name']", 'unique_together': "(('project', 'name'),)", 'object_name': 'Points'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'order': ('django.db.models.fields.IntegerField', [], {'default': '10'}),
+            'project': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'points'", 'to': "orm['projects.Project']"}),
+            'value': ('django.db.models.fields.FloatField', [], {'default': 'None', 'null': 'True', 'blank': 'True'})
+        },
+        'projects.priority': {
+            'Meta': {'ordering': "['project', 'order', 'name']", 'unique_together': "(('project', 'name'),)", 'object_name': 'Priority'},
+            'color': ('django.db.models.fields.CharField', [], {'max_length': '20', 'default': "'#999999'"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'order': ('django.db.models.fields.IntegerField', [], {'default': '10'}),
+            'project': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'priorities'", 'to': "orm['projects.Project']"})
+        },
+        'projects.project': {
+            'Meta': {'ordering': "['name']", 'object_name': 'Project'},
+            'created_date': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'creation_template': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['projects.ProjectTemplate']", 'related_name': "'projects'", 'null': 'True', 'blank': 'True', 'default': 'None'}),
+            'default_issue_status': ('django.db.models.fields.related.OneToOneField', [], {'related_name': "'+'", 'blank': 'True', 'unique': 'True', 'null': 'True', 'to': "orm['projects.IssueStatus']", 'on_delete': 'models.SET_NULL'}),
+            'default_issue_type': ('django.db.models.fields.related.OneToOneField', [], {'related_name': "'+'", 'blank': 'True', 'unique': 'True', 'null': 'True', 'to': "orm['projects.IssueType']", 'on_delete': 'models.SET_NULL'}),
+            'default_points': ('django.db.models.fields.related.OneToOneField', [], {'related_name': "'+'", 'blank': 'True', 'unique': 'True', 'null': 'True', 'to': "orm['projects.Points']", 'on_delete': 'models.SET_NULL'}),
+            'default_priority': ('django.db.models.fields.related.OneToOneField', [], {'related_name': "'+'", 'blank': 'True', 'unique': 'True', 'null': 'True', 'to': "orm['projects.Priority']", 'on_delete': 'models.SET_NULL'}),
+            'default_severity': ('django.db.models.fields.related.OneToOneField', [], {'related_name': "'+'", 'blank': 'True', 'unique': 'True', 'null': 'True', 'to': "orm['projects.Severity']", 'on_delete': 'models.SET_NULL'}),
+            'default_task_status': ('django.db.models.fields.related.OneToOneField', [], {'related_name': "'+'", 'blank': 'True', 'unique': 'True', 'null': 'True', 'to': "orm['projects.TaskStatus']", 'on_delete': 'models.SET_NULL'}),
+            'default_us_status': ('django.db.models.fields.related.OneToOneField', [], {'related_name': "'+'", 'blank': 'True', 'unique': 'True', 'null': 'True', 'to': "orm['projects.UserStoryStatus']", 'on_delete': 'models.SET_NULL'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_backlog_activated': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_issues_activated': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_kanban_activated': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_wiki_activated': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'members': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "'projects'", 'through': "orm['projects.Membership']", 'to': "orm['users.User']"}),
+            'modified_date': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '250', 'unique': 'True'}),
+            'owner': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'owned_projects'", 'to': "orm['users.User']"}),
+            'public': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'max_length': '250', 'blank': 'True', 'unique': 'True'}),
+            'tags': ('djorm_pgarray.fields.TextArrayField', [], {'dbtype': "'text'", 'default': 'None', 'null': 'True', 'blank': 'True'}),
+            'total_milestones': ('django.db.models.fields.IntegerField', [], {'default': '0', 'null': 'True', 'blank': 'True'}),
+            'total_story_points': ('django.db.models.fields.FloatField', [], {'default': 'None', 'null': 'True'}),
+            'videoconferences': ('django.db.models.fields.CharField', [], {'max_length': '250', 'null': 'True', 'blank': 'True'}),
+            'videoconferences_salt': ('django.db.models.fields.CharField', [], {'max_length': '250', 'null': 'True', 'blank': 'True'})
+        },
+        'projects.projecttemplate': {
+            'Meta': {'ordering': "['name']", 'object_name': 'ProjectTemplate'},
+            'created_date': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'default_options': ('django_pgjson.fields.JsonField', [], {}),
+            'default_owner_role': ('django.db.models.fields.CharField', [], {'max_length': '50'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_backlog_activated': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_issues_activated': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_kanban_activated': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_wiki_activated': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'issue_statuses': ('django_pgjson.fields.JsonField', [], {}),
+            'issue_types': ('django_pgjson.fields.JsonField', [], {}),
+            'modified_date': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '250'}),
+            'points': ('django_pgjson.fields.JsonField', [], {}),
+            'priorities': ('django_pgjson.fields.JsonField', [], {}),
+            'roles': ('django_pgjson.fields.JsonField', [], {}),
+            'severities': ('django_pgjson.fields.JsonField', [], {}),
+            'slug': ('django.db.models.fields.SlugField', [], {'max_length': '250', 'blank': 'True', 'unique': 'True'}),
+            'task_statuses': ('django_pgjson.fields.JsonField', [], {}),
+            'us_statuses': ('django_pgjson.fields.JsonField', [], {}),
+            'videoconferences': ('django.db.models.fields.CharField', [], {'max_length': '250', 'null': 'True', 'blank': 'True'}),
+            'videoconferences_salt': ('django.db.models.fields.CharField', [], {'max_length': '250', 'null': 'True', 'blank': 'True'})
+        },
+        'projects.severity': {
+            'Meta': {'ordering': "['project', 'order', 'name']", 'unique_together': "(('project', 'name'),)", 'object_name': 'Severity'},
+            'color': ('django.db.models.fields.CharField', [], {'max_length': '20', 'default': "'#999999'"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'order': ('django.db.models.fields.IntegerField', [], {'default': '10'}),
+            'project': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'severities'", 'to': "orm['projects.Project']"})
+        },
+        'projects.taskstatus': {
+            'Meta': {'ordering': "['project', 'order', 'name']", 'unique_together': "(('project', 'name'),)", 'object_name': 'TaskStatus'},
+            'color': ('django.db.models.fields.CharField', [], {'max_length': '20', 'default': "'#999999'"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_closed': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'order': ('django.db.models.fields.IntegerField', [], {'default': '10'}),
+            'project': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'task_statuses'", 'to': "orm['projects.Project']"})
+        },
+        'projects.userstorystatus': {
+            'Meta': {'ordering': "['project', 'order', 'name']", 'unique_together': "(('project', 'name'),)", 'object_name': 'UserStoryStatus'},
+            'color': ('django.db.models.fields.CharField', [], {'max_length': '20', 'default': "'#999999'"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_closed': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'order': ('django.db.models.fields.IntegerField', [], {'default': '10'}),
+            'project': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'us_statuses'", 'to': "orm['projects.Project']"}),
+            'wip_limit': ('django.db.models.fields.IntegerField', [], {'default': 'None', 'null': 'True', 'blank': 'True'})
+        },
+        'users.role': {
+            'Meta': {'ordering': "['order', 'slug']", 'unique_together': "(('slug', 'project'),)", 'object_name': 'Role'},
+            'computable': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '200'}),
+            'order': ('django.db.models.fields.IntegerField', [], {'default': '10'}),
+            'permissions': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "'roles'", 'to': "orm['auth.Permission']"}),
+            'project': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'roles'", 'to': "orm['projects.Project']"}),
+            'slug': ('django.db.models.fields.SlugField', [], {'max_length': '250', 'blank': 'True'})
+        },
+        'users.user': {
+            'Meta': {'ordering': "['username']", 'object_name': 'User'},
+            'bio': ('django.db.models.fields.TextField', [], {'default': "''", 'blank': 'True'}),
+            'color': ('django.db.models.fields.CharField', [], {'max_length': '9', 'blank': 'True', 'default': "'#987a92'"}),
+            'colorize_tags': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'date_joined': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'default_language': ('django.db.models.fields.CharField', [], {'max_length': '20', 'blank': 'True', 'default': "''"}),
+            'default_timezone': ('django.db.models.fields.CharField', [], {'max_length': '20', 'blank': 'True', 'default': "''"}),
+            'email': ('django.db.models.fields.EmailField', [], {'max_length': '75', 'blank': 'True'}),
+            'full_name': ('django.db.models.fields.CharField', [], {'max_length': '256', 'blank': 'True'}),
+            'github_id': ('django.db.models.fields.IntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_superuser': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'last_login': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'password': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'photo': ('django.db.models.fields.files.FileField', [], {'max_length': '500', 'null': 'True', 'blank': 'True'}),
+            'token': ('django.db.models.fields.CharField', [], {'max_length': '200', 'null': 'True', 'blank': 'True', 'default': 'None'}),
+            'username': ('django.db.models.fields.CharField', [], {'max_length': '30', 'unique': 'True'})
+        }
+    }
+
+    complete_apps = ['history']
@@ -16,7 +16,15 @@
 
 import warnings
 
+from django.conf import settings
+
 from .services import take_snapshot
+from .services import defer_snapshot
+from .services import take_bulk_create_snapshots
+from .services import make_key_from_model_object
+
+# Register history deferred tasks
+from . import deferred
 
 
 class HistoryResourceMixin(object):
@@ -63,8 +71,27 @@ class HistoryResourceMixin(object):
         if sobj != obj and delete:
             delete = False
 
-        self.__last_history = take_snapshot(sobj, comment=comment, user=user, delete=delete)
+        if not delete and getattr(settings, "HISTORY_DEFERRED_SNAPSHOTS", False):
+            # The history entry is created (and notified)
+            # later by a deferred task.
+            defer_snapshot(sobj, comment=comment, user=user)
+            self.__last_history = None
+        else:
+            self.__last_history = take_snapshot(sobj, comment=comment, user=user, delete=delete)
+
+        self.__object_saved = True
+
+    def persist_bulk_create_history_snapshots(self, objs:list) -> list:
+        """
+        Bulk version of `persist_history_snapshot` for objects
+        created in bulk. Returns their history entries, in the
+        same order.
+        """
+        entries = take_bulk_create_snapshots(objs, user=self.request.user)
+        entries = {entry.key: entry for entry in entries}
+
         self.__object_saved = True
+        return [entries.get(make_key_from_model_object(obj)) for obj in objs]
 
     def post_save(self, obj, created=False):
         self.persist_history_snapshot(obj=obj)
@@ -20,6 +20,8 @@ from django.db.models.loading import get_model
 from django.utils.functional import cached_property
 from django_pgjson.fields import JsonField
 
+from taiga.base.utils.signals import model_receiver
+
 from .choices import HistoryType
 from .choices import HISTORY_TYPE_CHOICES
 
@@ -51,6 +53,9 @@ class HistoryEntry(models.Model):
     # Stores a values of all identifiers used in
     values = JsonField(null=True, default=None)
 
+    # Stores the values diff, precomputed on write
+    values_diff_cache = JsonField(null=True, default=None, blank=True)
+
     # Stores a comment
     comment = models.TextField(blank=True)
     comment_html = models.TextField(blank=True)
@@ -67,6 +72,15 @@ class HistoryEntry(models.Model):
 
     @cached_property
     def values_diff(self):
+        if self.values_diff_cache is not None:
+            return self.values_diff_cache
+        return self.make_values_diff()
+
+    def make_values_diff(self):
+        """
+        Compute the human readable diff resolving the
+        identifiers of diff with the stored values.
+        """
         result = {}
         users_keys = ["assigned_to", "owner"]
 
@@ -151,4 +165,147 @@ class HistoryEntry(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        index_together = [("key", "type", "created_at")]
+
+
+
+class LastSnapshot(models.Model):
+    """
+    Materialized current frozen state of one history key.
+
+    It is maintained by `take_snapshot` in the same transaction
+    that creates the history entry, so the state of a key can be
+    obtained with one read instead of replaying partial diffs.
+    """
+    key = models.CharField(primary_key=True, max_length=255, editable=False)
+    snapshot = JsonField(null=True, default=None)
+
+    # Number of partial entries created since the last
+    # full snapshot entry (used for checkpoint frequency).
+    partial_diffs = models.IntegerField(default=0)
+    modified_at = models.DateTimeField(auto_now=True)
+
+
+class PendingHistoryEntry(models.Model):
+    """
+    Frozen object waiting to be persisted as history
+    entry by a deferred task.
+    """
+    key = models.CharField(max_length=255, db_index=True)
+    project = models.ForeignKey("projects.Project", null=True, blank=True,
+                                related_name="+")
+    user = JsonField(blank=True, default=None, null=True)
+    comment = models.TextField(blank=True)
+    snapshot = JsonField(null=True, default=None)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class HistoryMigrationCheckpoint(models.Model):
+    """
+    Id of the last object of each type whose reversion history
+    has been migrated by `migrate_history` command.
+    """
+    typename = models.CharField(primary_key=True, max_length=255, editable=False)
+    last_object_id = models.BigIntegerField()
+
+
+class ArchivedHistoryEntry(models.Model):
+    """
+    Old history entry moved out of the history entries
+    table by `compact_history` command.
+
+    The complete entry is stored as zlib compressed json.
+    """
+    id = models.CharField(primary_key=True, max_length=255, editable=False)
+    key = models.CharField(max_length=255, null=True, default=None, blank=True,
+                           db_index=True)
+    created_at = models.DateTimeField()
+    data = models.BinaryField()
+
+    class Meta:
+        ordering = ["created_at"]
+
 
+# Project values cache invalidation
+# (see freeze_impl.PROJECT_VALUES_TYPENAMES)
+
+@model_receiver(models.signals.post_save, "projects.userstorystatus",
+                dispatch_uid="history_userstorystatus_values_invalidation_post_save")
+@model_receiver(models.signals.post_save, "projects.taskstatus",
+                dispatch_uid="history_taskstatus_values_invalidation_post_save")
+@model_receiver(models.signals.post_save, "projects.issuestatus",
+                dispatch_uid="history_issuestatus_values_invalidation_post_save")
+@model_receiver(models.signals.post_save, "projects.issuetype",
+                dispatch_uid="history_issuetype_values_invalidation_post_save")
+@model_receiver(models.signals.post_save, "projects.points",
+                dispatch_uid="history_points_values_invalidation_post_save")
+@model_receiver(models.signals.post_save, "projects.priority",
+                dispatch_uid="history_priority_values_invalidation_post_save")
+@model_receiver(models.signals.post_save, "projects.severity",
+                dispatch_uid="history_severity_values_invalidation_post_save")
+@model_receiver(models.signals.post_save, "users.role",
+                dispatch_uid="history_role_values_invalidation_post_save")
+@model_receiver(models.signals.post_save, "milestones.milestone",
+                dispatch_uid="history_milestone_values_invalidation_post_save")
+@model_receiver(models.signals.post_save, "projects.membership",
+                dispatch_uid="history_membership_values_invalidation_post_save")
+@model_receiver(models.signals.post_delete, "projects.userstorystatus",
+                dispatch_uid="history_userstorystatus_values_invalidation_post_delete")
+@model_receiver(models.signals.post_delete, "projects.taskstatus",
+                dispatch_uid="history_taskstatus_values_invalidation_post_delete")
+@model_receiver(models.signals.post_delete, "projects.issuestatus",
+                dispatch_uid="history_issuestatus_values_invalidation_post_delete")
+@model_receiver(models.signals.post_delete, "projects.issuetype",
+                dispatch_uid="history_issuetype_values_invalidation_post_delete")
+@model_receiver(models.signals.post_delete, "projects.points",
+                dispatch_uid="history_points_values_invalidation_post_delete")
+@model_receiver(models.signals.post_delete, "projects.priority",
+                dispatch_uid="history_priority_values_invalidation_post_delete")
+@model_receiver(models.signals.post_delete, "projects.severity",
+                dispatch_uid="history_severity_values_invalidation_post_delete")
+@model_receiver(models.signals.post_delete, "users.role",
+                dispatch_uid="history_role_values_invalidation_post_delete")
+@model_receiver(models.signals.post_delete, "milestones.milestone",
+                dispatch_uid="history_milestone_values_invalidation_post_delete")
+@model_receiver(models.signals.post_delete, "projects.membership",
+                dispatch_uid="history_membership_values_invalidation_post_delete")
+def project_values_invalidation(sender, instance, **kwargs):
+    freeze_impl.invalidate_project_values(instance.project_id)
+
+
+# Only the names of the users are in the project values
+_USER_VALUES_FIELDS = {"username", "full_name"}
+
+
+def _get_user_project_ids(user):
+    membership_model = get_model("projects", "Membership")
+    return set(membership_model.objects.filter(user=user).values_list("project_id", flat=True))
+
+
+@model_receiver(models.signals.post_save, "users.user",
+                dispatch_uid="history_user_values_invalidation")
+def user_values_invalidation(sender, instance, created, update_fields=None, **kwargs):
+    # New users are not members of any project yet, and saves of
+    # other fields (e.g. last_login on each login) don't change names.
+    if created or (update_fields is not None and not _USER_VALUES_FIELDS & set(update_fields)):
+        return
+
+    for project_id in _get_user_project_ids(instance):
+        freeze_impl.invalidate_project_values(project_id)
+
+
+@model_receiver(models.signals.pre_delete, "users.user",
+                dispatch_uid="history_user_values_remember_projects")
+def user_values_remember_projects(sender, instance, **kwargs):
+    # Memberships are deleted with the user
+    instance._history_values_project_ids = _get_user_project_ids(instance)
+
+
+@model_receiver(models.signals.post_delete, "users.user",
+                dispatch_uid="history_user_values_invalidation_on_delete")
+def user_values_invalidation_on_delete(sender, instance, **kwargs):
+    for project_id in getattr(instance, "_history_values_project_ids", ()):
+        freeze_impl.invalidate_project_values(project_id)
+
+
+from . import freeze_impl
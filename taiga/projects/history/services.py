@@ -25,8 +25,15 @@ This is possible example:
           # Do something...
           history.persist_history(object, user=request.user)
 """
+import binascii
+import datetime
 import logging
+import zlib
+from base64 import urlsafe_b64encode
+from base64 import urlsafe_b64decode
+from collections import defaultdict
 from collections import namedtuple
+from contextlib import closing
 from copy import deepcopy
 from functools import partial
 from functools import wraps
@@ -36,11 +43,22 @@ from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.paginator import Paginator, InvalidPage
 from django.db.models.loading import get_model
+from django.db import connection
+from django.db.models import Q
 from django.db import transaction as tx
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import force_bytes
+from django.utils.translation import ugettext as _
 
 from taiga.mdrender.service import render as mdrender
 from taiga.mdrender.service import get_diff_of_htmls
+from taiga.mdrender.service import share_rendered_fields
+from taiga.base import exceptions as exc
 from taiga.base.utils.db import get_typename_for_model_class
+from taiga.base.utils.json import to_json
+from taiga.deferred import call_async
+from taiga.projects.notifications import services as notifications_services
 
 from .models import HistoryType
 
@@ -52,6 +70,10 @@ FrozenDiff = namedtuple("FrozenDiff", ["key", "diff", "snapshot"])
 # Dict containing registred contentypes with their freeze implementation.
 _freeze_impl_map = {}
 
+# Dict containing registred contentypes with the relations
+# that their freeze implementation needs.
+_freeze_relations_map = {}
+
 # Dict containing registred containing with their values implementation.
 _values_impl_map = {}
 
@@ -85,52 +107,74 @@ def register_values_implementation(typename:str, fn=None):
     return _wrapper
 
 
-def register_freeze_implementation(typename:str, fn=None):
+def register_freeze_implementation(typename:str, fn=None, *, select_related=(), prefetch_related=()):
     """
     Register freeze implementation for specified typename.
     This function can be used as decorator.
+
+    The relations used by the freeze implementation should be
+    declared with `select_related` and `prefetch_related`, so
+    the instance is fetched with them on a single step.
     """
 
     assert isinstance(typename, str), "typename must be specied"
 
     if fn is None:
-        return partial(register_freeze_implementation, typename)
+        return partial(register_freeze_implementation, typename,
+                       select_related=select_related,
+                       prefetch_related=prefetch_related)
 
     @wraps(fn)
     def _wrapper(*args, **kwargs):
         return fn(*args, **kwargs)
 
     _freeze_impl_map[typename] = _wrapper
+    _freeze_relations_map[typename] = (tuple(select_related), tuple(prefetch_related))
     return _wrapper
 
 
 # Low level api
 
-def freeze_model_instance(obj:object) -> FrozenObj:
+def freeze_model_instance(obj:object, *, refresh:bool=True) -> FrozenObj:
     """
     Creates a new frozen object from model instance.
 
     The freeze process consists on converting model
     instances to hashable plain python objects and
     wrapped into FrozenObj.
+
+    If refresh is False, the instance is frozen as is,
+    without fetching it from the database (useful for
+    old versions of an object).
     """
 
     model_cls = obj.__class__
-
-    # Additional query for test if object is really exists
-    # on the database or it is removed.
-    try:
-        obj = model_cls.objects.get(pk=obj.pk)
-    except model_cls.DoesNotExist:
-        return None
-
     typename = get_typename_for_model_class(model_cls)
     if typename not in _freeze_impl_map:
         raise RuntimeError("No implementation found for {}".format(typename))
 
-    key = make_key_from_model_object(obj)
     impl_fn = _freeze_impl_map[typename]
-    return FrozenObj(key, impl_fn(obj))
+    if not refresh:
+        key = make_key_from_model_object(obj)
+        return FrozenObj(key, impl_fn(obj))
+
+    # Fetch the instance with all relations needed by the freeze
+    # implementation. It also tests if the object really exists on
+    # the database or it is removed.
+    select_related, prefetch_related = _freeze_relations_map[typename]
+    qs = model_cls.objects.filter(pk=obj.pk)
+    qs = qs.select_related(*select_related).prefetch_related(*prefetch_related)
+
+    fresh_obj = qs.first()
+    if fresh_obj is None:
+        return None
+
+    # Share already rendered markdown fields with the
+    # original instance (used by serializers).
+    share_rendered_fields(obj, fresh_obj)
+
+    key = make_key_from_model_object(fresh_obj)
+    return FrozenObj(key, impl_fn(fresh_obj))
 
 
 def make_diff(oldobj:FrozenObj, newobj:FrozenObj) -> FrozenDiff:
@@ -171,11 +215,14 @@ def make_diff(oldobj:FrozenObj, newobj:FrozenObj) -> FrozenDiff:
     return FrozenDiff(newobj.key, diff, newobj.snapshot)
 
 
-def make_diff_values(typename:str, fdiff:FrozenDiff) -> dict:
+def make_diff_values(typename:str, fdiff:FrozenDiff, project=None) -> dict:
     """
     Given a typename and diff, build a values dict for it.
     If no implementation found for typename, warnig is raised in
     logging and returns empty dict.
+
+    If project is given, values are resolved using the
+    cached values of the project.
     """
 
     if typename not in _values_impl_map:
@@ -183,21 +230,39 @@ def make_diff_values(typename:str, fdiff:FrozenDiff) -> dict:
         return {}
 
     impl_fn = _values_impl_map[typename]
-    return impl_fn(fdiff.diff)
+    return impl_fn(fdiff.diff, project=project)
+
+
+def _apply_diff(snapshot:dict, diff:dict) -> dict:
+    # Replaced values are not mutated, a shallow copy is enough
+    result = dict(snapshot)
+
+    for key, value in diff.items():
+        # Computed from the description, it is not in the snapshots
+        if key == "description_diff":
+            continue
+        result[key] = value[1]
+
+    return result
 
 
 def _rebuild_snapshot_from_diffs(keysnapshot, partials):
     result = deepcopy(keysnapshot)
 
     for part in partials:
-        for key, value in part.diff.items():
-            result[key] = value[1]
+        result = _apply_diff(result, part.diff or {})
 
     return result
 
 
-def get_last_snapshot_for_key(key:str) -> FrozenObj:
+def _rebuild_last_snapshot_from_entries(key:str):
+    """
+    Build the current state of a key replaying its history
+    entries. It is only used for keys that have history
+    previous to the existence of LastSnapshot table.
+    """
     entry_model = get_model("history", "HistoryEntry")
+    snapshot_model = get_model("history", "LastSnapshot")
 
     # Search last snapshot
     qs = (entry_model.objects
@@ -206,7 +271,7 @@ def get_last_snapshot_for_key(key:str) -> FrozenObj:
 
     keysnapshot = qs.first()
     if keysnapshot is None:
-        return None, True
+        return None
 
     # Get all partial snapshots
     entries = tuple(entry_model.objects
@@ -215,35 +280,105 @@ def get_last_snapshot_for_key(key:str) -> FrozenObj:
                     .order_by("created_at"))
 
     snapshot = _rebuild_snapshot_from_diffs(keysnapshot.snapshot, entries)
-    max_partial_diffs = getattr(settings, "MAX_PARTIAL_DIFFS", 60)
+    return snapshot_model(key=key, snapshot=snapshot, partial_diffs=len(entries))
 
-    if len(entries) >= max_partial_diffs:
-        return FrozenObj(keysnapshot.key, snapshot), True
 
-    return FrozenObj(keysnapshot.key, snapshot), False
+def _lock_history_key(key:str):
+    """
+    Serialize history writes of the same key until the end
+    of current transaction.
+    """
+    with closing(connection.cursor()) as cursor:
+        cursor.execute("select pg_advisory_xact_lock(hashtext(%s))", [key])
 
 
-# Public api
+def _lock_pending_entry(pending_id:int):
+    """
+    Hold a lock on a pending entry until the end of the
+    transaction that creates it.
+    """
+    with closing(connection.cursor()) as cursor:
+        cursor.execute("select pg_advisory_xact_lock(hashtext(%s))",
+                       ["history-pending:{}".format(pending_id)])
 
-@tx.atomic
-def take_snapshot(obj:object, *, comment:str="", user=None, delete:bool=False):
+
+def _is_pending_entry_uncommitted(pending_id:int) -> bool:
     """
-    Given any model instance with registred content type,
-    create new history entry of "change" type.
+    Check if the transaction that creates a pending entry
+    is still in progress.
+    """
+    with closing(connection.cursor()) as cursor:
+        cursor.execute("select pg_try_advisory_xact_lock(hashtext(%s))",
+                       ["history-pending:{}".format(pending_id)])
+        return not cursor.fetchone()[0]
 
-    This raises exception in case of object wasn't
-    previously freezed.
+
+def _get_last_snapshot_state(key:str):
+    snapshot_model = get_model("history", "LastSnapshot")
+
+    state = snapshot_model.objects.filter(key=key).first()
+    if state is None:
+        state = _rebuild_last_snapshot_from_entries(key)
+
+    return state
+
+
+def is_checkpoint_needed(partial_diffs:int) -> bool:
     """
+    Check if the next entry of a key should store a full
+    snapshot, given the number of partial entries created
+    since the last full snapshot.
+    """
+    max_partial_diffs = getattr(settings, "MAX_PARTIAL_DIFFS", 60)
+    return partial_diffs >= max_partial_diffs
 
-    key = make_key_from_model_object(obj)
-    typename = get_typename_for_model_class(obj.__class__)
 
-    new_fobj = freeze_model_instance(obj)
-    old_fobj, need_real_snapshot = get_last_snapshot_for_key(key)
+def _unpack_last_snapshot_state(state) -> FrozenObj:
+    if state is None:
+        return None, True
 
-    entry_model = get_model("history", "HistoryEntry")
+    need_real_snapshot = is_checkpoint_needed(state.partial_diffs)
+    return FrozenObj(state.key, state.snapshot), need_real_snapshot
+
+
+def get_last_snapshot_for_key(key:str) -> FrozenObj:
+    """
+    Get the last frozen state of the key and a flag that
+    indicates if the next history entry should store a
+    complete snapshot.
+    """
+    state = _get_last_snapshot_state(key)
+    return _unpack_last_snapshot_state(state)
+
+
+def _update_last_snapshot_state(state, key:str, snapshot:dict, is_snapshot:bool):
+    if state is None:
+        snapshot_model = get_model("history", "LastSnapshot")
+        state = snapshot_model(key=key)
+
+    state.snapshot = snapshot
+    state.partial_diffs = 0 if is_snapshot else state.partial_diffs + 1
+    state.save()
+    return state
+
+
+def make_user_data(user) -> dict:
     user_id = None if user is None else user.id
     user_name = "" if user is None else user.get_full_name()
+    return {"pk": user_id, "name": user_name}
+
+
+def build_history_entry(typename:str, old_fobj:FrozenObj, new_fobj:FrozenObj, *,
+                        need_real_snapshot:bool, project, comment:str="", user:dict=None,
+                        delete:bool=False):
+    """
+    Compute diff and values of a frozen object against its
+    previous frozen state and build (without saving) the
+    history entry.
+
+    Returns None if there are nothing to store.
+    """
+    entry_model = get_model("history", "HistoryEntry")
 
     # Determine history type
     if delete:
@@ -256,8 +391,8 @@ def take_snapshot(obj:object, *, comment:str="", user=None, delete:bool=False):
         raise RuntimeError("Unexpected condition")
 
     kwargs = {
-        "user": {"pk": user_id, "name": user_name},
-        "key": key,
+        "user": user,
+        "key": new_fobj.key,
         "type": entry_type,
         "comment": "",
         "comment_html": "",
@@ -268,7 +403,7 @@ def take_snapshot(obj:object, *, comment:str="", user=None, delete:bool=False):
     }
 
     fdiff = make_diff(old_fobj, new_fobj)
-    fvals = make_diff_values(typename, fdiff)
+    fvals = make_diff_values(typename, fdiff, project=project)
 
     # If diff and comment are empty, do
     # not create empty history entry
@@ -284,14 +419,194 @@ def take_snapshot(obj:object, *, comment:str="", user=None, delete:bool=False):
         "values": fvals,
         "comment": comment,
         "diff": fdiff.diff,
-        "comment_html": mdrender(obj.project, comment),
+        "comment_html": mdrender(project, comment),
     })
 
-    return entry_model.objects.create(**kwargs)
+    entry = entry_model(**kwargs)
+    entry.values_diff_cache = entry.make_values_diff()
+    return entry
+
+
+def _persist_snapshot(key:str, typename:str, new_fobj:FrozenObj, *, project, comment:str="",
+                      user:dict=None, delete:bool=False, created_at=None):
+    """
+    Create the history entry of a frozen object against
+    the last snapshot of its key.
+
+    It should be called with the key locked.
+    """
+    state = _get_last_snapshot_state(key)
+    old_fobj, need_real_snapshot = _unpack_last_snapshot_state(state)
+
+    entry = build_history_entry(typename, old_fobj, new_fobj,
+                                need_real_snapshot=need_real_snapshot,
+                                project=project, comment=comment,
+                                user=user, delete=delete)
+    if entry is None:
+        return None
+
+    entry.save(force_insert=True)
+
+    # created_at field is filled automatically on create,
+    # so the original date of deferred entries is restored.
+    if created_at is not None:
+        entry.__class__.objects.filter(pk=entry.pk).update(created_at=created_at)
+        entry.created_at = created_at
+
+    _update_last_snapshot_state(state, key, new_fobj.snapshot, need_real_snapshot)
+    return entry
+
+
+def persist_pending_entries(key:str) -> list:
+    """
+    Create, in order, the history entries of all pending
+    (deferred) snapshots of the key.
+
+    It should be called with the key locked.
+    """
+    pending_model = get_model("history", "PendingHistoryEntry")
+    typename = key.rsplit(":", 1)[0]
+
+    qs = pending_model.objects.filter(key=key).select_related("project")
+    entries = []
+
+    for pending in qs.order_by("id"):
+        fobj = FrozenObj(pending.key, pending.snapshot)
+        entry = _persist_snapshot(key, typename, fobj, project=pending.project,
+                                  comment=pending.comment, user=pending.user,
+                                  created_at=pending.created_at)
+        if entry is not None:
+            entries.append(entry)
+
+        pending.delete()
+
+    return entries
+
+
+def get_stale_pending_keys(max_age:int) -> list:
+    """
+    Get the keys with pending entries created more than
+    `max_age` seconds ago (their deferred task gave up
+    or was lost).
+    """
+    pending_model = get_model("history", "PendingHistoryEntry")
+    created_before = timezone.now() - datetime.timedelta(seconds=max_age)
+
+    qs = pending_model.objects.filter(created_at__lt=created_before)
+    return list(qs.values_list("key", flat=True).distinct())
+
+
+# Public api
+
+@tx.atomic
+def take_snapshot(obj:object, *, comment:str="", user=None, delete:bool=False):
+    """
+    Given any model instance with registred content type,
+    create new history entry of "change" type.
+
+    This raises exception in case of object wasn't
+    previously freezed.
+    """
+
+    key = make_key_from_model_object(obj)
+    typename = get_typename_for_model_class(obj.__class__)
+
+    new_fobj = freeze_model_instance(obj)
+
+    # Serialize concurrent snapshots of the same object and
+    # persist the deferred ones first for keep the order.
+    _lock_history_key(key)
+    for entry in persist_pending_entries(key):
+        notifications_services.send_history_notifications(obj, entry)
+
+    return _persist_snapshot(key, typename, new_fobj, project=obj.project, comment=comment,
+                             user=make_user_data(user), delete=delete)
+
+
+@tx.atomic
+def defer_snapshot(obj:object, *, comment:str="", user=None):
+    """
+    Deferred version of `take_snapshot`.
+
+    The object is frozen in the current transaction and the
+    diff computation and history entry creation are delegated
+    to a deferred task that processes the pending snapshots
+    of each key in order.
+
+    Deleting is not supported because the deferred task
+    needs the object for notifications.
+    """
+    new_fobj = freeze_model_instance(obj)
+    if new_fobj is None:
+        return None
+
+    pending_model = get_model("history", "PendingHistoryEntry")
+    pending = pending_model.objects.create(key=new_fobj.key,
+                                           project=obj.project,
+                                           user=make_user_data(user),
+                                           comment=comment,
+                                           snapshot=new_fobj.snapshot)
+    _lock_pending_entry(pending.id)
+
+    call_async("history.persist_pending_entries", new_fobj.key, pending.id)
+    return pending
+
+
+
+@tx.atomic
+def take_bulk_create_snapshots(objs:list, *, user=None) -> list:
+    """
+    Bulk version of `take_snapshot` for just created objects of
+    the same model.
 
+    New objects have no previous snapshots, so their keys don't
+    need to be locked and all their history entries and last
+    snapshot states are inserted with one query each.
+    """
+    if not objs:
+        return []
+
+    model_cls = objs[0].__class__
+    typename = get_typename_for_model_class(model_cls)
+    if typename not in _freeze_impl_map:
+        raise RuntimeError("No implementation found for {}".format(typename))
+
+    impl_fn = _freeze_impl_map[typename]
+    select_related, prefetch_related = _freeze_relations_map[typename]
+    qs = model_cls.objects.filter(pk__in=[obj.pk for obj in objs])
+    qs = qs.select_related(*select_related).prefetch_related(*prefetch_related)
+
+    entry_model = get_model("history", "HistoryEntry")
+    snapshot_model = get_model("history", "LastSnapshot")
+    user_data = make_user_data(user)
+    entries = []
+    states = []
+
+    for obj in qs:
+        new_fobj = FrozenObj(make_key_from_model_object(obj), impl_fn(obj))
+        entries.append(build_history_entry(typename, None, new_fobj,
+                                           need_real_snapshot=True,
+                                           project=obj.project,
+                                           user=user_data))
+        states.append(snapshot_model(key=new_fobj.key, snapshot=new_fobj.snapshot))
+
+    entry_model.objects.bulk_create(entries)
+    snapshot_model.objects.bulk_create(states)
+    return entries
 
 # High level query api
 
+def get_instance_by_key(key:str) -> object:
+    """
+    Get the model instance referenced by history key or
+    None if it not exists.
+    """
+    typename, pk = key.rsplit(":", 1)
+    app_label, model_name = typename.split(".", 1)
+    model_cls = get_model(app_label, model_name)
+    return model_cls.objects.filter(pk=pk).first()
+
+
 def get_history_queryset_by_model_instance(obj:object, types=(HistoryType.change,)):
     """
     Get one page of history for specified object.
@@ -303,6 +618,327 @@ def get_history_queryset_by_model_instance(obj:object, types=(HistoryType.change
     return qs.order_by("-created_at")
 
 
+def make_history_cursor(entry:object) -> str:
+    """
+    Make an opaque cursor that points to the
+    position of an entry on history.
+    """
+    value = "{0}|{1}".format(entry.created_at.isoformat(), entry.pk)
+    return urlsafe_b64encode(force_bytes(value)).decode("ascii")
+
+
+def parse_history_cursor(cursor:str) -> tuple:
+    """
+    Parse a cursor created with `make_history_cursor`
+    returning (created_at, id) tuple.
+    """
+    try:
+        value = urlsafe_b64decode(force_bytes(cursor)).decode("ascii")
+        created_at, pk = value.split("|", 1)
+    except (TypeError, ValueError, binascii.Error):
+        raise exc.WrongArguments(_("Invalid history cursor"))
+
+    created_at = parse_datetime(created_at)
+    if created_at is None:
+        raise exc.WrongArguments(_("Invalid history cursor"))
+
+    return created_at, pk
+
+
+def get_history_page_by_cursor(queryset, cursor:str=None, *, limit:int) -> tuple:
+    """
+    Keyset pagination of a history queryset by (created_at, id).
+
+    It returns a tuple with the list of entries of the page
+    and the cursor of the next page (or None if it is the
+    last page).
+    """
+    qs = queryset.order_by("-created_at", "-id")
+
+    if cursor:
+        created_at, pk = parse_history_cursor(cursor)
+        qs = qs.filter(Q(created_at__lt=created_at) |
+                       Q(created_at=created_at, id__lt=pk))
+
+    entries = list(qs[:limit + 1])
+    if len(entries) <= limit:
+        return entries, None
+
+    entries = entries[:limit]
+    return entries, make_history_cursor(entries[-1])
+
+
+# Compaction api
+
+_DROP_SNAPSHOTS_SQL = """
+WITH redundant AS (
+    SELECT id, pg_column_size(snapshot) AS size
+      FROM history_historyentry
+     WHERE key = ANY(%s)
+       AND is_snapshot = true
+       {keep_latest_sql}
+), updated AS (
+    UPDATE history_historyentry
+       SET snapshot = NULL, is_snapshot = false
+     WHERE id IN (SELECT id FROM redundant)
+    RETURNING id
+)
+SELECT count(*), coalesce(sum(size), 0) FROM redundant;
+"""
+
+_KEEP_LATEST_SNAPSHOT_SQL = """
+       AND id NOT IN (SELECT DISTINCT ON (key) id
+                        FROM history_historyentry
+                       WHERE key = ANY(%s)
+                         AND is_snapshot = true
+                       ORDER BY key, created_at DESC)
+"""
+
+
+def iter_history_keys(chunk_size:int):
+    """
+    Iterate over all history keys in lists
+    of at most `chunk_size` keys.
+    """
+    entry_model = get_model("history", "HistoryEntry")
+    last_key = None
+
+    while True:
+        qs = entry_model.objects.exclude(key=None).order_by("key")
+        if last_key is not None:
+            qs = qs.filter(key__gt=last_key)
+
+        keys = list(qs.values_list("key", flat=True).distinct()[:chunk_size])
+        if not keys:
+            return
+
+        yield keys
+        last_key = keys[-1]
+
+
+def get_deleted_keys(keys:list) -> set:
+    """
+    Given a list of history keys, return the keys
+    of objects that are not longer exists.
+    """
+    keys_by_typename = defaultdict(dict)
+    for key in keys:
+        typename, pk = key.rsplit(":", 1)
+        keys_by_typename[typename][pk] = key
+
+    deleted = set()
+    for typename, keys_by_pk in keys_by_typename.items():
+        model_cls = get_model(*typename.split(".", 1))
+        if model_cls is None:
+            continue
+
+        qs = model_cls.objects.filter(pk__in=list(keys_by_pk)).values_list("pk", flat=True)
+        existing = set(map(str, qs))
+        deleted.update(key for pk, key in keys_by_pk.items() if pk not in existing)
+
+    return deleted
+
+
+def materialize_last_snapshot(key:str):
+    """
+    Ensure that the last snapshot of the key is stored on
+    LastSnapshot table, so it no longer depends on full
+    snapshots of history entries.
+
+    Returns the size in bytes of the stored snapshot if it
+    has been created, otherwise 0.
+    """
+    snapshot_model = get_model("history", "LastSnapshot")
+
+    if snapshot_model.objects.filter(key=key).exists():
+        return 0
+
+    state = _rebuild_last_snapshot_from_entries(key)
+    if state is None:
+        return 0
+
+    state.save()
+    return snapshot_model.objects.filter(key=key).extra(
+        select={"size": "pg_column_size(history_lastsnapshot.*)"}).values_list("size", flat=True)[0]
+
+
+def drop_last_snapshots(keys:list) -> int:
+    """
+    Remove the materialized state of keys of removed
+    objects. Returns the size in bytes of the removed rows.
+    """
+    sql = """
+    WITH deleted AS (
+        DELETE FROM history_lastsnapshot
+         WHERE key = ANY(%s)
+        RETURNING pg_column_size(history_lastsnapshot.*) AS size
+    )
+    SELECT coalesce(sum(size), 0) FROM deleted;
+    """
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, [keys])
+        return cursor.fetchone()[0]
+
+
+def drop_redundant_snapshots(keys:list, *, keep_latest:bool=True) -> tuple:
+    """
+    Remove full snapshots from history entries of the keys,
+    keeping only the latest one as checkpoint if `keep_latest`
+    is True (all of them should only be removed for keys of
+    removed objects, whose state is no longer needed).
+
+    Returns a tuple with the number of updated entries and
+    the size in bytes of the removed snapshots.
+    """
+    if keep_latest:
+        sql = _DROP_SNAPSHOTS_SQL.format(keep_latest_sql=_KEEP_LATEST_SNAPSHOT_SQL)
+        params = [keys, keys]
+    else:
+        sql = _DROP_SNAPSHOTS_SQL.format(keep_latest_sql="")
+        params = [keys]
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, params)
+        count, size = cursor.fetchone()
+
+    return count, size
+
+
+def collapse_snapshot_chains(keys:list, window:int) -> tuple:
+    """
+    Keep a full snapshot (checkpoint) every `window` history
+    entries of the keys, from the first one, and the latest one.
+    Other full snapshots are removed, and long chains of partial
+    entries get a new checkpoint rebuilt from their diffs, so any
+    state of a key is rebuilt replaying at most `window` entries.
+
+    Returns a tuple with the number of removed snapshots, the
+    number of created checkpoints and the estimated size in bytes
+    of the removed snapshots minus the created ones.
+    """
+    entry_model = get_model("history", "HistoryEntry")
+    dropped, created, size = [], 0, 0
+
+    for key in keys:
+        qs = entry_model.objects.filter(key=key).order_by("created_at")
+        entries = list(qs.only("id", "is_snapshot", "snapshot", "diff"))
+
+        snapshot_indexes = [i for i, entry in enumerate(entries) if entry.is_snapshot]
+        if not snapshot_indexes:
+            continue
+
+        first, latest = snapshot_indexes[0], snapshot_indexes[-1]
+        state = None
+
+        for index, entry in enumerate(entries[first:], first):
+            if entry.is_snapshot:
+                state = entry.snapshot
+            else:
+                state = _apply_diff(state, entry.diff or {})
+
+            is_checkpoint = (index - first) % window == 0 or index == latest
+            if entry.is_snapshot and not is_checkpoint:
+                dropped.append(entry.id)
+                size += len(force_bytes(to_json(entry.snapshot)))
+            elif is_checkpoint and not entry.is_snapshot:
+                entry_model.objects.filter(id=entry.id).update(snapshot=state, is_snapshot=True)
+                created += 1
+                size -= len(force_bytes(to_json(state)))
+
+    if dropped:
+        entry_model.objects.filter(id__in=dropped).update(snapshot=None, is_snapshot=False)
+
+    return len(dropped), created, size
+
+
+def archive_history_entries(keys:list, before, *, keep_state:bool=True, batch_size:int=500) -> tuple:
+    """
+    Move history entries of the keys created before
+    a date to the compressed archive table.
+
+    Returns a tuple with the number of archived entries and
+    the estimated number of bytes reclaimed.
+    """
+    entry_model = get_model("history", "HistoryEntry")
+    archive_model = get_model("history", "ArchivedHistoryEntry")
+
+    qs = entry_model.objects.filter(key__in=keys, created_at__lt=before)
+    count, reclaimed = 0, 0
+
+    # Archived entries can contain the latest full snapshot
+    # of a key, so the state of these keys is stored before.
+    if keep_state:
+        for key in qs.order_by("key").values_list("key", flat=True).distinct():
+            reclaimed -= materialize_last_snapshot(key)
+
+    qs = qs.extra(select={"row_size": "pg_column_size(history_historyentry.*)"})
+    qs = qs.order_by("created_at")
+
+    while True:
+        rows = list(qs.values()[:batch_size])
+        if not rows:
+            break
+
+        archived = []
+        for row in rows:
+            row_size = row.pop("row_size")
+            data = zlib.compress(force_bytes(to_json(row)))
+            archived.append(archive_model(id=row["id"], key=row["key"],
+                                          created_at=row["created_at"], data=data))
+            reclaimed += row_size - len(data)
+
+        archive_model.objects.bulk_create(archived)
+        entry_model.objects.filter(id__in=[x["id"] for x in rows]).delete()
+        count += len(rows)
+
+    return count, reclaimed
+
+
+@tx.atomic
+def compact_history_keys(keys:list, *, archive_before=None, checkpoint_window:int=None) -> dict:
+    """
+    Compact the history of the keys: keep one full snapshot
+    every `checkpoint_window` entries (see `collapse_snapshot_chains`),
+    drop all of them, and the materialized state, for keys of
+    removed objects and optionally archive old entries.
+
+    Returns the stats of the compaction, with the net number
+    of bytes reclaimed.
+    """
+    if checkpoint_window is None:
+        checkpoint_window = getattr(settings, "HISTORY_COMPACT_CHECKPOINT_WINDOW", 500)
+
+    for key in keys:
+        _lock_history_key(key)
+
+    deleted_keys = list(get_deleted_keys(keys))
+    alive_keys = [x for x in keys if x not in deleted_keys]
+
+    stats = {"snapshots": 0, "checkpoints": 0, "archived": 0, "bytes": 0}
+
+    if alive_keys:
+        count, created, size = collapse_snapshot_chains(alive_keys, checkpoint_window)
+        stats["snapshots"] += count
+        stats["checkpoints"] += created
+        stats["bytes"] += size
+
+    if deleted_keys:
+        count, size = drop_redundant_snapshots(deleted_keys, keep_latest=False)
+        stats["snapshots"] += count
+        stats["bytes"] += size + drop_last_snapshots(deleted_keys)
+
+    if archive_before is not None:
+        for keys_group, keep_state in ((alive_keys, True), (deleted_keys, False)):
+            if not keys_group:
+                continue
+
+            count, size = archive_history_entries(keys_group, archive_before, keep_state=keep_state)
+            stats["archived"] += count
+            stats["bytes"] += size
+
+    return stats
+
+
 # Freeze implementatitions
 from .freeze_impl import project_freezer
 from .freeze_impl import milestone_freezer
@@ -312,11 +948,19 @@ from .freeze_impl import task_freezer
 from .freeze_impl import wikipage_freezer
 
 register_freeze_implementation("projects.project", project_freezer)
-register_freeze_implementation("milestones.milestone", milestone_freezer,)
-register_freeze_implementation("userstories.userstory", userstory_freezer)
-register_freeze_implementation("issues.issue", issue_freezer)
-register_freeze_implementation("tasks.task", task_freezer)
-register_freeze_implementation("wiki.wikipage", wikipage_freezer)
+register_freeze_implementation("milestones.milestone", milestone_freezer)
+register_freeze_implementation("userstories.userstory", userstory_freezer,
+                               select_related=("project",),
+                               prefetch_related=("role_points", "watchers", "attachments"))
+register_freeze_implementation("issues.issue", issue_freezer,
+                               select_related=("project",),
+                               prefetch_related=("watchers", "attachments"))
+register_freeze_implementation("tasks.task", task_freezer,
+                               select_related=("project",),
+                               prefetch_related=("watchers", "attachments"))
+register_freeze_implementation("wiki.wikipage", wikipage_freezer,
+                               select_related=("project",),
+                               prefetch_related=("watchers", "attachments"))
 
 from .freeze_impl import milestone_values
 from .freeze_impl import userstory_values
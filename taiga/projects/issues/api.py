@@ -42,14 +42,21 @@ from . import serializers
 
 
 class IssuesFilter(filters.FilterBackend):
-    filter_fields = ( "status", "severity", "priority", "owner", "assigned_to", "tags", "type")
+    filter_fields = ( "status", "severity", "priority", "owner", "assigned_to", "tags", "type",
+                      "tags__all", "tags__any", "tags__none")
+    tags_filters = {
+        "tags": "all",
+        "tags__all": "all",
+        "tags__any": "any",
+        "tags__none": "none",
+    }
     _special_values_dict = {
         'true': True,
         'false': False,
         'null': None,
     }
 
-    def _prepare_filters_data(self, request):
+    def prepare_filters_data(self, request):
         def _transform_value(value):
             try:
                 return int(value)
@@ -66,19 +73,20 @@ class IssuesFilter(filters.FilterBackend):
             raw_value = request.QUERY_PARAMS[filtername]
             values = set([x.strip() for x in raw_value.split(",")])
 
-            if filtername != "tags":
+            if filtername not in self.tags_filters:
                 values = map(_transform_value, values)
 
             data[filtername] = list(values)
         return data
 
     def filter_queryset(self, request, queryset, view):
-        filterdata = self._prepare_filters_data(request)
+        filterdata = self.prepare_filters_data(request)
 
-        if "tags" in filterdata:
-            queryset = tags.filter(queryset, contains=filterdata["tags"])
+        for name, operator in self.tags_filters.items():
+            if name in filterdata:
+                queryset = tags.filter(queryset, **{operator: filterdata[name]})
 
-        for name, value in filter(lambda x: x[0] != "tags", filterdata.items()):
+        for name, value in filter(lambda x: x[0] not in self.tags_filters, filterdata.items()):
             if None in value:
                 qs_in_kwargs = {"{0}__in".format(name): [v for v in value if v != None]}
                 qs_isnull_kwargs = {"{0}__isnull".format(name): True}
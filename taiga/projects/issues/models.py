@@ -22,10 +22,12 @@ from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 
 from taiga.base.tags import TaggedMixin
+from taiga.base.utils.original_values import track_fields
 from taiga.base.utils.slug import ref_uniquely
 from taiga.projects.notifications import WatchedModelMixin
 from taiga.projects.occ import OCCModelMixin
 from taiga.projects.mixins.blocked import BlockedMixin
+from taiga.projects.services import tags as tags_services
 
 
 class Issue(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, models.Model):
@@ -55,6 +57,8 @@ class Issue(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, models.
     subject = models.CharField(max_length=500, null=False, blank=False,
                                verbose_name=_("subject"))
     description = models.TextField(null=False, blank=True, verbose_name=_("description"))
+    description_html = models.TextField(null=True, blank=True, editable=False,
+                                        verbose_name=_("description html"))
     assigned_to = models.ForeignKey(settings.AUTH_USER_MODEL, blank=True, null=True,
                                     default=None, related_name="issues_assigned_to_me",
                                     verbose_name=_("assigned to"))
@@ -100,3 +104,21 @@ def issue_finished_date_handler(sender, instance, **kwargs):
 def issue_tags_normalization(sender, instance, **kwargs):
     if isinstance(instance.tags, (list, tuple)):
         instance.tags = list(map(lambda x: x.lower(), instance.tags))
+
+
+track_fields(Issue, "project", "tags")
+
+
+@receiver(models.signals.pre_save, sender=Issue, dispatch_uid="issue-remember-tags")
+def issue_remember_tags(sender, instance, update_fields=None, **kwargs):
+    tags_services.remember_tags(sender, instance, update_fields=update_fields)
+
+
+@receiver(models.signals.post_save, sender=Issue, dispatch_uid="issue-update-project-tags")
+def issue_update_project_tags(sender, instance, **kwargs):
+    tags_services.update_project_tags_on_save(instance)
+
+
+@receiver(models.signals.post_delete, sender=Issue, dispatch_uid="issue-update-project-tags-on-delete")
+def issue_update_project_tags_on_delete(sender, instance, **kwargs):
+    tags_services.update_project_tags_on_delete(instance)
@@ -17,9 +17,10 @@
 from rest_framework import serializers
 
 from taiga.base.serializers import PickleField, NeighborsSerializerMixin
+from taiga.base.serializers import RenderedFieldsSerializerMixin
 from taiga.projects.attachments.serializers import AttachmentSerializer
 # from taiga.projects.mixins.notifications import WatcherValidationSerializerMixin
-from taiga.mdrender.service import render as mdrender
+from taiga.mdrender.service import render_field
 
 from . import models
 
@@ -31,7 +32,7 @@ class IssueAttachmentSerializer(AttachmentSerializer):
 
 # class IssueSerializer(WatcherValidationSerializerMixin, serializers.ModelSerializer):
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(RenderedFieldsSerializerMixin, serializers.ModelSerializer):
     tags = PickleField(required=False)
     is_closed = serializers.Field(source="is_closed")
     comment = serializers.SerializerMethodField("get_comment")
@@ -39,6 +40,7 @@ class IssueSerializer(serializers.ModelSerializer):
     generated_user_stories = serializers.SerializerMethodField("get_generated_user_stories")
     blocked_note_html = serializers.SerializerMethodField("get_blocked_note_html")
     description_html = serializers.SerializerMethodField("get_description_html")
+    rendered_fields = ("description", "blocked_note")
     votes = serializers.SerializerMethodField("get_votes_number")
 
     class Meta:
@@ -52,10 +54,10 @@ class IssueSerializer(serializers.ModelSerializer):
         return obj.generated_user_stories.values("id", "ref", "subject")
 
     def get_blocked_note_html(self, obj):
-        return mdrender(obj.project, obj.blocked_note)
+        return render_field(obj, "blocked_note")
 
     def get_description_html(self, obj):
-        return mdrender(obj.project, obj.description)
+        return render_field(obj, "description")
 
     def get_votes_number(self, obj):
         # The "votes_count" attribute is attached in the get_queryset of the viewset.
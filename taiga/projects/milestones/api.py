@@ -32,8 +32,7 @@ from taiga.projects.history import HistoryResourceMixin
 from . import serializers
 from . import models
 from . import permissions
-
-import datetime
+from . import services
 
 
 class MilestoneViewSet(HistoryResourceMixin, WatchedResourceMixin, ModelCrudViewSet):
@@ -67,33 +66,4 @@ class MilestoneViewSet(HistoryResourceMixin, WatchedResourceMixin, ModelCrudView
     @detail_route(methods=['get'])
     def stats(self, request, pk=None):
         milestone = get_object_or_404(models.Milestone, pk=pk)
-        total_points = milestone.total_points
-        milestone_stats = {
-            'name': milestone.name,
-            'estimated_start': milestone.estimated_start,
-            'estimated_finish': milestone.estimated_finish,
-            'total_points': total_points,
-            'completed_points': milestone.closed_points.values(),
-            'total_userstories': milestone.user_stories.count(),
-            'completed_userstories': len([us for us in milestone.user_stories.all() if us.is_closed]),
-            'total_tasks': milestone.tasks.all().count(),
-            'completed_tasks': milestone.tasks.all().filter(status__is_closed=True).count(),
-            'iocaine_doses': milestone.tasks.filter(is_iocaine=True).count(),
-            'days': []
-        }
-        current_date = milestone.estimated_start
-        sumTotalPoints = sum(total_points.values())
-        optimal_points = sumTotalPoints
-        milestone_days = (milestone.estimated_finish - milestone.estimated_start).days
-        optimal_points_per_day = sumTotalPoints / milestone_days if milestone_days else 0
-        while current_date <= milestone.estimated_finish:
-            milestone_stats['days'].append({
-                'day': current_date,
-                'name': current_date.day,
-                'open_points':  sumTotalPoints - sum(milestone.closed_points_by_date(current_date).values()),
-                'optimal_points': optimal_points,
-            })
-            current_date = current_date + datetime.timedelta(days=1)
-            optimal_points -= optimal_points_per_day
-
-        return Response(milestone_stats)
+        return Response(services.get_stats_for_milestone(milestone))
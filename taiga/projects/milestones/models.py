@@ -16,14 +16,19 @@
 
 from django.db import models
 from django.conf import settings
+from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 
+from taiga.base.utils.original_values import track_fields, get_original_values
 from taiga.base.utils.slug import slugify_uniquely
 from taiga.base.utils.dicts import dict_sum
 from taiga.projects.notifications import WatchedModelMixin
-from taiga.projects.userstories.models import UserStory
+from taiga.projects.userstories.models import UserStory, RolePoints
+from taiga.projects.services import points as points_services
+from taiga.projects.services import stats as stats_services
+
+from . import services
 
-import itertools
 import datetime
 
 
@@ -71,35 +76,25 @@ class Milestone(WatchedModelMixin, models.Model):
 
         super().save(*args, **kwargs)
 
-    def _get_user_stories_points(self, user_stories):
-        role_points = [us.role_points.all() for us in user_stories]
-        flat_role_points = itertools.chain(*role_points)
-        flat_role_dicts = map(lambda x: {x.role_id: x.points.value if x.points.value else 0}, flat_role_points)
-        return dict_sum(*flat_role_dicts)
-
     @property
     def total_points(self):
-        return self._get_user_stories_points(
-            [us for us in self.user_stories.all()]
-        )
+        return points_services.get_points_per_role(milestone_id=self.id)
 
     @property
     def closed_points(self):
-        return self._get_user_stories_points(
-            [us for us in self.user_stories.all() if us.is_closed]
-        )
+        return points_services.get_points_per_role(milestone_id=self.id, is_closed=True)
 
     def _get_points_increment(self, client_requirement, team_requirement):
-        user_stories = UserStory.objects.none()
-        if self.estimated_start and self.estimated_finish:
-            user_stories = UserStory.objects.filter(
-                created_date__gte=self.estimated_start,
-                created_date__lt=self.estimated_finish,
-                project_id=self.project_id,
-                client_requirement=client_requirement,
-                team_requirement=team_requirement
-            )
-        return self._get_user_stories_points(user_stories)
+        if not (self.estimated_start and self.estimated_finish):
+            return dict_sum()
+
+        return points_services.get_points_per_role(
+            created_date__gte=self.estimated_start,
+            created_date__lt=self.estimated_finish,
+            project_id=self.project_id,
+            client_requirement=client_requirement,
+            team_requirement=team_requirement
+        )
 
     @property
     def client_increment_points(self):
@@ -122,8 +117,77 @@ class Milestone(WatchedModelMixin, models.Model):
         return self._get_points_increment(True, True)
 
     def closed_points_by_date(self, date):
-        return self._get_user_stories_points([
-            us for us in self.user_stories.filter(
-                finish_date__lt=date + datetime.timedelta(days=1)
-            ) if us.is_closed
-        ])
+        return points_services.get_points_per_role(
+            milestone_id=self.id,
+            is_closed=True,
+            finish_date__lt=date + datetime.timedelta(days=1)
+        )
+
+
+class MilestoneBurndownDay(models.Model):
+    milestone = models.ForeignKey("Milestone", null=False, blank=False,
+                                  related_name="burndown_days", verbose_name=_("milestone"))
+    day = models.DateField(null=False, blank=False, verbose_name=_("day"))
+    open_points = models.FloatField(default=0.0, null=False, blank=False,
+                                    verbose_name=_("open points"))
+    optimal_points = models.FloatField(default=0.0, null=False, blank=False,
+                                       verbose_name=_("optimal points"))
+
+    class Meta:
+        verbose_name = "milestone burndown day"
+        verbose_name_plural = "milestone burndown days"
+        ordering = ["milestone", "day"]
+        unique_together = ("milestone", "day")
+
+    def __str__(self):
+        return "{}: {}".format(self.milestone_id, self.day)
+
+
+@receiver(models.signals.post_save, sender=Milestone,
+          dispatch_uid="milestone_invalidate_project_stats")
+@receiver(models.signals.post_delete, sender=Milestone,
+          dispatch_uid="milestone_invalidate_project_stats_on_delete")
+def milestone_invalidate_project_stats(sender, instance, **kwargs):
+    stats_services.invalidate_project_stats(instance.project_id)
+
+
+@receiver(models.signals.post_save, sender=Milestone,
+          dispatch_uid="milestone_invalidate_burndown")
+def milestone_invalidate_burndown(sender, instance, created, **kwargs):
+    if not created:
+        services.invalidate_burndown(instance.id)
+
+
+track_fields(UserStory, "milestone")
+
+
+@receiver(models.signals.pre_save, sender=UserStory,
+          dispatch_uid="user_story_remember_milestone")
+def us_remember_milestone(sender, instance, **kwargs):
+    # Moving a user story changes the burndown of both milestones
+    prev_values = get_original_values(instance, "milestone")
+    instance._prev_milestone_id = prev_values["milestone"] if prev_values else None
+
+
+@receiver(models.signals.post_save, sender=UserStory,
+          dispatch_uid="user_story_invalidate_milestone_burndown")
+@receiver(models.signals.post_delete, sender=UserStory,
+          dispatch_uid="user_story_invalidate_milestone_burndown_on_delete")
+def us_invalidate_milestone_burndown(sender, instance, **kwargs):
+    prev_milestone_id = getattr(instance, "_prev_milestone_id", None)
+    if prev_milestone_id != instance.milestone_id:
+        services.invalidate_burndown(prev_milestone_id)
+    services.invalidate_burndown(instance.milestone_id)
+
+
+@receiver(models.signals.post_save, sender=RolePoints,
+          dispatch_uid="role_points_invalidate_milestone_burndown")
+@receiver(models.signals.post_delete, sender=RolePoints,
+          dispatch_uid="role_points_invalidate_milestone_burndown_on_delete")
+def role_points_invalidate_milestone_burndown(sender, instance, **kwargs):
+    try:
+        milestone_id = instance.user_story.milestone_id
+    except UserStory.DoesNotExist:
+        return
+    services.invalidate_burndown(milestone_id)
+
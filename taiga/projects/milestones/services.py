@@ -0,0 +1,160 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from contextlib import closing
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction as tx
+from django.db import IntegrityError
+from django.db.models.loading import get_model
+
+
+# Closed points accumulated at the end of each day of the sprint. User
+# stories closed before the sprint start are counted on its first day.
+_CLOSED_POINTS_PER_DAY_SQL = """
+WITH closed_per_day AS (
+    SELECT GREATEST((us.finish_date AT TIME ZONE %(tz)s)::date, %(start)s::date) AS day,
+           SUM(points.value) AS points
+      FROM userstories_userstory AS us
+      JOIN userstories_rolepoints AS rp ON rp.user_story_id = us.id
+      JOIN projects_points AS points ON points.id = rp.points_id
+     WHERE us.milestone_id = %(milestone_id)s
+       AND us.is_closed
+       AND us.finish_date < (%(finish)s::date + 1)::timestamp AT TIME ZONE %(tz)s
+     GROUP BY 1
+)
+SELECT days.day::date,
+       COALESCE(SUM(closed_per_day.points) OVER (ORDER BY days.day), 0)
+  FROM generate_series(%(start)s::date, %(finish)s::date, '1 day') AS days(day)
+  LEFT JOIN closed_per_day ON closed_per_day.day = days.day::date
+ ORDER BY days.day
+"""
+
+
+def get_closed_points_per_day(milestone):
+    """
+    Get a list of (day, closed points) tuples with the cumulative closed
+    points of the milestone for every day between its estimated start and
+    its estimated finish, computed with a single query.
+    """
+    if not (milestone.estimated_start and milestone.estimated_finish):
+        return []
+
+    params = {
+        "milestone_id": milestone.id,
+        "start": milestone.estimated_start,
+        "finish": milestone.estimated_finish,
+        "tz": settings.TIME_ZONE,
+    }
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(_CLOSED_POINTS_PER_DAY_SQL, params)
+        return cursor.fetchall()
+
+
+def calculate_burndown_days(milestone, total_points):
+    """
+    Calculate the burndown of the milestone, the open and optimal points
+    for each one of its days.
+    """
+    milestone_days = (milestone.estimated_finish - milestone.estimated_start).days
+    optimal_points = total_points
+    optimal_points_per_day = total_points / milestone_days if milestone_days else 0
+
+    days = []
+    for day, closed_points in get_closed_points_per_day(milestone):
+        days.append({
+            "day": day,
+            "name": day.day,
+            "open_points": total_points - closed_points,
+            "optimal_points": optimal_points,
+        })
+        optimal_points -= optimal_points_per_day
+
+    return days
+
+
+def get_burndown_days(milestone, total_points):
+    """
+    Get the burndown of the milestone. The burndown of closed milestones
+    is stored the first time it is requested and served from there until
+    the milestone or its user stories change.
+    """
+    if not milestone.closed:
+        return calculate_burndown_days(milestone, total_points)
+
+    snapshot = milestone.burndown_days.all()
+    if snapshot:
+        return [{"day": item.day,
+                 "name": item.day.day,
+                 "open_points": item.open_points,
+                 "optimal_points": item.optimal_points} for item in snapshot]
+
+    days = calculate_burndown_days(milestone, total_points)
+
+    burndown_day_model = get_model("milestones", "MilestoneBurndownDay")
+    try:
+        with tx.atomic():
+            burndown_day_model.objects.bulk_create([
+                burndown_day_model(milestone=milestone, day=item["day"],
+                                   open_points=item["open_points"],
+                                   optimal_points=item["optimal_points"]) for item in days])
+    except IntegrityError:
+        # Other request has stored it meanwhile
+        pass
+
+    return days
+
+
+def invalidate_burndown(milestone_id):
+    """
+    Remove the stored burndown of a milestone.
+    """
+    if milestone_id is None:
+        return
+
+    burndown_day_model = get_model("milestones", "MilestoneBurndownDay")
+    burndown_day_model.objects.filter(milestone_id=milestone_id).delete()
+
+
+def invalidate_project_burndowns(project_id):
+    """
+    Remove the stored burndown of all the milestones of a project.
+    """
+    burndown_day_model = get_model("milestones", "MilestoneBurndownDay")
+    burndown_day_model.objects.filter(milestone__project_id=project_id).delete()
+
+
+def get_stats_for_milestone(milestone):
+    total_points = milestone.total_points
+    user_stories = milestone.user_stories.all()
+    tasks = milestone.tasks.all()
+
+    return {
+        "name": milestone.name,
+        "estimated_start": milestone.estimated_start,
+        "estimated_finish": milestone.estimated_finish,
+        "total_points": total_points,
+        "completed_points": milestone.closed_points.values(),
+        "total_userstories": user_stories.count(),
+        "completed_userstories": user_stories.filter(is_closed=True).count(),
+        "total_tasks": tasks.count(),
+        "completed_tasks": tasks.filter(status__is_closed=True).count(),
+        "iocaine_doses": tasks.filter(is_iocaine=True).count(),
+        "days": get_burndown_days(milestone, sum(total_points.values())),
+    }
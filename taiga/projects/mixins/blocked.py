@@ -29,6 +29,8 @@ class BlockedMixin(models.Model):
                                      verbose_name=_("is blocked"))
     blocked_note = models.TextField(default="", null=False, blank=True,
                                    verbose_name=_("blocked note"))
+    blocked_note_html = models.TextField(null=True, blank=True, editable=False,
+                                         verbose_name=_("blocked note html"))
     class Meta:
         abstract = True
 
@@ -37,3 +39,4 @@ class BlockedMixin(models.Model):
 def blocked_pre_save(sender, instance, **kwargs):
     if  isinstance(instance, BlockedMixin) and not instance.is_blocked:
         instance.blocked_note = ""
+        instance.blocked_note_html = ""
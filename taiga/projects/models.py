@@ -14,7 +14,6 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import itertools
 
 from django.core.exceptions import ValidationError
 from django.db import models
@@ -32,10 +31,15 @@ from django_pgjson.fields import JsonField
 
 from taiga.base.tags import TaggedMixin
 from taiga.users.models import Role
+from taiga.base.utils.original_values import track_fields, has_changed
 from taiga.base.utils.slug import slugify_uniquely
 from taiga.base.utils.dicts import dict_sum
+from taiga.searches import services as searches_services
 
 from . import choices
+from .services import points as points_services
+from .services import stats as stats_services
+from .milestones import services as milestones_services
 
 # FIXME: this should to be on choices module (?)
 VIDEOCONFERENCES_CHOICES = (
@@ -145,6 +149,9 @@ class Project(ProjectDefaults, TaggedMixin, models.Model):
                                         verbose_name=_("videoconference system"))
     videoconferences_salt = models.CharField(max_length=250, null=True, blank=True,
                                              verbose_name=_("videoconference room salt"))
+    search_language = models.CharField(max_length=50, null=True, blank=True, default=None,
+                                       choices=choices.SEARCH_LANGUAGES_CHOICES,
+                                       verbose_name=_("search language"))
 
     creation_template = models.ForeignKey("projects.ProjectTemplate",
                                           related_name="projects", null=True,
@@ -211,31 +218,19 @@ class Project(ProjectDefaults, TaggedMixin, models.Model):
         rp_query = rp_query.exclude(role__id__in=roles.values_list("id", flat=True))
         rp_query.delete()
 
-    def _get_user_stories_points(self, user_stories):
-        role_points = [us.role_points.all() for us in user_stories]
-        flat_role_points = itertools.chain(*role_points)
-        flat_role_dicts = map(lambda x: {x.role_id: x.points.value if x.points.value else 0}, flat_role_points)
-        return dict_sum(*flat_role_dicts)
-
     def _get_points_increment(self, client_requirement, team_requirement):
-        userstory_model = get_model("userstories", "UserStory")
-        user_stories = userstory_model.objects.none()
+        filters = {
+            "project_id": self.id,
+            "client_requirement": client_requirement,
+            "team_requirement": team_requirement,
+        }
+
         last_milestones = self.milestones.order_by('-estimated_finish')
         last_milestone = last_milestones[0] if last_milestones else None
         if last_milestone:
-            user_stories = userstory_model.objects.filter(
-                created_date__gte=last_milestone.estimated_finish,
-                project_id=self.id,
-                client_requirement=client_requirement,
-                team_requirement=team_requirement
-            )
-        else:
-            user_stories = userstory_model.objects.filter(
-                project_id=self.id,
-                client_requirement=client_requirement,
-                team_requirement=team_requirement
-            )
-        return self._get_user_stories_points(user_stories)
+            filters["created_date__gte"] = last_milestone.estimated_finish
+
+        return points_services.get_points_per_role(**filters)
 
     @property
     def future_team_increment(self):
@@ -255,15 +250,40 @@ class Project(ProjectDefaults, TaggedMixin, models.Model):
 
     @property
     def closed_points(self):
-        return dict_sum(*[ml.closed_points for ml in self.milestones.all()])
+        return points_services.get_points_per_role(milestone__project_id=self.id, is_closed=True)
 
     @property
     def defined_points(self):
-        return self._get_user_stories_points(self.user_stories.all())
+        return points_services.get_points_per_role(project_id=self.id)
 
     @property
     def assigned_points(self):
-        return self._get_user_stories_points(self.user_stories.filter(milestone__isnull=False))
+        return points_services.get_points_per_role(project_id=self.id, milestone__isnull=False)
+
+
+class ProjectTag(models.Model):
+    """
+    Tags used in a project with the number of user stories, tasks and
+    issues tagged with them. Maintained on save/delete of those objects.
+    """
+    project = models.ForeignKey("Project", null=False, blank=False,
+                                related_name="tags_counters", verbose_name=_("project"))
+    tag = models.TextField(null=False, blank=False, verbose_name=_("tag"))
+    user_stories_count = models.PositiveIntegerField(default=0, null=False, blank=False,
+                                                     verbose_name=_("user stories count"))
+    tasks_count = models.PositiveIntegerField(default=0, null=False, blank=False,
+                                              verbose_name=_("tasks count"))
+    issues_count = models.PositiveIntegerField(default=0, null=False, blank=False,
+                                               verbose_name=_("issues count"))
+
+    class Meta:
+        verbose_name = "project tag"
+        verbose_name_plural = "project tags"
+        ordering = ["project", "tag"]
+        unique_together = ("project", "tag")
+
+    def __str__(self):
+        return self.tag
 
 
 # User Stories common Models
@@ -468,6 +488,9 @@ class ProjectTemplate(models.Model):
                                         verbose_name=_("videoconference system"))
     videoconferences_salt = models.CharField(max_length=250, null=True, blank=True,
                                              verbose_name=_("videoconference room salt"))
+    search_language = models.CharField(max_length=50, null=True, blank=True, default=None,
+                                       choices=choices.SEARCH_LANGUAGES_CHOICES,
+                                       verbose_name=_("search language"))
 
     default_options = JsonField(null=True, blank=True, verbose_name=_("default options"))
     us_statuses = JsonField(null=True, blank=True, verbose_name=_("us statuses"))
@@ -737,3 +760,46 @@ def project_post_save(sender, instance, created, **kwargs):
     template.apply_to_project(instance)
 
     instance.save()
+
+
+@receiver(signals.post_save, sender=Points, dispatch_uid='points_invalidate_milestone_burndowns')
+def points_invalidate_milestone_burndowns(sender, instance, created, **kwargs):
+    if not created:
+        milestones_services.invalidate_project_burndowns(instance.project_id)
+
+
+@receiver(signals.post_save, sender=Points, dispatch_uid='points_invalidate_stats')
+@receiver(signals.post_delete, sender=Points, dispatch_uid='points_invalidate_stats_on_delete')
+@receiver(signals.post_save, sender=UserStoryStatus, dispatch_uid='us_status_invalidate_stats')
+@receiver(signals.post_delete, sender=UserStoryStatus, dispatch_uid='us_status_invalidate_stats_on_delete')
+def project_attribute_invalidate_stats(sender, instance, created=False, **kwargs):
+    # Points values and closed statuses are used by the points stats
+    if not created:
+        stats_services.invalidate_project_stats(instance.project_id)
+
+
+track_fields(Project, "search_language")
+
+
+@receiver(signals.pre_save, sender=Project, dispatch_uid='project_search_language_pre_save')
+def project_search_language_pre_save(sender, instance, **kwargs):
+    instance._search_language_changed = False
+    if instance.pk:
+        instance._search_language_changed = has_changed(instance, "search_language")
+
+
+@receiver(signals.post_save, sender=Project, dispatch_uid='project_search_language_post_save')
+def project_search_language_post_save(sender, instance, created, **kwargs):
+    if getattr(instance, "_search_language_changed", False):
+        instance._search_language_changed = False
+        searches_services.update_project_search_entries(instance.id)
+
+
+@receiver(signals.post_save, sender=Project, dispatch_uid='project_invalidate_stats')
+def project_invalidate_stats(sender, instance, created, **kwargs):
+    if not created:
+        stats_services.invalidate_project_stats(instance.id)
+
+
+# Register projects deferred tasks
+from . import deferred
@@ -52,17 +52,7 @@ class WatchedResourceMixin(object):
             return
 
         obj = self.get_object_for_snapshot(obj)
-
-        # Process that analizes the corresponding diff and
-        # some text fields for extract mentions and add them
-        # to watchers before obtain a complete list of
-        # notifiable users.
-        services.analize_object_for_watchers(obj, history)
-
-        # Get a complete list of notifiable users for current
-        # object and send the change notification to them.
-        users = services.get_users_to_notify(obj, history=history)
-        services.send_notifications(obj, history=history, users=users)
+        services.send_history_notifications(obj, history)
 
     def post_save(self, obj, created=False):
         self.send_notifications(obj)
@@ -164,6 +164,24 @@ def _make_template_mail(name:str):
     return cls()
 
 
+def send_history_notifications(obj, history):
+    """
+    Given changed instance and its history entry, add
+    mentioned users to watchers and send the change
+    notification to all notifiable users.
+    """
+    # Process that analizes the corresponding diff and
+    # some text fields for extract mentions and add them
+    # to watchers before obtain a complete list of
+    # notifiable users.
+    analize_object_for_watchers(obj, history)
+
+    # Get a complete list of notifiable users for current
+    # object and send the change notification to them.
+    users = get_users_to_notify(obj, history=history)
+    send_notifications(obj, history=history, users=users)
+
+
 def send_notifications(obj, *, history, users):
     """
     Given changed instance, history entry and
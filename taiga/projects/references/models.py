@@ -23,7 +23,9 @@ from taiga.projects.tasks.models import Task
 from taiga.projects.issues.models import Issue
 from taiga.projects.models import Project
 
-from . import sequences as seq
+from .services import make_sequence_name
+from .services import make_unique_reference_id
+from . import services
 
 
 class Reference(models.Model):
@@ -43,17 +45,6 @@ class Reference(models.Model):
         return "Reference {}".format(self.object_id)
 
 
-def make_sequence_name(project) -> str:
-    return "references_project{0}".format(project.pk)
-
-
-def make_unique_reference_id(project, *, create=False):
-    seqname = make_sequence_name(project)
-    if create and not seq.exists(seqname):
-        seq.create(seqname)
-    return seq.next_value(seqname)
-
-
 def make_reference(instance, project, create=False):
     refval = make_unique_reference_id(project, create=create)
     ct = ContentType.objects.get_for_model(instance.__class__)
@@ -68,33 +59,45 @@ def create_sequence(sender, instance, created, **kwargs):
     if not created:
         return
 
-    seqname = make_sequence_name(instance)
-    if not seq.exists(seqname):
-        seq.create(seqname)
+    services.create_sequence(make_sequence_name(instance))
 
 
 def delete_sequence(sender, instance, **kwargs):
-    seqname = make_sequence_name(instance)
-    if seq.exists(seqname):
-        seq.delete(seqname)
+    services.delete_sequence(make_sequence_name(instance))
+
 
+def attach_sequence(sender, instance, **kwargs):
+    # The ref of new objects is stored by their INSERT
+    if instance.pk is None:
+        instance.ref = make_unique_reference_id(instance.project)
 
-def attach_sequence(sender, instance, created, **kwargs):
-    if created:
-        # Create a reference object. This operation should be
-        # used in transaction context, otherwise it can
-        # create a lot of phantom reference objects.
-        refval, _ = make_reference(instance, instance.project)
 
-        # Additionally, attach sequence number to instance as ref
-        instance.ref = refval
-        instance.save(update_fields=['ref'])
+def create_reference(sender, instance, created, **kwargs):
+    if not created:
+        return
+
+    # Objects inserted with an explicit pk have no ref yet
+    if instance.ref is None:
+        instance.ref = make_unique_reference_id(instance.project)
+        instance.save(update_fields=["ref"])
+
+    # Create a reference object. This operation should be
+    # used in transaction context, otherwise it can
+    # create a lot of phantom reference objects.
+    ct = ContentType.objects.get_for_model(instance.__class__)
+    Reference.objects.create(content_type=ct,
+                             object_id=instance.pk,
+                             ref=instance.ref,
+                             project=instance.project)
 
 
 models.signals.post_save.connect(create_sequence, sender=Project, dispatch_uid="refproj")
-models.signals.post_save.connect(attach_sequence, sender=UserStory, dispatch_uid="refus")
-models.signals.post_save.connect(attach_sequence, sender=Issue, dispatch_uid="refissue")
-models.signals.post_save.connect(attach_sequence, sender=Task, dispatch_uid="reftask")
+models.signals.pre_save.connect(attach_sequence, sender=UserStory, dispatch_uid="refus")
+models.signals.pre_save.connect(attach_sequence, sender=Issue, dispatch_uid="refissue")
+models.signals.pre_save.connect(attach_sequence, sender=Task, dispatch_uid="reftask")
+models.signals.post_save.connect(create_reference, sender=UserStory, dispatch_uid="refus_reference")
+models.signals.post_save.connect(create_reference, sender=Issue, dispatch_uid="refissue_reference")
+models.signals.post_save.connect(create_reference, sender=Task, dispatch_uid="reftask_reference")
 models.signals.post_delete.connect(delete_sequence, sender=Project, dispatch_uid="refprojdel")
 
 
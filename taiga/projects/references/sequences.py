@@ -58,3 +58,8 @@ def next_value(seqname):
         return result[0]
 
 
+def next_values(seqname:str, count:int) -> list:
+    sql = "SELECT nextval(%s) FROM generate_series(1, %s);"
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, [seqname, count])
+        return [row[0] for row in cursor.fetchall()]
@@ -14,8 +14,96 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from django.contrib.contenttypes.models import ContentType
 from django.db.models.loading import get_model
 
+from . import sequences as seq
+
+
+# Names of the sequences known to exist, so this process
+# doesn't look for them in the database again.
+_existing_sequences = set()
+
+
+def make_sequence_name(project) -> str:
+    return "references_project{0}".format(project.pk)
+
+
+def create_sequence(seqname:str) -> None:
+    """
+    Create a references sequence if it doesn't exist.
+    """
+    if seqname in _existing_sequences:
+        return
+
+    if not seq.exists(seqname):
+        seq.create(seqname)
+    _existing_sequences.add(seqname)
+
+
+def delete_sequence(seqname:str) -> None:
+    """
+    Delete a references sequence if it exists.
+    """
+    _existing_sequences.discard(seqname)
+    if seq.exists(seqname):
+        seq.delete(seqname)
+
+
+def make_unique_reference_id(project, *, create=False) -> int:
+    """
+    Get the next reference number of a project.
+    """
+    seqname = make_sequence_name(project)
+    if create:
+        create_sequence(seqname)
+    return seq.next_value(seqname)
+
+
+def make_unique_reference_ids(project, count:int, *, create=False) -> list:
+    """
+    Reserve a block of `count` reference numbers of a project
+    in one call.
+    """
+    seqname = make_sequence_name(project)
+    if create:
+        create_sequence(seqname)
+    return seq.next_values(seqname, count)
+
+
+def bulk_create_with_references(model_cls, project, objs:list) -> list:
+    """
+    Insert new objects of a project with a single query, attaching
+    them a reference number and creating their Reference objects as
+    the `attach_sequence` (pre_save) and `create_reference` (post_save)
+    signal handlers do for each saved object.
+
+    Signals are not sent, so the callers should do the other work
+    of the post_save handlers.
+    """
+    if not objs:
+        return objs
+
+    refs = make_unique_reference_ids(project, len(objs))
+    for obj, ref in zip(objs, refs):
+        obj.ref = ref
+
+    model_cls.objects.bulk_create(objs)
+
+    # bulk_create doesn't set the primary keys of the new objects
+    ids = dict(model_cls.objects.filter(project=project, ref__in=refs).values_list("ref", "id"))
+    for obj in objs:
+        obj.pk = ids[obj.ref]
+
+    reference_model = get_model("references", "Reference")
+    content_type = ContentType.objects.get_for_model(model_cls)
+    reference_model.objects.bulk_create([reference_model(content_type=content_type,
+                                                         object_id=obj.pk,
+                                                         ref=obj.ref,
+                                                         project=project)
+                                         for obj in objs])
+    return objs
+
 
 def get_instance_by_ref(project_id, obj_ref):
     model_cls = get_model("references", "Reference")
@@ -25,3 +113,15 @@ def get_instance_by_ref(project_id, obj_ref):
         instance = None
 
     return instance
+
+
+def get_instances_by_refs(project_id, obj_refs):
+    """
+    Get the references of a project with the given ref numbers,
+    with their content objects prefetched, as a {ref: reference}
+    dict. Missing refs are not included.
+    """
+    model_cls = get_model("references", "Reference")
+    qs = model_cls.objects.filter(project_id=project_id, ref__in=set(obj_refs))
+    qs = qs.select_related("content_type").prefetch_related("content_object")
+    return {instance.ref: instance for instance in qs}
@@ -17,6 +17,7 @@
 # This makes all code that import services works and
 # is not the baddest practice ;)
 
+from .bulk_update_order import bulk_update_order
 from .bulk_update_order import bulk_update_severity_order
 from .bulk_update_order import bulk_update_priority_order
 from .bulk_update_order import bulk_update_issue_type_order
@@ -28,5 +29,14 @@ from .bulk_update_order import bulk_update_userstory_status_order
 from .filters import get_all_tags
 from .filters import get_issues_filters_data
 
+from .points import get_points_per_role
+from .points import get_total_points
+
 from .stats import get_stats_for_project_issues
 from .stats import get_stats_for_project
+from .stats import get_cached_stats_for_project
+from .stats import invalidate_project_stats
+from .stats import update_project_stats
+
+from .tags import get_project_tags
+from .tags import update_project_tags
@@ -14,123 +14,85 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from contextlib import closing
+
 from django.db import transaction
 from django.db import connection
+from django.db.models.loading import get_model
+from django.utils.translation import ugettext_lazy as _
 
+from taiga.base import exceptions as exc
 
-@transaction.atomic
-def bulk_update_userstory_status_order(project, user, data):
-    cursor = connection.cursor()
 
-    sql = """
-    prepare bulk_update_order as update projects_userstorystatus set "order" = $1
-        where projects_userstorystatus.id = $2 and
-              projects_userstorystatus.project_id = $3;
-    """
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.close()
+def _clean_bulk_order_data(data):
+    try:
+        items = [(int(id), int(order)) for id, order in data]
+    except (TypeError, ValueError):
+        raise exc.WrongArguments(_("Invalid order data, it should be a list of [id, order] pairs."))
 
+    # If an id is repeated its last order wins
+    return list(dict(items).items())
 
-@transaction.atomic
-def bulk_update_points_order(project, user, data):
-    cursor = connection.cursor()
 
-    sql = """
-    prepare bulk_update_order as update projects_points set "order" = $1
-        where projects_points.id = $2 and
-              projects_points.project_id = $3;
+@transaction.atomic
+def bulk_update_order(model, project, data, field="order"):
     """
+    Update the order of several objects of a project with a single
+    UPDATE ... FROM (VALUES ...) statement.
 
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.close()
-
+    :param model: Model of the objects, it must have `project` and `field` fields.
+    :param project: Project of the objects.
+    :param data: List of (id, order) pairs.
+    :param field: Name of the order field.
 
-@transaction.atomic
-def bulk_update_task_status_order(project, user, data):
-    cursor = connection.cursor()
+    :raises: `WrongArguments` if the data is malformed or some object doesn't belong to the project.
+    """
+    items = _clean_bulk_order_data(data)
+    if not items:
+        return
 
     sql = """
-    prepare bulk_update_order as update projects_taskstatus set "order" = $1
-        where projects_taskstatus.id = $2 and
-              projects_taskstatus.project_id = $3;
-    """
+    UPDATE {table} SET {column} = new_order.value
+      FROM (VALUES {values}) AS new_order (id, value)
+     WHERE {table}.id = new_order.id AND
+           {table}.project_id = %s;
+    """.format(table=model._meta.db_table,
+               column=connection.ops.quote_name(model._meta.get_field(field).column),
+               values=", ".join(["(%s, %s)"] * len(items)))
 
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.close()
+    params = [value for item in items for value in item] + [project.id]
 
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, params)
+        updated = cursor.rowcount
 
-@transaction.atomic
-def bulk_update_issue_status_order(project, user, data):
-    cursor = connection.cursor()
+    if updated != len(items):
+        raise exc.WrongArguments(_("Some objects don't belong to the project."))
 
-    sql = """
-    prepare bulk_update_order as update projects_issuestatus set "order" = $1
-        where projects_issuestatus.id = $2 and
-              projects_issuestatus.project_id = $3;
-    """
 
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.close()
+def bulk_update_userstory_status_order(project, user, data):
+    bulk_update_order(get_model("projects", "UserStoryStatus"), project, data)
 
 
-@transaction.atomic
-def bulk_update_issue_type_order(project, user, data):
-    cursor = connection.cursor()
+def bulk_update_points_order(project, user, data):
+    bulk_update_order(get_model("projects", "Points"), project, data)
 
-    sql = """
-    prepare bulk_update_order as update projects_issuetype set "order" = $1
-        where projects_issuetype.id = $2 and
-              projects_issuetype.project_id = $3;
-    """
 
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.close()
+def bulk_update_task_status_order(project, user, data):
+    bulk_update_order(get_model("projects", "TaskStatus"), project, data)
 
 
-@transaction.atomic
-def bulk_update_priority_order(project, user, data):
-    cursor = connection.cursor()
+def bulk_update_issue_status_order(project, user, data):
+    bulk_update_order(get_model("projects", "IssueStatus"), project, data)
 
-    sql = """
-    prepare bulk_update_order as update projects_priority set "order" = $1
-        where projects_priority.id = $2 and
-              projects_priority.project_id = $3;
-    """
 
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.close()
+def bulk_update_issue_type_order(project, user, data):
+    bulk_update_order(get_model("projects", "IssueType"), project, data)
 
 
-@transaction.atomic
-def bulk_update_severity_order(project, user, data):
-    cursor = connection.cursor()
+def bulk_update_priority_order(project, user, data):
+    bulk_update_order(get_model("projects", "Priority"), project, data)
 
-    sql = """
-    prepare bulk_update_order as update projects_severity set "order" = $1
-        where projects_severity.id = $2 and
-              projects_severity.project_id = $3;
-    """
 
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.close()
+def bulk_update_severity_order(project, user, data):
+    bulk_update_order(get_model("projects", "Severity"), project, data)
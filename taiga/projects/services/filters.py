@@ -17,126 +17,132 @@
 from contextlib import closing
 from django.db import connection
 
-
-def _get_stories_tags(project):
-    result = set()
-    for tags in project.user_stories.values_list("tags", flat=True):
-        result.update(tags)
-    return result
-
-
-def _get_issues_tags(project):
-    result = set()
-    for tags in project.issues.values_list("tags", flat=True):
-        result.update(tags)
-    return result
-
-
-def _get_issues_tags_with_count(project):
-    extra_sql = ("select unnest(tags) as tagname, count(unnest(tags)) "
-                 "from issues_issue where project_id = %s "
-                 "group by unnest(tags) "
-                 "order by tagname asc")
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id])
-        rows = cursor.fetchall()
-
-    return rows
-
-
-def _get_issues_statuses(project):
-    extra_sql = ("select status_id, count(status_id) from issues_issue "
-                 "where project_id = %s group by status_id;")
-
-    extra_sql = """
-    select id, (select count(*) from issues_issue
-                    where project_id = m.project_id and status_id = m.id)
-        from projects_issuestatus as m
-        where project_id = %s order by m.order;
-    """
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id])
-        rows = cursor.fetchall()
-
-    return rows
-
-
-def _get_issues_priorities(project):
-    extra_sql = """
-    select id, (select count(*) from issues_issue
-                where project_id = m.project_id and priority_id = m.id)
-        from projects_priority as m
-        where project_id = %s order by m.order;
+from . import tags as tags_services
+
+
+# Issue filters facets: (name, filter name, issue column)
+ISSUES_FACETS = (
+    ("types", "type", "type_id"),
+    ("statuses", "status", "status_id"),
+    ("priorities", "priority", "priority_id"),
+    ("severities", "severity", "severity_id"),
+    ("assigned_to", "assigned_to", "assigned_to_id"),
+    ("owners", "owner", "owner_id"),
+)
+
+# The counters of all the facets are calculated in one scan over the
+# issues of the project, every issue yields one row for each facet it is
+# counted in. The facets values without issues are completed from the
+# project catalogs.
+_ISSUES_FILTERS_SQL = """
+WITH counters AS (
+    SELECT facet.name, facet.value, count(*) AS total
+      FROM issues_issue AS issue
+     CROSS JOIN LATERAL (
+            {facets_sql}
+         ) AS facet(name, value)
+     WHERE issue.project_id = %(project_id)s
+     GROUP BY facet.name, facet.value
+), catalog AS (
+    SELECT 'types'::text AS name, id::text AS value, "order" AS position
+      FROM projects_issuetype WHERE project_id = %(project_id)s
+    UNION ALL
+    SELECT 'statuses', id::text, "order"
+      FROM projects_issuestatus WHERE project_id = %(project_id)s
+    UNION ALL
+    SELECT 'priorities', id::text, "order"
+      FROM projects_priority WHERE project_id = %(project_id)s
+    UNION ALL
+    SELECT 'severities', id::text, "order"
+      FROM projects_severity WHERE project_id = %(project_id)s
+    UNION ALL
+    SELECT 'assigned_to', NULL, 0
+    UNION ALL
+    SELECT 'assigned_to', user_id::text, 1
+      FROM projects_membership WHERE project_id = %(project_id)s AND user_id IS NOT NULL
+    UNION ALL
+    SELECT 'owners', user_id::text, 1
+      FROM projects_membership WHERE project_id = %(project_id)s AND user_id IS NOT NULL
+)
+SELECT catalog.name, catalog.value, catalog.position, COALESCE(counters.total, 0)
+  FROM catalog
+  LEFT JOIN counters ON counters.name = catalog.name
+                    AND counters.value IS NOT DISTINCT FROM catalog.value
+UNION ALL
+SELECT name, value, 0, total
+  FROM counters WHERE name = 'tags'
+ORDER BY 1, 3, 2
+"""
+
+
+# Tags filters conditions
+_ISSUES_TAGS_CONDITIONS = {
+    "tags": "issue.tags @> %(filter_tags)s::text[]",
+    "tags__all": "issue.tags @> %(filter_tags__all)s::text[]",
+    "tags__any": "issue.tags && %(filter_tags__any)s::text[]",
+    "tags__none": "NOT coalesce(issue.tags && %(filter_tags__none)s::text[], false)",
+}
+
+
+def _clean_issues_filters(filters):
     """
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id])
-        rows = cursor.fetchall()
-
-    return rows
-
-def _get_issues_types(project):
-    extra_sql = """
-    select id, (select count(*) from issues_issue
-                where project_id = m.project_id and type_id = m.id)
-        from projects_issuetype as m
-        where project_id = %s order by m.order;
+    Drop the boolean values (true/false special values of the query
+    params) of the facets filters, they can't match foreign keys.
+    Filters without other values are ignored.
     """
+    cleaned = {}
+    for filter_name, values in filters.items():
+        if filter_name not in _ISSUES_TAGS_CONDITIONS:
+            values = [value for value in values if not isinstance(value, bool)]
+        if values:
+            cleaned[filter_name] = values
+    return cleaned
 
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id])
-        rows = cursor.fetchall()
-
-    return rows
 
+def _get_issues_filter_condition(filter_name, column, values):
+    if filter_name in _ISSUES_TAGS_CONDITIONS:
+        return _ISSUES_TAGS_CONDITIONS[filter_name]
 
-def _get_issues_severities(project):
-    extra_sql = """
-    select id, (select count(*) from issues_issue
-                where project_id = m.project_id and severity_id = m.id)
-        from projects_severity as m
-        where project_id = %s order by m.order;
-    """
+    conditions = []
+    if any(value is not None for value in values):
+        conditions.append("issue.{} = ANY(%(filter_{})s)".format(column, filter_name))
+    if None in values:
+        conditions.append("issue.{} IS NULL".format(column))
+    return "({})".format(" OR ".join(conditions))
 
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id])
-        rows = cursor.fetchall()
 
-    return rows
+def _get_issues_filters_where(filters, exclude=None):
+    columns = {filter_name: column for name, filter_name, column in ISSUES_FACETS}
+    columns.update({filter_name: "tags" for filter_name in _ISSUES_TAGS_CONDITIONS})
 
+    conditions = [_get_issues_filter_condition(filter_name, columns[filter_name], values)
+                  for filter_name, values in sorted(filters.items())
+                  if filter_name != exclude and filter_name in columns]
+    return " AND ".join(conditions) or "TRUE"
 
-def _get_issues_assigned_to(project):
-    extra_sql = """
-    select null, (select count(*) from issues_issue
-                        where project_id = %s and assigned_to_id is null)
-    UNION select user_id, (select count(*) from issues_issue
-                        where project_id = pm.project_id and assigned_to_id = pm.user_id)
-        from projects_membership as pm
-        where project_id = %s and pm.user_id is not null;
-    """
 
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id, project.id])
-        rows = cursor.fetchall()
+def _get_issues_filters_counters(project, filters):
+    facets_sql = "\n            UNION ALL\n            ".join(
+        "SELECT '{name}', issue.{column}::text WHERE {where}".format(
+            name=name, column=column, where=_get_issues_filters_where(filters, exclude=filter_name))
+        for name, filter_name, column in ISSUES_FACETS)
 
-    return rows
+    # Without active filters the tags counters are read from the project
+    # tags. The tags filters are applied to the tags counters too.
+    if filters:
+        facets_sql += ("\n            UNION ALL\n            "
+                       "SELECT 'tags', tag FROM unnest(issue.tags) AS tag WHERE {}").format(
+                           _get_issues_filters_where(filters))
 
+    sql = _ISSUES_FILTERS_SQL.format(facets_sql=facets_sql)
 
-def _get_issues_owners(project):
-    extra_sql = """
-    select user_id, (select count(*) from issues_issue
-                        where project_id = pm.project_id and owner_id = pm.user_id)
-        from projects_membership as pm
-        where project_id = %s and pm.user_id is not null;
-    """
+    params = {"project_id": project.id}
+    for filter_name, values in filters.items():
+        params["filter_{}".format(filter_name)] = [value for value in values if value is not None]
 
     with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id])
-        rows = cursor.fetchall()
-
-    return rows
+        cursor.execute(sql, params)
+        return cursor.fetchall()
 
 
 # Public api
@@ -146,26 +152,31 @@ def get_all_tags(project):
     Given a project, return sorted list of unique
     tags found on it.
     """
-    result = set()
-    result.update(_get_issues_tags(project))
-    result.update(_get_stories_tags(project))
-    return sorted(result)
+    counters = (tags_services.COUNTER_FIELDS["userstory"], tags_services.COUNTER_FIELDS["issue"])
+    return [tag for tag, count in tags_services.get_project_tags(project, *counters)]
 
 
-def get_issues_filters_data(project):
+def get_issues_filters_data(project, filters=None):
     """
     Given a project, return a simple data structure
     of all possible filters for issues.
+
+    The counters reflect the given active filters (a dict like
+    {"status": [1, 2], "assigned_to": [None], "tags__any": ["foo"]}): the
+    counters of each facet are calculated with the filters of the other
+    facets applied, as usual in faceted search.
     """
+    data = {name: [] for name, filter_name, column in ISSUES_FACETS}
+    data["tags"] = []
+
+    filters = _clean_issues_filters(filters or {})
+
+    for name, value, position, total in _get_issues_filters_counters(project, filters):
+        if name != "tags" and value is not None:
+            value = int(value)
+        data[name].append((value, total))
 
-    data = {
-        "types": _get_issues_types(project),
-        "statuses": _get_issues_statuses(project),
-        "priorities": _get_issues_priorities(project),
-        "severities": _get_issues_severities(project),
-        "assigned_to": _get_issues_assigned_to(project),
-        "owners": _get_issues_owners(project),
-        "tags": _get_issues_tags_with_count(project),
-    }
+    if not filters:
+        data["tags"] = tags_services.get_project_tags(project, tags_services.COUNTER_FIELDS["issue"])
 
     return data
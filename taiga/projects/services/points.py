@@ -0,0 +1,50 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import collections
+
+from django.db.models import Sum
+from django.db.models.loading import get_model
+
+
+def get_points_per_role(**user_story_filters):
+    """
+    Sum the points values of the user stories that match the given
+    filters, grouped by role: SUM(points.value) GROUP BY role_id.
+
+    As the old dict_sum based implementation, a Counter is returned
+    and roles without positive points are not included.
+    """
+    role_points_model = get_model("userstories", "RolePoints")
+
+    filters = {"user_story__{}".format(key): value for key, value in user_story_filters.items()}
+    qs = role_points_model.objects.filter(**filters)
+    qs = qs.values("role_id").annotate(total=Sum("points__value")).order_by()
+
+    return collections.Counter({row["role_id"]: row["total"] for row in qs
+                                if row["total"] is not None and row["total"] > 0})
+
+
+def get_total_points(**user_story_filters):
+    """
+    Sum the points values of the user stories that match the given filters.
+    """
+    role_points_model = get_model("userstories", "RolePoints")
+
+    filters = {"user_story__{}".format(key): value for key, value in user_story_filters.items()}
+    total = role_points_model.objects.filter(**filters).aggregate(total=Sum("points__value"))["total"]
+    return total or 0.0
@@ -14,9 +14,20 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from collections import defaultdict
+from contextlib import closing
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
 from django.db.models import Q, Count
+from django.db.models.loading import get_model
+
+from taiga.deferred import apply_async
+
 import datetime
 import copy
+import uuid
 
 
 def _get_milestones_stats_for_backlog(project):
@@ -31,16 +42,16 @@ def _get_milestones_stats_for_backlog(project):
     future_team_increment = sum(project.future_team_increment.values())
     future_client_increment = sum(project.future_client_increment.values())
 
-    milestones = project.milestones.order_by('estimated_start')
+    milestones = list(project.milestones.order_by('estimated_start'))
 
-    for current_milestone in range(0, max(milestones.count(), project.total_milestones)):
+    for current_milestone in range(0, max(len(milestones), project.total_milestones)):
         optimal_points = (project.total_story_points -
                             (optimal_points_per_sprint * current_milestone))
 
         evolution = (project.total_story_points - current_evolution
                         if current_evolution is not None else None)
 
-        if current_milestone < milestones.count():
+        if current_milestone < len(milestones):
             ml = milestones[current_milestone]
             milestone_name = ml.name
             team_increment = current_team_increment
@@ -75,49 +86,134 @@ def _get_milestones_stats_for_backlog(project):
     }
 
 
-def _count_status_object(status_obj, counting_storage):
-    if status_obj.id in counting_storage:
-        counting_storage[status_obj.id]['count'] += 1
-    else:
-        counting_storage[status_obj.id] = {}
-        counting_storage[status_obj.id]['count'] = 1
-        counting_storage[status_obj.id]['name'] = status_obj.name
-        counting_storage[status_obj.id]['id'] = status_obj.id
-        counting_storage[status_obj.id]['color'] = status_obj.color
-
-def _count_owned_object(user_obj, counting_storage):
-    if user_obj:
-        if user_obj.id in counting_storage:
-            counting_storage[user_obj.id]['count'] += 1
-        else:
-            counting_storage[user_obj.id] = {}
-            counting_storage[user_obj.id]['count'] = 1
-            counting_storage[user_obj.id]['username'] = user_obj.username
-            counting_storage[user_obj.id]['name'] = user_obj.get_full_name()
-            counting_storage[user_obj.id]['id'] = user_obj.id
-            counting_storage[user_obj.id]['color'] = user_obj.color
-    else:
-        if 0 in counting_storage:
-            counting_storage[0]['count'] += 1
+def _get_issues_per_status_object(issues, field_name):
+    id_field = "{}__id".format(field_name)
+    fields = (id_field, "{}__name".format(field_name), "{}__color".format(field_name))
+
+    counting_storage = {}
+    for row in issues.values(*fields).annotate(count=Count("id")).order_by(id_field):
+        counting_storage[row[id_field]] = {
+            'count': row['count'],
+            'name': row["{}__name".format(field_name)],
+            'id': row[id_field],
+            'color': row["{}__color".format(field_name)],
+        }
+    return counting_storage
+
+
+def _get_issues_per_owned_object(issues, field_name):
+    id_field = "{}__id".format(field_name)
+    fields = (id_field,) + tuple("{}__{}".format(field_name, name)
+                                 for name in ("username", "full_name", "email", "color"))
+
+    counting_storage = {}
+    for row in issues.values(*fields).annotate(count=Count("id")).order_by(id_field):
+        if row[id_field] is None:
+            counting_storage[0] = {
+                'count': row['count'],
+                'username': 'Unassigned',
+                'name': 'Unassigned',
+                'id': 0,
+                'color': 'black',
+            }
         else:
-            counting_storage[0] = {}
-            counting_storage[0]['count'] = 1
-            counting_storage[0]['username'] = 'Unassigned'
-            counting_storage[0]['name'] = 'Unassigned'
-            counting_storage[0]['id'] = 0
-            counting_storage[0]['color'] = 'black'
+            username = row["{}__username".format(field_name)]
+            # Same as User.get_full_name()
+            full_name = (row["{}__full_name".format(field_name)] or username or
+                         row["{}__email".format(field_name)])
+            counting_storage[row[id_field]] = {
+                'count': row['count'],
+                'username': username,
+                'name': full_name,
+                'id': row[id_field],
+                'color': row["{}__color".format(field_name)],
+            }
+    return counting_storage
+
+
+_ISSUES_DAYS_SERIES_SQL = """
+WITH days AS (
+    SELECT n, %(first_day)s::timestamp + n * interval '1 day' AS day
+      FROM generate_series(0, %(last_day_index)s) AS n
+), issues AS (
+    SELECT severity_id, priority_id,
+           created_date AT TIME ZONE 'UTC' AS created,
+           finished_date AT TIME ZONE 'UTC' AS finished
+      FROM issues_issue
+     WHERE project_id = %(project_id)s
+)
+    SELECT 'open', days.n, NULL::integer, count(*)
+      FROM days
+      JOIN issues ON issues.created >= days.day AND issues.created < days.day + interval '1 day'
+  GROUP BY days.n
+UNION ALL
+    SELECT 'closed', days.n, NULL::integer, count(*)
+      FROM days
+      JOIN issues ON issues.finished >= days.day AND issues.finished < days.day + interval '1 day'
+  GROUP BY days.n
+UNION ALL
+    SELECT 'severity', days.n, issues.severity_id, count(*)
+      FROM days
+      JOIN issues ON issues.created < days.day + interval '1 day'
+                 AND (issues.finished IS NULL OR issues.finished > days.day)
+  GROUP BY days.n, issues.severity_id
+UNION ALL
+    SELECT 'priority', days.n, issues.priority_id, count(*)
+      FROM days
+      JOIN issues ON issues.created < days.day + interval '1 day'
+                 AND (issues.finished IS NULL OR issues.finished > days.day)
+  GROUP BY days.n, issues.priority_id
+"""
+
+
+def _get_issues_days_series(project, days):
+    """
+    Get, for each of the last `days` days, the number of issues
+    created, closed and opened (by severity and priority) on it.
+    Days are UTC days, ending with today.
+    """
+    today = datetime.datetime.combine(datetime.date.today(), datetime.time(0, 0))
+    params = {
+        "first_day": today - datetime.timedelta(days=days - 1),
+        "last_day_index": days - 1,
+        "project_id": project.id,
+    }
+
+    series = {
+        "open": [0] * days,
+        "closed": [0] * days,
+        "severity": defaultdict(lambda: [0] * days),
+        "priority": defaultdict(lambda: [0] * days),
+    }
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(_ISSUES_DAYS_SERIES_SQL, params)
+        for kind, day_index, object_id, count in cursor.fetchall():
+            if object_id is None:
+                series[kind][day_index] = count
+            else:
+                series[kind][object_id][day_index] = count
+
+    return series
+
 
 def get_stats_for_project_issues(project):
+    issues = project.issues.all()
+
+    issues_per_status = _get_issues_per_status_object(issues, 'status')
+    closed_issues = issues.filter(status__is_closed=True).count()
+    total_issues = sum(status['count'] for status in issues_per_status.values())
+
     project_issues_stats = {
-        'total_issues': 0,
-        'opened_issues': 0,
-        'closed_issues': 0,
-        'issues_per_type': {},
-        'issues_per_status': {},
-        'issues_per_priority': {},
-        'issues_per_severity': {},
-        'issues_per_owner': {},
-        'issues_per_assigned_to': {},
+        'total_issues': total_issues,
+        'opened_issues': total_issues - closed_issues,
+        'closed_issues': closed_issues,
+        'issues_per_type': _get_issues_per_status_object(issues, 'type'),
+        'issues_per_status': issues_per_status,
+        'issues_per_priority': _get_issues_per_status_object(issues, 'priority'),
+        'issues_per_severity': _get_issues_per_status_object(issues, 'severity'),
+        'issues_per_owner': _get_issues_per_owned_object(issues, 'owner'),
+        'issues_per_assigned_to': _get_issues_per_owned_object(issues, 'assigned_to'),
         'last_four_weeks_days': {
             'by_open_closed': {'open': [], 'closed': []},
             'by_severity': {},
@@ -127,59 +223,20 @@ def get_stats_for_project_issues(project):
 
     }
 
-    issues = project.issues.all().select_related(
-        'status', 'priority', 'type', 'severity', 'owner', 'assigned_to'
-    )
-    for issue in issues:
-        project_issues_stats['total_issues'] += 1
-        if issue.status.is_closed:
-            project_issues_stats['closed_issues'] += 1
-        else:
-            project_issues_stats['opened_issues'] += 1
-        _count_status_object(issue.type, project_issues_stats['issues_per_type'])
-        _count_status_object(issue.status, project_issues_stats['issues_per_status'])
-        _count_status_object(issue.priority, project_issues_stats['issues_per_priority'])
-        _count_status_object(issue.severity, project_issues_stats['issues_per_severity'])
-        _count_owned_object(issue.owner, project_issues_stats['issues_per_owner'])
-        _count_owned_object(issue.assigned_to, project_issues_stats['issues_per_assigned_to'])
+    series = _get_issues_days_series(project, 28)
+    last_four_weeks_days = project_issues_stats['last_four_weeks_days']
+    last_four_weeks_days['by_open_closed']['open'] = series['open']
+    last_four_weeks_days['by_open_closed']['closed'] = series['closed']
 
     for severity in project_issues_stats['issues_per_severity'].values():
-        project_issues_stats['last_four_weeks_days']['by_severity'][severity['id']] = copy.copy(severity)
-        del(project_issues_stats['last_four_weeks_days']['by_severity'][severity['id']]['count'])
-        project_issues_stats['last_four_weeks_days']['by_severity'][severity['id']]['data'] = []
+        last_four_weeks_days['by_severity'][severity['id']] = copy.copy(severity)
+        del(last_four_weeks_days['by_severity'][severity['id']]['count'])
+        last_four_weeks_days['by_severity'][severity['id']]['data'] = series['severity'][severity['id']]
 
     for priority in project_issues_stats['issues_per_priority'].values():
-        project_issues_stats['last_four_weeks_days']['by_priority'][priority['id']] = copy.copy(priority)
-        del(project_issues_stats['last_four_weeks_days']['by_priority'][priority['id']]['count'])
-        project_issues_stats['last_four_weeks_days']['by_priority'][priority['id']]['data'] = []
-
-    for x in range(27, -1, -1):
-        day = datetime.datetime.combine(datetime.date.today(), datetime.time(0, 0)) - datetime.timedelta(days=x)
-        next_day = day + datetime.timedelta(days=1)
-
-        open_this_day = filter(lambda x: x.created_date.replace(tzinfo=None) >= day, issues)
-        open_this_day = filter(lambda x: x.created_date.replace(tzinfo=None) < next_day, open_this_day)
-        open_this_day = len(list(open_this_day))
-        project_issues_stats['last_four_weeks_days']['by_open_closed']['open'].append(open_this_day)
-
-        closed_this_day = filter(lambda x: x.finished_date, issues)
-        closed_this_day = filter(lambda x: x.finished_date.replace(tzinfo=None) >= day, closed_this_day)
-        closed_this_day = filter(lambda x: x.finished_date.replace(tzinfo=None) < next_day, closed_this_day)
-        closed_this_day = len(list(closed_this_day))
-        project_issues_stats['last_four_weeks_days']['by_open_closed']['closed'].append(closed_this_day)
-
-        opened_this_day = filter(lambda x: x.created_date.replace(tzinfo=None) < next_day, issues)
-        opened_this_day = list(filter(lambda x: x.finished_date is None or x.finished_date.replace(tzinfo=None) > day, opened_this_day))
-
-        for severity in project_issues_stats['last_four_weeks_days']['by_severity']:
-            by_severity = filter(lambda x: x.severity_id == severity, opened_this_day)
-            by_severity = len(list(by_severity))
-            project_issues_stats['last_four_weeks_days']['by_severity'][severity]['data'].append(by_severity)
-
-        for priority in project_issues_stats['last_four_weeks_days']['by_priority']:
-            by_priority = filter(lambda x: x.priority_id == priority, opened_this_day)
-            by_priority = len(list(by_priority))
-            project_issues_stats['last_four_weeks_days']['by_priority'][priority]['data'].append(by_priority)
+        last_four_weeks_days['by_priority'][priority['id']] = copy.copy(priority)
+        del(last_four_weeks_days['by_priority'][priority['id']]['count'])
+        last_four_weeks_days['by_priority'][priority['id']]['data'] = series['priority'][priority['id']]
 
     return project_issues_stats
 
@@ -195,6 +252,72 @@ def get_stats_for_project(project):
         'defined_points_per_role': project.defined_points,
         'assigned_points': sum(project.assigned_points.values()),
         'assigned_points_per_role': project.assigned_points,
-        'milestones': _get_milestones_stats_for_backlog(project)
+        'milestones': list(_get_milestones_stats_for_backlog(project))
     }
     return project_stats
+
+
+# Cached project stats. The version of the stats of a project
+# changes on each invalidation and the stats are recomputed by a
+# debounced task (only if they are cached), meanwhile the previous
+# stats are served.
+
+def _make_stats_key(project_id):
+    return "project-stats-{}".format(project_id)
+
+
+def _make_stats_version_key(project_id):
+    return "project-stats-version-{}".format(project_id)
+
+
+def _make_stats_pending_key(project_id):
+    return "project-stats-pending-{}".format(project_id)
+
+
+def get_project_stats_version(project_id):
+    key = _make_stats_version_key(project_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def update_project_stats(project):
+    """
+    Compute and cache the stats of a project.
+    Returns the stats and their version.
+    """
+    cache.delete(_make_stats_pending_key(project.id))
+    version = get_project_stats_version(project.id)
+    stats = get_stats_for_project(project)
+    cache.set(_make_stats_key(project.id), {"version": version, "stats": stats}, timeout=None)
+    return stats, version
+
+
+def get_cached_stats_for_project(project):
+    """
+    Get the stats of a project and their version, from the cache
+    if possible.
+    """
+    entry = cache.get(_make_stats_key(project.id))
+    if entry is not None:
+        if entry["version"] == get_project_stats_version(project.id):
+            return entry["stats"], entry["version"]
+
+        # Outdated, but will be updated soon
+        if cache.get(_make_stats_pending_key(project.id)):
+            return entry["stats"], entry["version"]
+
+    return update_project_stats(project)
+
+
+def invalidate_project_stats(project_id):
+    cache.set(_make_stats_version_key(project_id), uuid.uuid4().hex, timeout=None)
+
+    if cache.get(_make_stats_key(project_id)) is None:
+        return
+
+    delay = getattr(settings, "PROJECT_STATS_UPDATE_DELAY", 10)
+    if cache.add(_make_stats_pending_key(project_id), True, timeout=delay * 6):
+        apply_async("projects.update_project_stats", (project_id,), countdown=delay)
@@ -0,0 +1,140 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from functools import reduce
+import operator
+
+from django.db import transaction as tx
+from django.db import IntegrityError
+from django.db.models import F, Q
+from django.db.models.loading import get_model
+
+from taiga.base.utils.original_values import get_original_values
+
+
+# ProjectTag counter of each tagged model
+COUNTER_FIELDS = {
+    "userstory": "user_stories_count",
+    "task": "tasks_count",
+    "issue": "issues_count",
+}
+
+
+def _get_counter_field(obj):
+    return COUNTER_FIELDS[obj._meta.model_name]
+
+
+def _increment_tags(project_id, counter_field, tags):
+    project_tag_model = get_model("projects", "ProjectTag")
+    qs = project_tag_model.objects.filter(project_id=project_id, tag__in=tags)
+
+    existing_tags = set(qs.values_list("tag", flat=True))
+    if existing_tags:
+        qs.update(**{counter_field: F(counter_field) + 1})
+
+    new_tags = set(tags) - existing_tags
+    if not new_tags:
+        return
+
+    try:
+        with tx.atomic():
+            project_tag_model.objects.bulk_create([
+                project_tag_model(project_id=project_id, tag=tag, **{counter_field: 1})
+                for tag in sorted(new_tags)])
+    except IntegrityError:
+        # Some tag has been created meanwhile, so create them one by one
+        for tag in sorted(new_tags):
+            qs = project_tag_model.objects.filter(project_id=project_id, tag=tag)
+            if not qs.update(**{counter_field: F(counter_field) + 1}):
+                project_tag_model.objects.create(project_id=project_id, tag=tag, **{counter_field: 1})
+
+
+def _decrement_tags(project_id, counter_field, tags):
+    project_tag_model = get_model("projects", "ProjectTag")
+    qs = project_tag_model.objects.filter(project_id=project_id, tag__in=tags)
+    qs.filter(**{"{}__gt".format(counter_field): 0}).update(**{counter_field: F(counter_field) - 1})
+    qs.filter(user_stories_count=0, tasks_count=0, issues_count=0).delete()
+
+
+def update_project_tags(project_id, counter_field, added=(), removed=()):
+    """
+    Update the tags counters of a project for the added and removed tags
+    of one object.
+    """
+    if removed:
+        _decrement_tags(project_id, counter_field, set(removed))
+    if added:
+        _increment_tags(project_id, counter_field, set(added))
+
+
+def remember_tags(sender, instance, update_fields=None):
+    """
+    Store the project and tags saved in the database of an object, to
+    update the tags counters after saving it.
+    """
+    instance._project_tags_prev = None
+    if update_fields is not None and not {"tags", "project"}.intersection(update_fields):
+        # Neither the tags nor the project change
+        instance._project_tags_prev = False
+        return
+
+    prev_values = get_original_values(instance, "project", "tags")
+    if prev_values is not None:
+        instance._project_tags_prev = (prev_values["project"], prev_values["tags"])
+
+
+def update_project_tags_on_save(instance):
+    counter_field = _get_counter_field(instance)
+    prev = getattr(instance, "_project_tags_prev", None)
+    instance._project_tags_prev = None
+
+    if prev is False:
+        return
+
+    new_tags = set(instance.tags or [])
+    if prev is None:
+        update_project_tags(instance.project_id, counter_field, added=new_tags)
+        return
+
+    prev_project_id, prev_tags = prev
+    prev_tags = set(prev_tags or [])
+    if prev_project_id != instance.project_id:
+        update_project_tags(prev_project_id, counter_field, removed=prev_tags)
+        update_project_tags(instance.project_id, counter_field, added=new_tags)
+    else:
+        update_project_tags(instance.project_id, counter_field,
+                            added=new_tags - prev_tags, removed=prev_tags - new_tags)
+
+
+def update_project_tags_on_delete(instance):
+    update_project_tags(instance.project_id, _get_counter_field(instance),
+                        removed=set(instance.tags or []))
+
+
+def get_project_tags(project, *counter_fields):
+    """
+    Get the sorted list of (tag, count) of a project, counting the
+    objects of the given counters (all of them by default).
+    """
+    project_tag_model = get_model("projects", "ProjectTag")
+    counter_fields = counter_fields or tuple(sorted(COUNTER_FIELDS.values()))
+
+    qs = project_tag_model.objects.filter(project=project)
+    qs = qs.filter(reduce(operator.or_, [Q(**{"{}__gt".format(field): 0}) for field in counter_fields]))
+    qs = qs.order_by("tag")
+
+    return [(item.tag, sum(getattr(item, field) for field in counter_fields)) for item in qs]
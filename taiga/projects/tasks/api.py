@@ -91,8 +91,11 @@ class TaskViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMixin,
             raise exc.PermissionDenied(_("You don't have permisions to create tasks."))
 
         service = services.TasksService()
-        tasks = service.bulk_insert(project, request.user, user_story, bulk_tasks,
-                                    callback_on_success=self.post_save)
+        tasks = service.bulk_insert(project, request.user, user_story, bulk_tasks)
+
+        histories = self.persist_bulk_create_history_snapshots(tasks)
+        for task, history in zip(tasks, histories):
+            self.send_notifications(task, history)
 
         tasks_serialized = self.serializer_class(tasks, many=True)
         return Response(data=tasks_serialized.data)
@@ -22,12 +22,14 @@ from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 
 from taiga.base.tags import TaggedMixin
+from taiga.base.utils.original_values import track_fields
 from taiga.base.utils.slug import ref_uniquely
 from taiga.projects.notifications import WatchedModelMixin
 from taiga.projects.occ import OCCModelMixin
 from taiga.projects.userstories.models import UserStory
 from taiga.projects.milestones.models import Milestone
 from taiga.projects.mixins.blocked import BlockedMixin
+from taiga.projects.services import tags as tags_services
 
 
 class Task(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, models.Model):
@@ -53,6 +55,8 @@ class Task(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, models.M
     subject = models.CharField(max_length=500, null=False, blank=False,
                                verbose_name=_("subject"))
     description = models.TextField(null=False, blank=True, verbose_name=_("description"))
+    description_html = models.TextField(null=True, blank=True, editable=False,
+                                        verbose_name=_("description html"))
     assigned_to = models.ForeignKey(settings.AUTH_USER_MODEL, blank=True, null=True,
                                     default=None, related_name="tasks_assigned_to_me",
                                     verbose_name=_("assigned to"))
@@ -168,3 +172,21 @@ def tasks_close_handler(sender, instance, **kwargs):
         elif not instance.status.is_closed and instance.milestone.closed:
             instance.milestone.closed = False
             instance.milestone.save(update_fields=["closed"])
+
+
+track_fields(Task, "project", "tags")
+
+
+@receiver(models.signals.pre_save, sender=Task, dispatch_uid="task-remember-tags")
+def task_remember_tags(sender, instance, update_fields=None, **kwargs):
+    tags_services.remember_tags(sender, instance, update_fields=update_fields)
+
+
+@receiver(models.signals.post_save, sender=Task, dispatch_uid="task-update-project-tags")
+def task_update_project_tags(sender, instance, **kwargs):
+    tags_services.update_project_tags_on_save(instance)
+
+
+@receiver(models.signals.post_delete, sender=Task, dispatch_uid="task-update-project-tags-on-delete")
+def task_update_project_tags_on_delete(sender, instance, **kwargs):
+    tags_services.update_project_tags_on_delete(instance)
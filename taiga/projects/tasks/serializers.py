@@ -16,18 +16,19 @@
 
 from rest_framework import serializers
 
-from taiga.base.serializers import PickleField
-from taiga.mdrender.service import render as mdrender
+from taiga.base.serializers import PickleField, RenderedFieldsSerializerMixin
+from taiga.mdrender.service import render_field
 
 from . import models
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(RenderedFieldsSerializerMixin, serializers.ModelSerializer):
     tags = PickleField(required=False, default=[])
     comment = serializers.SerializerMethodField("get_comment")
     milestone_slug = serializers.SerializerMethodField("get_milestone_slug")
     blocked_note_html = serializers.SerializerMethodField("get_blocked_note_html")
     description_html = serializers.SerializerMethodField("get_description_html")
+    rendered_fields = ("description", "blocked_note")
 
     class Meta:
         model = models.Task
@@ -42,7 +43,7 @@ class TaskSerializer(serializers.ModelSerializer):
             return None
 
     def get_blocked_note_html(self, obj):
-        return mdrender(obj.project, obj.blocked_note)
+        return render_field(obj, "blocked_note")
 
     def get_description_html(self, obj):
-        return mdrender(obj.project, obj.description)
+        return render_field(obj, "description")
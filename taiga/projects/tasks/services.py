@@ -15,27 +15,58 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from django.db import transaction
-from django.db import connection
+from django.utils import timezone
+
+from taiga.mdrender import service as mdrender_service
+from taiga.projects.references import services as references_services
+from taiga.searches import services as searches_services
 
 from . import models
 
 
 class TasksService(object):
     @transaction.atomic
-    def bulk_insert(self, project, user, user_story, data, callback_on_success=None):
-        tasks = []
+    def bulk_insert(self, project, user, user_story, data):
+        """
+        Create a task of `user_story` for every non empty line of `data`.
 
+        The tasks and their references are inserted in bulk, so the work
+        of their pre_save/post_save signal handlers is done here once for
+        the whole batch. History snapshots are left to the caller (see
+        `history.services.take_bulk_create_snapshots`).
+        """
         items = filter(lambda s: len(s) > 0,
                     map(lambda s: s.strip(), data.split("\n")))
 
-        for item in items:
-            obj = models.Task.objects.create(subject=item, project=project,
-                                             user_story=user_story, owner=user,
-                                             status=project.default_task_status)
-            tasks.append(obj)
+        status = project.default_task_status
+        is_closed = status is not None and status.is_closed
+        finished_date = timezone.now() if is_closed else None
+        tasks = [models.Task(subject=item, project=project, user_story=user_story,
+                             owner=user, status=status, finished_date=finished_date)
+                 for item in items]
+        if not tasks:
+            return tasks
+
+        for obj in tasks:
+            mdrender_service.render_stored_fields(obj)
+
+        references_services.bulk_create_with_references(models.Task, project, tasks)
+
+        # New tasks reopen their user story, or close it if they are
+        # closed and it has no other open tasks (see tasks_close_handler).
+        if user_story is not None:
+            if not is_closed:
+                if user_story.is_closed:
+                    user_story.is_closed = False
+                    user_story.finish_date = None
+                    user_story.save(update_fields=["is_closed", "finish_date"])
+            elif not models.us_has_open_tasks(us=user_story, exclude_task=models.Task()):
+                user_story.is_closed = True
+                user_story.finish_date = timezone.now()
+                user_story.save(update_fields=["is_closed", "finish_date"])
 
-            if callback_on_success:
-                callback_on_success(obj, True)
+        searches_services.update_search_entries(models.Task, [obj.pk for obj in tasks])
+        mdrender_service.defer_new_references_invalidation(project.id, [obj.ref for obj in tasks])
 
         return tasks
 
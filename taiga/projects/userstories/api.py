@@ -80,8 +80,11 @@ class UserStoryViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMi
             raise exc.PermissionDenied(_("You don't have permisions to create user stories."))
 
         service = services.UserStoriesService()
-        user_stories = service.bulk_insert(project, request.user, bulk_stories,
-                            callback_on_success=self.post_save)
+        user_stories = service.bulk_insert(project, request.user, bulk_stories)
+
+        histories = self.persist_bulk_create_history_snapshots(user_stories)
+        for user_story, history in zip(user_stories, histories):
+            self.send_notifications(user_story, history)
 
         user_stories_serialized = self.serializer_class(user_stories, many=True)
         return Response(data=user_stories_serialized.data)
@@ -92,7 +95,6 @@ class UserStoryViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMi
         # [[1,1],[23, 2], ...]
 
         # TODO: Generate the histoy snaptshot when change the uss order in the backlog.
-        #       Implement order with linked lists \o/.
         bulk_stories = request.DATA.get("bulkStories", None)
 
         if bulk_stories is None:
@@ -112,6 +114,33 @@ class UserStoryViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMi
 
         return Response(data=None, status=status.HTTP_204_NO_CONTENT)
 
+    @list_route(methods=["POST"])
+    def move(self, request, **kwargs):
+        # Only the moved user story changes its order, previousId and
+        # nextId are its new neighbours (any of them can be null).
+        us_id = request.DATA.get("userStoryId", None)
+        if us_id is None:
+            raise exc.BadRequest(_("userStoryId parameter is mandatory"))
+
+        user_story = get_object_or_404(models.UserStory, id=us_id)
+        project = user_story.project
+
+        if request.user != project.owner and not has_project_perm(request.user, project, 'change_userstory'):
+            raise exc.PermissionDenied(_("You don't have permisions to change user stories."))
+
+        neighbours = {}
+        for param in ("previousId", "nextId"):
+            neighbour_id = request.DATA.get(param, None)
+            if neighbour_id is None:
+                neighbours[param] = None
+            else:
+                neighbours[param] = get_object_or_404(models.UserStory, id=neighbour_id, project=project)
+
+        service = services.UserStoriesService()
+        user_story = service.move(user_story, previous=neighbours["previousId"], next=neighbours["nextId"])
+
+        return Response(data={"order": user_story.order}, status=status.HTTP_200_OK)
+
     @transaction.atomic
     def create(self, *args, **kwargs):
         response = super().create(*args, **kwargs)
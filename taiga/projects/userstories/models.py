@@ -14,17 +14,29 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from contextlib import closing
+
 from django.db import models
+from django.db import connection
 from django.contrib.contenttypes import generic
 from django.conf import settings
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 
 from taiga.base.tags import TaggedMixin
+from taiga.base.utils.original_values import track_fields
 from taiga.base.utils.slug import ref_uniquely
 from taiga.projects.notifications import WatchedModelMixin
 from taiga.projects.occ import OCCModelMixin
 from taiga.projects.mixins.blocked import BlockedMixin
+from taiga.projects.services import points as points_services
+from taiga.projects.services import stats as stats_services
+from taiga.projects.services import tags as tags_services
+
+
+# Distance between the order of consecutive user stories after a
+# rebalance, it lets a story be moved changing only its own order.
+ORDER_GAP = 1024
 
 
 class RolePoints(models.Model):
@@ -72,8 +84,8 @@ class UserStory(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, mod
     points = models.ManyToManyField("projects.Points", null=False, blank=False,
                                     related_name="userstories", through="RolePoints",
                                     verbose_name=_("points"))
-    order = models.PositiveSmallIntegerField(null=False, blank=False, default=100,
-                                             verbose_name=_("order"))
+    order = models.PositiveIntegerField(null=False, blank=True, default=None,
+                                        verbose_name=_("order"))
     created_date = models.DateTimeField(auto_now_add=True, null=False, blank=False,
                                         verbose_name=_("created date"))
     modified_date = models.DateTimeField(auto_now=True, null=False, blank=False,
@@ -83,6 +95,8 @@ class UserStory(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, mod
     subject = models.CharField(max_length=500, null=False, blank=False,
                                verbose_name=_("subject"))
     description = models.TextField(null=False, blank=True, verbose_name=_("description"))
+    description_html = models.TextField(null=True, blank=True, editable=False,
+                                        verbose_name=_("description html"))
     assigned_to = models.ForeignKey(settings.AUTH_USER_MODEL, blank=True, null=True,
                                     default=None, related_name="userstories_assigned_to_me",
                                     verbose_name=_("assigned to"))
@@ -114,12 +128,7 @@ class UserStory(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, mod
         return self.role_points
 
     def get_total_points(self):
-        total = 0.0
-        for rp in self.role_points.select_related("points"):
-            if rp.points.value:
-                total += rp.points.value
-
-        return total
+        return points_services.get_total_points(pk=self.pk)
 
     def get_notifiable_assigned_to_display(self, value):
         if not value:
@@ -138,6 +147,37 @@ class UserStory(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, mod
         return None
 
 
+def lock_order(project_id):
+    """
+    Serialize the order changes of the user stories of a
+    project until the end of current transaction.
+    """
+    with closing(connection.cursor()) as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))",
+                       ["userstories-order:{}".format(project_id)])
+
+
+def get_next_orders(project_id, count=1):
+    """
+    Get the orders of `count` user stories placed after
+    the last one of the project.
+
+    The order of the project is locked, so user stories created
+    concurrently in other transactions don't get the same orders.
+    """
+    lock_order(project_id)
+    last_order = (UserStory.objects.filter(project_id=project_id)
+                                   .aggregate(models.Max("order"))["order__max"]) or 0
+    return [last_order + ORDER_GAP * i for i in range(1, count + 1)]
+
+
+@receiver(models.signals.pre_save, sender=UserStory, dispatch_uid="user_story_order_on_create")
+def us_order_on_create(sender, instance, **kwargs):
+    # New user stories without order go to the end of the backlog
+    if instance.order is None:
+        instance.order = get_next_orders(instance.project_id)[0]
+
+
 @receiver(models.signals.post_save, sender=UserStory,
           dispatch_uid="user_story_create_role_points_handler")
 def us_create_role_points_handler(sender, instance, **kwargs):
@@ -155,3 +195,45 @@ def us_task_reassignation(sender, instance, created, **kwargs):
 def us_tags_normalization(sender, instance, **kwargs):
     if isinstance(instance.tags, (list, tuple)):
         instance.tags = list(map(str.lower, instance.tags))
+
+
+@receiver(models.signals.post_save, sender=UserStory,
+          dispatch_uid="user_story_invalidate_project_stats")
+@receiver(models.signals.post_delete, sender=UserStory,
+          dispatch_uid="user_story_invalidate_project_stats_on_delete")
+def us_invalidate_project_stats(sender, instance, **kwargs):
+    stats_services.invalidate_project_stats(instance.project_id)
+
+
+@receiver(models.signals.post_save, sender=RolePoints,
+          dispatch_uid="role_points_invalidate_project_stats")
+@receiver(models.signals.post_delete, sender=RolePoints,
+          dispatch_uid="role_points_invalidate_project_stats_on_delete")
+def role_points_invalidate_project_stats(sender, instance, **kwargs):
+    try:
+        project_id = instance.user_story.project_id
+    except UserStory.DoesNotExist:
+        return
+    stats_services.invalidate_project_stats(project_id)
+
+
+track_fields(UserStory, "project", "tags")
+
+
+@receiver(models.signals.pre_save, sender=UserStory, dispatch_uid="us-remember-tags")
+def us_remember_tags(sender, instance, update_fields=None, **kwargs):
+    tags_services.remember_tags(sender, instance, update_fields=update_fields)
+
+
+@receiver(models.signals.post_save, sender=UserStory, dispatch_uid="us-update-project-tags")
+def us_update_project_tags(sender, instance, **kwargs):
+    tags_services.update_project_tags_on_save(instance)
+
+
+@receiver(models.signals.post_delete, sender=UserStory, dispatch_uid="us-update-project-tags-on-delete")
+def us_update_project_tags_on_delete(sender, instance, **kwargs):
+    tags_services.update_project_tags_on_delete(instance)
+
+
+# Register user stories deferred tasks
+from . import deferred
@@ -19,7 +19,8 @@ from django.db.models import get_model
 from rest_framework import serializers
 
 from taiga.base.serializers import PickleField, NeighborsSerializerMixin
-from taiga.mdrender.service import render as mdrender
+from taiga.base.serializers import RenderedFieldsSerializerMixin
+from taiga.mdrender.service import render_field
 
 from . import models
 
@@ -34,7 +35,7 @@ class RolePointsField(serializers.WritableField):
         return json.loads(obj)
 
 
-class UserStorySerializer(serializers.ModelSerializer):
+class UserStorySerializer(RenderedFieldsSerializerMixin, serializers.ModelSerializer):
     tags = PickleField(default=[], required=False)
     points = RolePointsField(source="role_points", required=False)
     total_points = serializers.SerializerMethodField("get_total_points")
@@ -44,6 +45,7 @@ class UserStorySerializer(serializers.ModelSerializer):
     origin_issue = serializers.SerializerMethodField("get_origin_issue")
     blocked_note_html = serializers.SerializerMethodField("get_blocked_note_html")
     description_html = serializers.SerializerMethodField("get_description_html")
+    rendered_fields = ("description", "blocked_note")
 
     class Meta:
         model = models.UserStory
@@ -92,10 +94,10 @@ class UserStorySerializer(serializers.ModelSerializer):
         return None
 
     def get_blocked_note_html(self, obj):
-        return mdrender(obj.project, obj.blocked_note)
+        return render_field(obj, "blocked_note")
 
     def get_description_html(self, obj):
-        return mdrender(obj.project, obj.description)
+        return render_field(obj, "description")
 
 
 class UserStoryNeighborsSerializer(NeighborsSerializerMixin, UserStorySerializer):
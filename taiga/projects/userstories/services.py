@@ -14,43 +14,157 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from contextlib import closing
+
 from django.db import transaction
 from django.db import connection
+from django.utils.translation import ugettext_lazy as _
+
+from taiga.base import exceptions as exc
+from taiga.deferred import call_async
+from taiga.events import middleware as events_middleware
+from taiga.events.changes import emit_bulk_change_event_for_models
+from taiga.mdrender import service as mdrender_service
+from taiga.projects.references import services as references_services
+from taiga.projects.services import stats as stats_services
+from taiga.projects.services.bulk_update_order import bulk_update_order
+from taiga.searches import services as searches_services
+from taiga.timeline.service import push_to_timeline
 
 from . import models
+from .models import ORDER_GAP
 
 
 class UserStoriesService(object):
     @transaction.atomic
-    def bulk_insert(self, project, user, data, callback_on_success=None):
-        user_stories = []
+    def bulk_insert(self, project, user, data):
+        """
+        Create a user story for every non empty line of `data`.
 
+        The user stories, their references and role points are inserted
+        in bulk, so the work of their post_save signal handlers is done
+        here once for the whole batch: one timeline entry and one change
+        event are emitted for all of them. History snapshots are left to
+        the caller (see `history.services.take_bulk_create_snapshots`).
+        """
         items = filter(lambda s: len(s) > 0,
                     map(lambda s: s.strip(), data.split("\n")))
 
-        for item in items:
-            obj = models.UserStory.objects.create(subject=item, project=project, owner=user,
-                                                  status=project.default_us_status)
-            user_stories.append(obj)
+        user_stories = [models.UserStory(subject=item, project=project, owner=user,
+                                         status=project.default_us_status)
+                        for item in items]
+        if not user_stories:
+            return user_stories
+
+        orders = models.get_next_orders(project.id, len(user_stories))
+        for obj, order in zip(user_stories, orders):
+            obj.order = order
+            mdrender_service.render_stored_fields(obj)
+
+        references_services.bulk_create_with_references(models.UserStory, project, user_stories)
+        self._bulk_create_role_points(project, user_stories)
+
+        ids = [obj.pk for obj in user_stories]
+        searches_services.update_search_entries(models.UserStory, ids)
+        stats_services.invalidate_project_stats(project.id)
+        mdrender_service.defer_new_references_invalidation(project.id, [obj.ref for obj in user_stories])
 
-            if callback_on_success:
-                callback_on_success(obj, True)
+        creator = {"id": user.pk, "name": user.get_full_name()}
+        push_to_timeline(project, project, "userstories-bulk-create",
+                         extra_data={"userstories": [{"id": obj.pk, "subject": obj.subject}
+                                                     for obj in user_stories],
+                                     "creator": creator})
+        emit_bulk_change_event_for_models(models.UserStory, project.id, ids,
+                                          events_middleware.get_current_session_id())
 
         return user_stories
 
+    def _bulk_create_role_points(self, project, user_stories):
+        # Same role points that Project.update_role_points creates
+        # for a new user story, for all of them with one query.
+        roles = list(project.get_roles().filter(computable=True))
+        if not roles:
+            return
+
+        null_points_value = project.points.get(value=None)
+        models.RolePoints.objects.bulk_create([models.RolePoints(role=role, user_story=obj,
+                                                                 points=null_points_value)
+                                               for obj in user_stories
+                                               for role in roles])
+
     @transaction.atomic
     def bulk_update_order(self, project, user, data):
         # TODO: Create a history snapshot of all updated USs
-        cursor = connection.cursor()
+        models.lock_order(project.id)
+        bulk_update_order(models.UserStory, project, data)
+
+    @transaction.atomic
+    def move(self, user_story, previous=None, next=None):
+        """
+        Place a user story between two others updating only its own order.
+
+        The new order is the middle point between the order of its new
+        neighbours. If there is no gap left between them the order of the
+        project user stories is rebalanced first, and when the move uses
+        the last free gap a rebalance is requested to a deferred task.
+
+        Moves and rebalances of the same project are serialized by a
+        lock, so a rebalance ranks the stories with the committed order
+        of the moved one.
+
+        :param user_story: UserStory to move.
+        :param previous: UserStory that will be before it (or None if it goes first).
+        :param next: UserStory that will be after it (or None if it goes last).
+
+        :return: The moved user story with its new order.
+        """
+        if previous is None and next is None:
+            return user_story
+
+        models.lock_order(user_story.project_id)
+        neighbours = [us.id for us in (previous, next) if us is not None]
+        bounds = self._get_order_bounds(neighbours, previous, next)
+        if bounds[1] - bounds[0] <= 1:
+            self.rebalance_order(user_story.project_id)
+            bounds = self._get_order_bounds(neighbours, previous, next)
+            if bounds[1] - bounds[0] <= 1:
+                raise exc.WrongArguments(_("The previous user story must be before the next one."))
+
+        low, high = bounds
+        order = (low + high) // 2
+        models.UserStory.objects.filter(pk=user_story.pk).update(order=order)
+        user_story.order = order
+
+        if order - low <= 1 or high - order <= 1:
+            call_async("userstories.rebalance_order", user_story.project_id)
+
+        return user_story
+
+    def _get_order_bounds(self, neighbours, previous, next):
+        orders = dict(models.UserStory.objects.filter(id__in=neighbours)
+                                              .values_list("id", "order"))
+        high = orders[next.id] if next is not None else None
+        low = orders[previous.id] if previous is not None else max(high - 2 * ORDER_GAP, -1)
+        if high is None:
+            high = low + 2 * ORDER_GAP
+        return low, high
+
+    @transaction.atomic
+    def rebalance_order(self, project_id):
+        """
+        Spread again the order of all the user stories of a project
+        leaving ORDER_GAP between consecutive ones.
+        """
+        models.lock_order(project_id)
 
         sql = """
-        prepare bulk_update_order as update userstories_userstory set "order" = $1
-            where userstories_userstory.id = $2 and
-                  userstories_userstory.project_id = $3;
+        UPDATE userstories_userstory
+           SET "order" = ranked.position * %s
+          FROM (SELECT id, row_number() OVER (ORDER BY "order", ref) AS position
+                  FROM userstories_userstory
+                 WHERE project_id = %s) AS ranked
+         WHERE userstories_userstory.id = ranked.id;
         """
 
-        cursor.execute(sql)
-        for usid, usorder in data:
-            cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                           (usorder, usid, project.id))
-        cursor.close()
+        with closing(connection.cursor()) as cursor:
+            cursor.execute(sql, [ORDER_GAP, project_id])
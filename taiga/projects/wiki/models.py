@@ -29,6 +29,8 @@ class WikiPage(OCCModelMixin, WatchedModelMixin, models.Model):
                             verbose_name=_("slug"))
     content = models.TextField(null=False, blank=True,
                                verbose_name=_("content"))
+    content_html = models.TextField(null=True, blank=True, editable=False,
+                                    verbose_name=_("content html"))
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True,
                               related_name="owned_wiki_pages", verbose_name=_("owner"))
     created_date = models.DateTimeField(auto_now_add=True, null=False, blank=False,
@@ -16,19 +16,23 @@
 
 from rest_framework import serializers
 
+from taiga.base.serializers import RenderedFieldsSerializerMixin
+
 from . import models
 
-from taiga.mdrender.service import render as mdrender
+from taiga.mdrender.service import render_field
 
 
-class WikiPageSerializer(serializers.ModelSerializer):
+class WikiPageSerializer(RenderedFieldsSerializerMixin, serializers.ModelSerializer):
     html = serializers.SerializerMethodField("get_html")
+    rendered_fields = ("content",)
 
     class Meta:
         model = models.WikiPage
+        exclude = ("content_html",)
 
     def get_html(self, obj):
-        return mdrender(obj.project, obj.content)
+        return render_field(obj, "content")
 
 
 class WikiLinkSerializer(serializers.ModelSerializer):
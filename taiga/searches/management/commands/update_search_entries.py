@@ -0,0 +1,42 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.db.models.loading import get_model
+
+from taiga.searches import services
+
+
+class Command(BaseCommand):
+    help = "Calculate again the stored search vectors (after changing the text search configuration)."
+
+    option_list = BaseCommand.option_list + (
+        make_option("--project", action="append", type="int", dest="projects",
+                    default=None, help="Only update objects of this project id (can be repeated)."),
+    )
+
+    def handle(self, *args, **options):
+        project_ids = options["projects"]
+        if project_ids is None:
+            project_ids = list(get_model("projects", "Project").objects.values_list("id", flat=True))
+
+        for project_id in project_ids:
+            services.update_project_search_entries(project_id)
+
+        self.stdout.write("Search vectors updated of {} projects.".format(len(project_ids)))
@@ -0,0 +1,80 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from django.db import models
+from django.dispatch import receiver
+from django.utils.translation import ugettext_lazy as _
+from django.contrib.contenttypes import generic
+
+from taiga.base.utils.original_values import track_fields, has_changed
+
+from .fields import TSVectorField
+from . import services
+
+
+class SearchEntry(models.Model):
+    """
+    Stored search vector of a searchable object (see
+    services.SEARCHABLE_MODELS), maintained on save.
+    """
+    content_type = models.ForeignKey("contenttypes.ContentType")
+    object_id = models.PositiveIntegerField()
+    content_object = generic.GenericForeignKey("content_type", "object_id")
+    project = models.ForeignKey("projects.Project", null=False, blank=False,
+                                related_name="search_entries", verbose_name=_("project"))
+    vector = TSVectorField(verbose_name=_("vector"))
+
+    class Meta:
+        verbose_name = "search entry"
+        verbose_name_plural = "search entries"
+        unique_together = ("content_type", "object_id")
+
+    def __str__(self):
+        return "{}: {}".format(self.content_type_id, self.object_id)
+
+
+for typename, searchable_fields in services.SEARCHABLE_MODELS.items():
+    track_fields(typename, "project", *searchable_fields)
+
+
+@receiver(models.signals.pre_save, dispatch_uid="mark_search_entry_changes")
+def mark_search_entry_changes(sender, instance, update_fields=None, **kwargs):
+    searchable_fields = services.get_searchable_fields(sender)
+    if searchable_fields is None:
+        return
+
+    field_names = ("project",) + searchable_fields
+    if update_fields is not None and not set(field_names).intersection(update_fields):
+        instance._search_entry_changed = False
+    else:
+        instance._search_entry_changed = has_changed(instance, *field_names)
+
+
+@receiver(models.signals.post_save, dispatch_uid="update_search_entry")
+def update_search_entry(sender, instance, created, **kwargs):
+    if services.get_searchable_fields(sender) is None:
+        return
+
+    if created or getattr(instance, "_search_entry_changed", True):
+        services.update_search_entries(sender, [instance.pk])
+
+
+@receiver(models.signals.post_delete, dispatch_uid="delete_search_entry")
+def delete_search_entry(sender, instance, **kwargs):
+    if services.get_searchable_fields(sender) is not None:
+        services.delete_search_entries(sender, [instance.pk])
+
@@ -14,56 +14,150 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from django.db.models.loading import get_model
+
+from contextlib import closing
+
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db import transaction as tx
+from django.db.models.loading import get_model
 
 
 MAX_RESULTS = getattr(settings, "SEARCHES_MAX_RESULTS", 150)
 
+# Searchable models: the weighted fields of their search vectors
+SEARCHABLE_MODELS = {
+    "userstories.userstory": ("subject", "description"),
+    "tasks.task": ("subject", "description"),
+    "issues.issue": ("subject", "description"),
+    "wiki.wikipage": ("slug", "content"),
+}
+
+# Text search configuration: the one of the project or the default one
+# (settings.SEARCHES_TEXT_SEARCH_CONFIG or the database default).
+_CONFIG_SQL = ("coalesce(project.search_language::regconfig, %(default_config)s::regconfig, "
+               "get_current_ts_config())")
+
+# The objects are locked, so concurrent updates of their entries are
+# serialized and the entry inserted by other transaction is deleted.
+_SEARCH_ENTRIES_LOCK_SQL = """
+SELECT obj.id
+  FROM {table} AS obj
+ WHERE {where}
+ ORDER BY obj.id
+   FOR UPDATE
+"""
+
+_SEARCH_ENTRIES_DELETE_SQL = """
+DELETE FROM searches_searchentry AS entry
+ USING {table} AS obj
+ WHERE entry.content_type_id = %(content_type_id)s
+   AND entry.object_id = obj.id
+   AND {where}
+"""
+
+_SEARCH_ENTRIES_INSERT_SQL = """
+INSERT INTO searches_searchentry (content_type_id, object_id, project_id, vector)
+SELECT %(content_type_id)s, obj.id, obj.project_id,
+       setweight(to_tsvector({config}, coalesce(obj.{field_a}, '')), 'A') ||
+       setweight(to_tsvector({config}, coalesce(obj.{field_b}, '')), 'B')
+  FROM {table} AS obj
+  JOIN projects_project AS project ON project.id = obj.project_id
+ WHERE {where}
+"""
+
+
+def _get_model_key(model_cls):
+    return "{}.{}".format(model_cls._meta.app_label, model_cls._meta.model_name)
+
+
+def get_searchable_fields(model_cls):
+    """
+    Get the fields of the search vector of a model, None if the model
+    is not searchable.
+    """
+    return SEARCHABLE_MODELS.get(_get_model_key(model_cls))
+
+
+def _execute_search_entries_update(model_cls, where, params):
+    field_a, field_b = get_searchable_fields(model_cls)
+    content_type = ContentType.objects.get_for_model(model_cls)
+
+    sql_params = {"table": model_cls._meta.db_table, "where": where}
+    params = dict(params, content_type_id=content_type.id,
+                  default_config=getattr(settings, "SEARCHES_TEXT_SEARCH_CONFIG", None))
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(_SEARCH_ENTRIES_LOCK_SQL.format(**sql_params), params)
+        cursor.execute(_SEARCH_ENTRIES_DELETE_SQL.format(**sql_params), params)
+        cursor.execute(_SEARCH_ENTRIES_INSERT_SQL.format(config=_CONFIG_SQL, field_a=field_a,
+                                                         field_b=field_b, **sql_params), params)
+
+
+def update_search_entries(model_cls, ids):
+    """
+    Update the stored search vectors of the objects of a searchable model.
+    """
+    if not ids:
+        return
+
+    with tx.atomic():
+        _execute_search_entries_update(model_cls, "obj.id = ANY(%(ids)s)", {"ids": list(ids)})
+
+
+def delete_search_entries(model_cls, ids):
+    search_entry_model = get_model("searches", "SearchEntry")
+    content_type = ContentType.objects.get_for_model(model_cls)
+    search_entry_model.objects.filter(content_type=content_type, object_id__in=ids).delete()
+
+
+def update_project_search_entries(project_id):
+    """
+    Update the stored search vectors of all the objects of a project.
+    """
+    for key in SEARCHABLE_MODELS:
+        model_cls = get_model(*key.split("."))
+        with tx.atomic():
+            _execute_search_entries_update(model_cls, "obj.project_id = %(project_id)s",
+                                           {"project_id": project_id})
+
+
+def _search(model_cls, project, text):
+    queryset = model_cls.objects.filter(project_id=project.pk)
+    if not text:
+        return queryset[:MAX_RESULTS]
+
+    content_type = ContentType.objects.get_for_model(model_cls)
+    query = ("plainto_tsquery(coalesce(%s::regconfig, %s::regconfig, get_current_ts_config()), %s)")
+    query_params = [project.search_language,
+                    getattr(settings, "SEARCHES_TEXT_SEARCH_CONFIG", None),
+                    text]
+
+    queryset = queryset.extra(
+        select={"search_rank": "ts_rank(searches_searchentry.vector, {})".format(query)},
+        select_params=query_params,
+        tables=["searches_searchentry"],
+        where=["searches_searchentry.content_type_id = %s",
+               "searches_searchentry.project_id = %s",
+               "searches_searchentry.object_id = {}.id".format(model_cls._meta.db_table),
+               "searches_searchentry.vector @@ {}".format(query)],
+        params=[content_type.id, project.pk] + query_params)
+    queryset = queryset.order_by("-search_rank", *model_cls._meta.ordering)
+    return queryset[:MAX_RESULTS]
 
-def search_user_stories(project, text):
-    model_cls = get_model("userstories", "UserStory")
-    where_clause = ("to_tsvector(coalesce(userstories_userstory.subject) || ' ' || "
-                    "coalesce(userstories_userstory.description)) @@ plainto_tsquery(%s)")
-
-    if text:
-        return (model_cls.objects.extra(where=[where_clause], params=[text])
-                                 .filter(project_id=project.pk)[:MAX_RESULTS])
 
-    return model_cls.objects.filter(project_id=project.pk)[:MAX_RESULTS]
+def search_user_stories(project, text):
+    return _search(get_model("userstories", "UserStory"), project, text)
 
 
 def search_tasks(project, text):
-    model_cls = get_model("tasks", "Task")
-    where_clause = ("to_tsvector(coalesce(tasks_task.subject, '') || ' ' || coalesce(tasks_task.description, '')) "
-                    "@@ plainto_tsquery(%s)")
-
-    if text:
-        return (model_cls.objects.extra(where=[where_clause], params=[text])
-                                 .filter(project_id=project.pk)[:MAX_RESULTS])
-
-    return model_cls.objects.filter(project_id=project.pk)[:MAX_RESULTS]
+    return _search(get_model("tasks", "Task"), project, text)
 
 
 def search_issues(project, text):
-    model_cls = get_model("issues", "Issue")
-    where_clause = ("to_tsvector(coalesce(issues_issue.subject) || ' ' || coalesce(issues_issue.description)) "
-                    "@@ plainto_tsquery(%s)")
-
-    if text:
-        return (model_cls.objects.extra(where=[where_clause], params=[text])
-                                 .filter(project_id=project.pk)[:MAX_RESULTS])
-
-    return model_cls.objects.filter(project_id=project.pk)[:MAX_RESULTS]
+    return _search(get_model("issues", "Issue"), project, text)
 
 
 def search_wiki_pages(project, text):
-    model_cls = get_model("wiki", "WikiPage")
-    where_clause = ("to_tsvector(coalesce(wiki_wikipage.slug) || ' ' || coalesce(wiki_wikipage.content)) "
-                    "@@ plainto_tsquery(%s)")
-
-    if text:
-        return (model_cls.objects.extra(where=[where_clause], params=[text])
-                                 .filter(project_id=project.pk)[:MAX_RESULTS])
-
-    return model_cls.objects.filter(project_id=project.pk)[:MAX_RESULTS]
+    return _search(get_model("wiki", "WikiPage"), project, text)
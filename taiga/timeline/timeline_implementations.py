@@ -51,6 +51,19 @@ def userstory_create_timeline(instance, extra_data={}):
     }
 
 
+@register_timeline_implementation("projects.project", "userstories-bulk-create")
+def userstories_bulk_create_timeline(instance, extra_data={}):
+    result = {
+        "project": {
+            "id": instance.pk,
+            "slug": instance.slug,
+            "name": instance.name,
+        },
+    }
+    result.update(extra_data)
+    return result
+
+
 @register_timeline_implementation("issues.issue", "create")
 def issue_create_timeline(instance, extra_data={}):
     return {
@@ -0,0 +1,78 @@
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from taiga.projects.history import services as history_services
+from taiga.projects.references.models import Reference
+from taiga.projects.tasks.services import TasksService
+from taiga.projects.userstories.models import RolePoints
+from taiga.projects.userstories.services import UserStoriesService
+from taiga.searches.models import SearchEntry
+from taiga.timeline.service import get_timeline
+
+from .. import factories as f
+
+pytestmark = pytest.mark.django_db
+
+
+def _create_project():
+    project = f.ProjectFactory.create()
+    f.RoleFactory.create(project=project, computable=True)
+    f.PointsFactory.create(project=project, value=None)
+    return project
+
+
+def test_bulk_insert_user_stories():
+    project = _create_project()
+
+    user_stories = UserStoriesService().bulk_insert(project, project.owner, "US 1\n\nUS 2\n")
+
+    assert [us.subject for us in user_stories] == ["US 1", "US 2"]
+    assert all(us.pk is not None for us in user_stories)
+    assert len({us.ref for us in user_stories}) == 2
+    assert Reference.objects.filter(project=project, ref__in=[us.ref for us in user_stories]).count() == 2
+    assert RolePoints.objects.filter(user_story__in=user_stories).count() == 2
+    assert SearchEntry.objects.filter(project=project).count() == 2
+
+    timeline = get_timeline(project).filter(event_type="userstories-bulk-create")
+    assert timeline.count() == 1
+    assert [us["subject"] for us in timeline[0].data["userstories"]] == ["US 1", "US 2"]
+
+
+def test_bulk_insert_user_stories_uses_a_constant_number_of_queries():
+    project = _create_project()
+    service = UserStoriesService()
+
+    with CaptureQueriesContext(connection) as few:
+        service.bulk_insert(project, project.owner, "\n".join("US {}".format(i) for i in range(2)))
+
+    with CaptureQueriesContext(connection) as many:
+        service.bulk_insert(project, project.owner, "\n".join("US {}".format(i) for i in range(50)))
+
+    assert len(few) == len(many)
+
+
+def test_bulk_insert_tasks():
+    user_story = f.UserStoryFactory.create(is_closed=True)
+    project = user_story.project
+
+    tasks = TasksService().bulk_insert(project, project.owner, user_story, "Task 1\nTask 2")
+
+    assert [task.subject for task in tasks] == ["Task 1", "Task 2"]
+    assert Reference.objects.filter(project=project, ref__in=[task.ref for task in tasks]).count() == 2
+    assert user_story.__class__.objects.get(pk=user_story.pk).is_closed is False
+
+
+def test_bulk_create_history_snapshots():
+    project = _create_project()
+    user_stories = UserStoriesService().bulk_insert(project, project.owner, "US 1\nUS 2")
+
+    entries = history_services.take_bulk_create_snapshots(user_stories, user=project.owner)
+
+    assert sorted(entry.key for entry in entries) == sorted("userstories.userstory:{}".format(us.pk)
+                                                            for us in user_stories)
+    for us in user_stories:
+        last_snapshot, need_real_snapshot = history_services.get_last_snapshot_for_key(
+            history_services.make_key_from_model_object(us))
+        assert last_snapshot.snapshot["subject"] == us.subject
@@ -0,0 +1,65 @@
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from taiga.base import exceptions as exc
+from taiga.projects import services
+from taiga.projects.userstories.models import UserStory
+from taiga.projects.userstories.services import UserStoriesService
+
+from .. import factories as f
+
+pytestmark = pytest.mark.django_db
+
+
+def test_bulk_update_order_uses_a_constant_number_of_queries():
+    project = f.ProjectFactory.create()
+    user_stories = f.UserStoryFactory.create_batch(20, project=project)
+
+    with CaptureQueriesContext(connection) as few:
+        services.bulk_update_order(UserStory, project, [[us.id, 1] for us in user_stories[:2]])
+
+    with CaptureQueriesContext(connection) as many:
+        services.bulk_update_order(UserStory, project, [[us.id, 2] for us in user_stories])
+
+    assert len(few) == len(many)
+    assert set(UserStory.objects.filter(project=project).values_list("order", flat=True)) == {2}
+
+
+def test_bulk_update_order_of_user_stories():
+    project = f.ProjectFactory.create()
+    us1, us2 = f.UserStoryFactory.create_batch(2, project=project)
+
+    UserStoriesService().bulk_update_order(project, None, [[us1.id, 10], [us2.id, 5]])
+
+    assert UserStory.objects.get(pk=us1.pk).order == 10
+    assert UserStory.objects.get(pk=us2.pk).order == 5
+
+
+def test_bulk_update_order_of_project_attributes():
+    severity = f.SeverityFactory.create(order=1)
+    other = f.SeverityFactory.create(project=severity.project, order=2)
+
+    services.bulk_update_severity_order(severity.project, None, [[severity.id, 2], [other.id, 1]])
+
+    assert severity.__class__.objects.get(pk=severity.pk).order == 2
+    assert other.__class__.objects.get(pk=other.pk).order == 1
+
+
+def test_bulk_update_order_rejects_objects_of_other_projects():
+    us = f.UserStoryFactory.create(order=1)
+    foreign_us = f.UserStoryFactory.create(order=1)
+
+    with pytest.raises(exc.WrongArguments):
+        services.bulk_update_order(UserStory, us.project, [[us.id, 5], [foreign_us.id, 5]])
+
+    assert UserStory.objects.get(pk=us.pk).order == 1
+    assert UserStory.objects.get(pk=foreign_us.pk).order == 1
+
+
+def test_bulk_update_order_rejects_malformed_data():
+    project = f.ProjectFactory.create()
+
+    with pytest.raises(exc.WrongArguments):
+        services.bulk_update_order(UserStory, project, [["foo", 1]])
@@ -0,0 +1,89 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# Copyright (C) 2014 Anler Hernández <hello@anler.me>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+
+import pytest
+
+from django.core.urlresolvers import reverse
+
+from taiga.projects.services import filters
+
+from .. import factories as f
+
+pytestmark = pytest.mark.django_db
+
+
+def test_get_issues_filters_data():
+    issue1 = f.create_issue(tags=["foo", "bar"])
+    project = issue1.project
+    f.MembershipFactory.create(project=project, user=issue1.owner)
+    closed_status = f.IssueStatusFactory.create(project=project, is_closed=True)
+    issue2 = f.IssueFactory.create(project=project, owner=issue1.owner, status=closed_status,
+                                   severity=issue1.severity, priority=issue1.priority,
+                                   type=issue1.type, assigned_to=issue1.owner, tags=["foo"])
+
+    data = filters.get_issues_filters_data(project)
+
+    assert dict(data["statuses"])[issue1.status.id] == 1
+    assert dict(data["statuses"])[closed_status.id] == 1
+    assert dict(data["types"])[issue1.type.id] == 2
+    assert dict(data["assigned_to"]) == {None: 1, issue1.owner.id: 1}
+    assert dict(data["owners"]) == {issue1.owner.id: 2}
+    assert data["tags"] == [("bar", 1), ("foo", 2)]
+
+    # Each facet is counted with the filters of the other facets
+    data = filters.get_issues_filters_data(project, {"status": [closed_status.id]})
+
+    assert dict(data["statuses"])[issue1.status.id] == 1
+    assert dict(data["statuses"])[closed_status.id] == 1
+    assert dict(data["types"])[issue1.type.id] == 1
+    assert dict(data["assigned_to"]) == {None: 0, issue1.owner.id: 1}
+    assert data["tags"] == [("foo", 1)]
+
+    data = filters.get_issues_filters_data(project, {"assigned_to": [None], "tags": ["bar"]})
+
+    assert dict(data["statuses"])[issue1.status.id] == 1
+    assert dict(data["statuses"])[closed_status.id] == 0
+    assert dict(data["assigned_to"]) == {None: 1, issue1.owner.id: 0}
+    assert data["tags"] == [("bar", 1), ("foo", 1)]
+
+
+def test_issue_filters_data_api_uses_active_filters(client):
+    issue = f.create_issue()
+    project = issue.project
+    f.MembershipFactory.create(project=project, user=issue.owner)
+    f.IssueFactory.create(project=project, owner=f.UserFactory.create(), status=issue.status,
+                          severity=issue.severity, priority=issue.priority, type=issue.type)
+    client.login(issue.owner)
+
+    url = reverse("projects-issue-filters-data", args=[project.pk])
+    response = client.get(url + "?owner={}".format(issue.owner.id))
+    assert response.status_code == 200
+
+    data = json.loads(response.content.decode("utf-8"))
+    assert dict(map(tuple, data["statuses"]))[issue.status.id] == 1
+
+
+def test_issues_filters_data_ignores_boolean_values():
+    issue = f.create_issue()
+    project = issue.project
+
+    data = filters.get_issues_filters_data(project, {"status": [True], "owner": [False, issue.owner.id]})
+
+    assert dict(data["statuses"])[issue.status.id] == 1
+    assert dict(data["types"])[issue.type.id] == 1
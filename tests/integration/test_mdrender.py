@@ -17,9 +17,19 @@
 
 import pytest
 
-from taiga.mdrender.service import render, render_and_extract
+from django.core.management import call_command
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from unittest.mock import MagicMock
+from taiga.mdrender import service
+from taiga.mdrender.cache import render_cache
+from taiga.mdrender.service import render, render_field, render_many, render_and_extract
+from taiga.base.utils.original_values import get_original_values
+from taiga.mdrender.service import render_fields, invalidate_stored_renders
+from taiga.projects.userstories.models import UserStory
+
+from unittest.mock import patch, MagicMock
 
 from .. import factories
 
@@ -46,3 +56,181 @@ def test_render_and_extract_mentions():
     user = factories.UserFactory(username="user1", full_name="test")
     (_, extracted) = render_and_extract(dummy_project, "**@user1**")
     assert extracted['mentions'] == [user]
+
+
+def test_render_many_resolves_mentions_and_references_in_bulk():
+    project = factories.ProjectFactory.create()
+    users = [factories.UserFactory.create() for i in range(3)]
+    uss = [factories.UserStoryFactory.create(project=project) for i in range(3)]
+
+    texts = ["@{} see #{} (batch)".format(user.username, us.ref) for user, us in zip(users, uss)]
+    texts.append("@notvaliduser and #99999 (batch)")
+
+    with CaptureQueriesContext(connection) as ctx:
+        results = render_many(project, texts)
+
+    # users, references + content types and the user stories
+    assert len(ctx.captured_queries) == 3
+    assert results == [render(project, text) for text in texts]
+    assert "&commat;{}".format(users[0].username) in results[0]
+    assert "&num;{}".format(uss[0].ref) in results[0]
+    assert results[3] == "<p>@notvaliduser and #99999 (batch)</p>"
+
+    with CaptureQueriesContext(connection) as ctx:
+        render_many(project, texts)
+
+    assert len(ctx.captured_queries) == 0
+
+
+def test_renders_are_invalidated_when_referenced_subject_changes():
+    project = factories.ProjectFactory.create()
+    us = factories.UserStoryFactory.create(project=project, subject="old subject")
+    text = "See #{} (invalidation)".format(us.ref)
+
+    assert "old subject" in render(project, text)
+
+    version = render_cache.get_version(project.id)
+    us.save()
+    assert render_cache.get_version(project.id) == version
+
+    us.subject = "new subject"
+    us.save()
+    assert render_cache.get_version(project.id) == version + 1
+    assert "new subject" in render(project, text)
+
+
+def test_description_html_is_stored_on_save():
+    us = factories.UserStoryFactory.create(description="**stored**")
+    assert us.description_html == "<p><strong>stored</strong></p>"
+
+    us.description = "**changed**"
+    us.save()
+    us = UserStory.objects.get(pk=us.pk)
+    assert us.description_html == "<p><strong>changed</strong></p>"
+
+
+def test_stored_html_is_invalidated_when_referenced_subject_changes():
+    project = factories.ProjectFactory.create()
+    us1 = factories.UserStoryFactory.create(project=project, subject="old subject")
+    us2 = factories.UserStoryFactory.create(project=project, description="See #{}".format(us1.ref))
+    us3 = factories.UserStoryFactory.create(project=project, description="Nothing")
+    assert "old subject" in us2.description_html
+
+    us1.subject = "new subject"
+    us1.save()
+
+    us2 = UserStory.objects.get(pk=us2.pk)
+    assert us2.description_html is None
+    assert UserStory.objects.get(pk=us3.pk).description_html == "<p>Nothing</p>"
+
+    assert "new subject" in render_field(us2, "description")
+    assert "new subject" in UserStory.objects.get(pk=us2.pk).description_html
+
+
+def test_stale_stored_htmls_are_stored_in_bulk():
+    project = factories.ProjectFactory.create()
+    factories.UserStoryFactory.create_batch(5, project=project)
+    UserStory.objects.filter(project=project).update(description_html=None, blocked_note_html=None)
+    user_stories = list(UserStory.objects.filter(project=project))
+
+    with CaptureQueriesContext(connection) as ctx:
+        render_fields(user_stories, "description", "blocked_note")
+
+    updates = [query for query in ctx.captured_queries if query["sql"].lstrip().startswith("UPDATE")]
+    assert len(updates) == 2
+    assert all(us.description_html for us in UserStory.objects.filter(project=project))
+
+
+def test_stored_renders_invalidation_matches_whole_refs():
+    project = factories.ProjectFactory.create()
+    us1 = factories.UserStoryFactory.create(project=project, description="See #1")
+    us2 = factories.UserStoryFactory.create(project=project, description="See #12")
+
+    invalidate_stored_renders(project.id, contains=["#1"])
+
+    assert UserStory.objects.get(pk=us1.pk).description_html is None
+    assert UserStory.objects.get(pk=us2.pk).description_html is not None
+
+
+def test_new_objects_only_invalidate_renders_referencing_them():
+    project = factories.ProjectFactory.create()
+    us1 = factories.UserStoryFactory.create(project=project)
+    us2 = factories.UserStoryFactory.create(project=project, description="See #{}".format(us1.ref + 3))
+    us3 = factories.UserStoryFactory.create(project=project, description="See #{}".format(us1.ref))
+
+    version = render_cache.get_version(project.id)
+    us4 = factories.UserStoryFactory.create(project=project)
+    assert us4.ref == us1.ref + 3
+
+    assert render_cache.get_version(project.id) == version
+    assert UserStory.objects.get(pk=us2.pk).description_html is None
+    assert UserStory.objects.get(pk=us3.pk).description_html is not None
+
+
+def test_nested_user_stories_are_rendered_in_bulk(client):
+    user = factories.UserFactory.create()
+    project = factories.ProjectFactory.create(owner=user)
+    factories.MembershipFactory.create(project=project, user=user)
+    milestone = factories.MilestoneFactory.create(project=project, owner=user)
+    for counter in range(4):
+        factories.UserStoryFactory.create(project=project, milestone=milestone, owner=user,
+                                          description="**{}** @{}".format(counter, user.username))
+    UserStory.objects.filter(project=project).update(description_html=None)
+    render_cache.bump_version(project.id)
+
+    client.login(user)
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(reverse("milestones-detail", args=[milestone.pk]))
+
+    assert response.status_code == 200
+    queries = [query["sql"] for query in ctx.captured_queries]
+    updates = [sql for sql in queries if sql.lstrip().startswith("UPDATE") and "userstories_userstory" in sql]
+    mentions = [sql for sql in queries if '"users_user"."username" IN' in sql]
+    assert len(updates) == 1
+    assert len(mentions) == 1
+    assert all("<strong>" in us["description_html"] for us in response.data["user_stories"])
+    assert all(us.description_html for us in UserStory.objects.filter(project=project))
+
+
+def test_new_objects_references_invalidation_is_deferred(settings):
+    settings.MDRENDER_NEW_REFERENCES_INVALIDATION_DELAY = 5
+    project = factories.ProjectFactory.create()
+
+    with patch("taiga.mdrender.service.apply_async") as apply_async_mock:
+        us = factories.UserStoryFactory.create(project=project)
+
+    apply_async_mock.assert_called_once_with("mdrender.invalidate_new_references_renders",
+                                             (project.id, [us.ref]), countdown=5)
+
+def test_rerender_markdown_command():
+    project = factories.ProjectFactory.create()
+    us1, us2, us3 = factories.UserStoryFactory.create_batch(3, project=project, description="**Some** text")
+    UserStory.objects.filter(pk=us1.pk).update(description_html=None)
+    UserStory.objects.filter(pk=us2.pk).update(description_html="<p>stale</p>")
+
+    with patch("taiga.mdrender.service._store_htmls", wraps=service._store_htmls) as store_htmls_mock:
+        call_command("rerender_markdown", projects=[project.id])
+
+    html = render(project, "**Some** text")
+    assert all(us.description_html == html for us in UserStory.objects.filter(project=project))
+
+    stored = {(model_cls, field_name, obj.pk)
+              for (model_cls, field_name, items), kwargs in store_htmls_mock.call_args_list
+              for obj, text, stored_html in items}
+    assert stored == {(UserStory, "description", us1.pk), (UserStory, "description", us2.pk)}
+
+
+def test_original_values_are_tracked_without_queries():
+    us = factories.UserStoryFactory.create(subject="old subject")
+    us = UserStory.objects.get(pk=us.pk)
+    us.subject = "new subject"
+
+    with CaptureQueriesContext(connection) as queries:
+        original_values = get_original_values(us, "subject", "ref", "project", "tags")
+
+    assert len(queries) == 0
+    assert original_values["subject"] == "old subject"
+    assert original_values["project"] == us.project_id
+
+    us.save()
+    assert get_original_values(us, "subject")["subject"] == "new subject"
@@ -0,0 +1,115 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import datetime
+
+import pytest
+
+from django.contrib.contenttypes.models import ContentType
+from django.core import serializers
+from django.utils import timezone
+
+from reversion.models import Revision, Version
+
+from taiga.projects.history import services
+from taiga.projects.history.models import HistoryEntry, LastSnapshot, HistoryMigrationCheckpoint
+from taiga.projects.history.management.commands.migrate_history import migrate_model
+
+from .. import factories as f
+
+pytestmark = pytest.mark.django_db
+
+
+def _make_versions(obj, descriptions):
+    """
+    Create a reversion revision of the object for each description,
+    one day apart. Returns the dates of the revisions.
+    """
+    content_type = ContentType.objects.get_for_model(obj)
+    start = timezone.now() - datetime.timedelta(days=len(descriptions))
+    dates = []
+
+    for counter, description in enumerate(descriptions):
+        obj.description = description
+        date = start + datetime.timedelta(days=counter)
+
+        revision = Revision.objects.create(user=obj.owner, comment="")
+        Revision.objects.filter(pk=revision.pk).update(date_created=date)
+        Version.objects.create(revision=revision, object_id=str(obj.pk), object_id_int=obj.pk,
+                               content_type=content_type, format="json",
+                               serialized_data=serializers.serialize("json", [obj]),
+                               object_repr=str(obj))
+        dates.append(date)
+
+    return dates
+
+
+def _get_entries(obj):
+    key = services.make_key_from_model_object(obj)
+    return list(HistoryEntry.objects.filter(key=key).order_by("created_at"))
+
+
+def test_migrate_history_across_chunks(settings):
+    settings.MAX_PARTIAL_DIFFS = 1
+
+    issue1 = f.create_issue()
+    issue2 = f.create_issue()
+    dates1 = _make_versions(issue1, ["desc0", "desc1", "desc2", "desc3"])
+    dates2 = _make_versions(issue2, ["desc0", "desc1"])
+
+    # The versions of the first issue span two chunks
+    assert migrate_model("issues.issue", batch_size=3) == ("issues.issue", 6)
+
+    entries = _get_entries(issue1)
+    assert [entry.created_at for entry in entries] == dates1
+    assert [entry.is_snapshot for entry in entries] == [True, False, True, False]
+    assert entries[1].diff["description"] == ["desc0", "desc1"]
+    assert [entry.created_at for entry in _get_entries(issue2)] == dates2
+
+    state = LastSnapshot.objects.get(key=services.make_key_from_model_object(issue1))
+    assert state.partial_diffs == 1
+    assert state.snapshot["description"] == "desc3"
+
+    checkpoint = HistoryMigrationCheckpoint.objects.get(typename="issues.issue")
+    assert checkpoint.last_object_id == issue2.id
+
+
+def test_migrate_history_resumes_from_checkpoint():
+    issue1 = f.create_issue()
+    issue2 = f.create_issue()
+    _make_versions(issue1, ["desc0", "desc1"])
+    _make_versions(issue2, ["desc0", "desc1"])
+
+    HistoryMigrationCheckpoint.objects.create(typename="issues.issue", last_object_id=issue1.id)
+
+    assert migrate_model("issues.issue") == ("issues.issue", 2)
+    assert _get_entries(issue1) == []
+    assert len(_get_entries(issue2)) == 2
+    assert HistoryMigrationCheckpoint.objects.get(typename="issues.issue").last_object_id == issue2.id
+
+
+def test_migrate_history_skips_removed_objects():
+    issue1 = f.create_issue()
+    issue2 = f.create_issue()
+    _make_versions(issue1, ["desc0", "desc1"])
+    _make_versions(issue2, ["desc0"])
+    issue1_key = services.make_key_from_model_object(issue1)
+    issue1.project.delete()
+
+    assert migrate_model("issues.issue") == ("issues.issue", 1)
+    assert not HistoryEntry.objects.filter(key=issue1_key).exists()
+    assert not LastSnapshot.objects.filter(key=issue1_key).exists()
+    assert len(_get_entries(issue2)) == 1
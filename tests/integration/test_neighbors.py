@@ -20,6 +20,9 @@ from unittest import mock
 
 import pytest
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from taiga.projects.userstories.models import UserStory
 from taiga.projects.issues.models import Issue
 from taiga.base import tags
@@ -327,3 +330,58 @@ class TestIssues:
         assert issue1_neighbors.right == issue2
         assert issue3_neighbors.left == issue2
         assert issue3_neighbors.right is None
+
+
+@pytest.mark.django_db
+class TestNeighborsEngines:
+    def test_window_functions_query(self):
+        project = f.ProjectFactory.create()
+        milestone = f.MilestoneFactory.create(project=project)
+
+        us1 = f.UserStoryFactory.create(project=project, milestone=milestone)
+        f.UserStoryFactory.create(project=project)
+        us2 = f.UserStoryFactory.create(project=project, milestone=milestone)
+        us3 = f.UserStoryFactory.create(project=project, milestone=milestone)
+
+        milestone_user_stories = UserStory.objects.filter(milestone=milestone).distinct()
+
+        with CaptureQueriesContext(connection) as context:
+            neighbors = n.get_neighbors(us2, results_set=milestone_user_stories)
+
+        assert neighbors == (us1, us3)
+        assert len(context.captured_queries) == 2
+        assert "LAG" in context.captured_queries[0]["sql"]
+        assert "OVER (ORDER BY ordered.neighbor_position)" in context.captured_queries[0]["sql"]
+
+    def test_same_results_than_filters(self):
+        project = f.ProjectFactory.create()
+        severity1 = f.SeverityFactory.create(project=project, order=1)
+        severity2 = f.SeverityFactory.create(project=project, order=2)
+
+        issues = [f.IssueFactory.create(project=project, severity=severity)
+                  for severity in (severity2, severity1, severity1, severity2)]
+        results_set = Issue.objects.filter(project=project).order_by("-severity")
+
+        for issue in issues:
+            assert (n._get_neighbors_with_window_functions(issue, results_set) ==
+                    n._get_neighbors_with_filters(issue, results_set))
+
+    def test_fallback_when_object_is_not_in_results_set(self):
+        project = f.ProjectFactory.create()
+        milestone = f.MilestoneFactory.create(project=project)
+
+        us1 = f.UserStoryFactory.create(project=project, milestone=milestone)
+        us2 = f.UserStoryFactory.create(project=project)
+        us3 = f.UserStoryFactory.create(project=project, milestone=milestone)
+
+        milestone_user_stories = UserStory.objects.filter(milestone=milestone)
+
+        assert n._get_neighbors_with_window_functions(us2, milestone_user_stories) is None
+        assert n.get_neighbors(us2, results_set=milestone_user_stories) == (us1, us3)
+
+    def test_fallback_for_unsupported_results_sets(self):
+        us = f.UserStoryFactory.create()
+
+        assert n._can_use_window_functions(us, UserStory.objects.all())
+        assert not n._can_use_window_functions(us, UserStory.objects.all()[:10])
+        assert not n._can_use_window_functions(us, UserStory.objects.order_by("?"))
@@ -15,17 +15,28 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import datetime
 import json
 import pytest
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.db.models.loading import get_model
 from .. import factories as f
 
+from taiga.base import exceptions as exc
+from taiga.mdrender import service as mdrender_service
 from taiga.projects.history import services
+from taiga.projects.history import freeze_impl
+from taiga.projects.history import deferred
 from taiga.projects.history.models import HistoryEntry
+from taiga.projects.history.models import ArchivedHistoryEntry
+from taiga.projects.history.models import LastSnapshot
+from taiga.projects.history.models import PendingHistoryEntry
 from taiga.projects.history.choices import HistoryType
 
 
@@ -137,6 +148,52 @@ def test_real_snapshot_frequency(settings):
     assert qs_partials.count() == 2
 
 
+def test_last_snapshot_is_maintained(settings):
+    settings.MAX_PARTIAL_DIFFS = 2
+
+    issue = f.IssueFactory.create()
+    key = services.make_key_from_model_object(issue)
+
+    for counter in range(4):
+        issue.description = "desc{}".format(counter)
+        issue.save()
+        services.take_snapshot(issue, user=issue.owner)
+
+    state = LastSnapshot.objects.get(key=key)
+    assert state.snapshot["description"] == "desc3"
+    assert state.partial_diffs == 0
+
+    fobj, need_real_snapshot = services.get_last_snapshot_for_key(key)
+    assert fobj.snapshot["description"] == "desc3"
+    assert need_real_snapshot is False
+
+
+def test_last_snapshot_fallback_to_entries():
+    issue = f.IssueFactory.create()
+    key = services.make_key_from_model_object(issue)
+
+    services.take_snapshot(issue, user=issue.owner)
+    issue.description = "foo1"
+    issue.save()
+    services.take_snapshot(issue, user=issue.owner)
+
+    # Keys with history previous to LastSnapshot table
+    # are rebuilt from history entries.
+    LastSnapshot.objects.all().delete()
+
+    fobj, need_real_snapshot = services.get_last_snapshot_for_key(key)
+    assert fobj.snapshot["description"] == "foo1"
+    assert need_real_snapshot is False
+
+    issue.description = "foo2"
+    issue.save()
+    services.take_snapshot(issue, user=issue.owner)
+
+    state = LastSnapshot.objects.get(key=key)
+    assert state.snapshot["description"] == "foo2"
+    assert state.partial_diffs == 2
+
+
 def test_issue_resource_history_test(client):
     user = f.UserFactory.create()
     project = f.ProjectFactory.create(owner=user)
@@ -174,3 +231,352 @@ def test_issue_resource_history_test(client):
     assert qs_created.count() == 1
     assert qs_changed.count() == 0
     assert qs_deleted.count() == 1
+
+
+def test_deferred_snapshots_keep_order():
+    issue = f.IssueFactory.create()
+
+    with patch("taiga.projects.history.services.call_async") as call_async_mock:
+        services.defer_snapshot(issue, user=issue.owner)
+        issue.description = "foo1"
+        issue.save()
+        services.defer_snapshot(issue, user=issue.owner)
+        assert call_async_mock.call_count == 2
+
+    assert HistoryEntry.objects.count() == 0
+
+    # A synchronous snapshot persists pending entries first
+    services.take_snapshot(issue, user=issue.owner, delete=True)
+
+    entries = list(HistoryEntry.objects.order_by("created_at"))
+    assert [e.type for e in entries] == [HistoryType.create, HistoryType.change, HistoryType.delete]
+    assert entries[1].diff["description"][1] == "foo1"
+    assert PendingHistoryEntry.objects.count() == 0
+
+
+def test_flushed_deferred_snapshots_are_notified():
+    issue = f.IssueFactory.create()
+
+    with patch("taiga.projects.history.services.call_async"):
+        services.defer_snapshot(issue, user=issue.owner)
+
+    with patch("taiga.projects.history.services.notifications_services") as notifications_mock:
+        entry = services.take_snapshot(issue, user=issue.owner, delete=True)
+
+    flushed_entry = HistoryEntry.objects.get(type=HistoryType.create)
+    notifications_mock.send_history_notifications.assert_called_once_with(issue, flushed_entry)
+    assert entry.type == HistoryType.delete
+
+
+def test_uncommitted_deferred_snapshots_are_persisted_by_the_sweeper(settings):
+    settings.HISTORY_PENDING_ENTRIES_MAX_AGE = 60
+    issue = f.IssueFactory.create()
+
+    with patch("taiga.projects.history.services.call_async"):
+        pending = services.defer_snapshot(issue, user=issue.owner)
+
+    # The retries are exhausted while the transaction is in progress
+    with patch("taiga.projects.history.services._is_pending_entry_uncommitted", return_value=True) as m:
+        deferred.persist_pending_entries.apply((pending.key, pending.id))
+
+    assert m.call_count == deferred.persist_pending_entries.max_retries + 1
+    assert HistoryEntry.objects.count() == 0
+
+    deferred.persist_stale_pending_entries.apply()
+    assert HistoryEntry.objects.count() == 0
+
+    created_at = timezone.now() - datetime.timedelta(seconds=120)
+    PendingHistoryEntry.objects.filter(pk=pending.pk).update(created_at=created_at)
+
+    with patch("taiga.projects.history.deferred.notifications_services") as notifications_mock:
+        deferred.persist_stale_pending_entries.apply()
+
+    entry = HistoryEntry.objects.get(type=HistoryType.create)
+    notifications_mock.send_history_notifications.assert_called_once_with(issue, entry)
+    assert PendingHistoryEntry.objects.count() == 0
+
+
+def test_issue_resource_deferred_history(client, settings):
+    settings.HISTORY_DEFERRED_SNAPSHOTS = True
+
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user)
+    role = f.RoleFactory.create(project=project)
+    member = f.MembershipFactory.create(project=project, user=user, role=role)
+    issue = f.IssueFactory.create(owner=user, project=project)
+
+    mock_path = "taiga.projects.issues.api.IssueViewSet.pre_conditions_on_save"
+    url = reverse("issues-detail", args=[issue.pk])
+
+    client.login(user)
+
+    with patch(mock_path) as m:
+        data = {"subject": "Fooooo", "version": issue.version}
+        response = client.patch(url, json.dumps(data), content_type="application/json")
+        assert response.status_code == 200
+
+    # Deferred tasks are executed eagerly on tests
+    assert HistoryEntry.objects.filter(type=HistoryType.create).count() == 1
+    assert PendingHistoryEntry.objects.count() == 0
+
+
+def _count_freeze_queries(obj):
+    with CaptureQueriesContext(connection) as ctx:
+        fobj = services.freeze_model_instance(obj)
+
+    assert fobj is not None
+    return len(ctx.captured_queries)
+
+
+def test_project_freezer_queries():
+    project = f.ProjectFactory.create()
+    assert _count_freeze_queries(project) == 1
+
+
+def test_milestone_freezer_queries():
+    milestone = f.MilestoneFactory.create()
+    assert _count_freeze_queries(milestone) == 1
+
+
+def test_userstory_freezer_queries():
+    us = f.UserStoryFactory.create()
+    # Instance with project, role points, watchers and attachments
+    assert _count_freeze_queries(us) == 4
+
+
+def test_issue_freezer_queries():
+    issue = f.IssueFactory.create()
+    # Instance with project, watchers and attachments
+    assert _count_freeze_queries(issue) == 3
+
+
+def test_task_freezer_queries():
+    task = f.TaskFactory.create()
+    assert _count_freeze_queries(task) == 3
+
+
+def test_wikipage_freezer_queries():
+    wiki = f.WikiPageFactory.create()
+    assert _count_freeze_queries(wiki) == 3
+
+
+def test_freeze_reuses_rendered_description():
+    issue = f.IssueFactory.create()
+    issue.__class__.objects.filter(pk=issue.pk).update(description_html=None)
+    issue = issue.__class__.objects.get(pk=issue.pk)
+
+    with patch("taiga.mdrender.service.render") as render_mock:
+        render_mock.return_value = "<p>rendered</p>"
+        mdrender_service.render_field(issue, "description")
+        fobj = services.freeze_model_instance(issue)
+
+    assert render_mock.call_count == 1
+    assert fobj.snapshot["description_html"] == "<p>rendered</p>"
+
+
+def test_freeze_uses_stored_description_html():
+    issue = f.IssueFactory.create()
+
+    with patch("taiga.mdrender.service.render") as render_mock:
+        fobj = services.freeze_model_instance(issue)
+
+    assert render_mock.call_count == 0
+    assert fobj.snapshot["description_html"] == issue.description_html
+
+
+def test_project_values_are_cached_and_invalidated():
+    issue = f.create_issue()
+    project = issue.project
+
+    values = freeze_impl.get_project_values(project)
+    assert values["projects.issuestatus"][str(issue.status.id)] == issue.status.name
+
+    with CaptureQueriesContext(connection) as ctx:
+        freeze_impl.get_project_values(project)
+    assert len(ctx.captured_queries) == 0
+
+    issue.status.name = "Renamed status"
+    issue.status.save()
+
+    values = freeze_impl.get_project_values(project)
+    assert values["projects.issuestatus"][str(issue.status.id)] == "Renamed status"
+
+
+def test_project_values_are_invalidated_when_members_are_deleted():
+    project = f.ProjectFactory.create()
+    user = f.UserFactory.create()
+    f.MembershipFactory.create(project=project, user=user)
+
+    user_id = str(user.pk)
+    assert user_id in freeze_impl.get_project_values(project)["users.user"]
+
+    user.delete()
+
+    assert user_id not in freeze_impl.get_project_values(project)["users.user"]
+
+
+def test_project_values_are_not_invalidated_on_login():
+    project = f.ProjectFactory.create()
+    user = f.UserFactory.create()
+    f.MembershipFactory.create(project=project, user=user)
+    freeze_impl.get_project_values(project)
+
+    user.last_login = timezone.now()
+    with CaptureQueriesContext(connection) as ctx:
+        user.save(update_fields=["last_login"])
+
+    assert not [query for query in ctx.captured_queries if "projects_membership" in query["sql"]]
+
+    user.full_name = "Renamed user"
+    user.save(update_fields=["full_name"])
+
+    assert freeze_impl.get_project_values(project)["users.user"][str(user.pk)] == "Renamed user"
+
+
+def test_issue_values_resolution():
+    issue = f.create_issue()
+    project = issue.project
+    new_status = f.IssueStatusFactory.create(project=project)
+    outsider = f.UserFactory.create()
+
+    diff = {"status": [issue.status.id, new_status.id],
+            "assigned_to": [None, outsider.id]}
+    values = freeze_impl.issue_values(diff, project=project)
+
+    assert values["status"] == {str(issue.status.id): issue.status.name,
+                                str(new_status.id): new_status.name}
+    # Users that are not project members are resolved too
+    assert values["users"] == {str(outsider.id): outsider.get_full_name()}
+
+
+def test_values_diff_is_precomputed():
+    issue = f.create_issue()
+    services.take_snapshot(issue, user=issue.owner)
+
+    issue.status = f.IssueStatusFactory.create(project=issue.project)
+    issue.save()
+    entry = services.take_snapshot(issue, user=issue.owner)
+
+    entry = HistoryEntry.objects.get(pk=entry.pk)
+    assert entry.values_diff_cache["status"][1] == issue.status.name
+    assert entry.values_diff == entry.values_diff_cache
+
+
+def test_history_cursor_pagination():
+    issue = f.IssueFactory.create()
+    services.take_snapshot(issue, user=issue.owner)
+
+    for counter in range(5):
+        issue.description = "desc{}".format(counter)
+        issue.save()
+        services.take_snapshot(issue, user=issue.owner)
+
+    qs = services.get_history_queryset_by_model_instance(issue)
+    expected = list(qs.order_by("-created_at", "-id"))
+    assert len(expected) == 5
+
+    entries, cursor = services.get_history_page_by_cursor(qs, None, limit=2)
+    assert entries == expected[:2]
+    assert cursor is not None
+
+    entries, cursor = services.get_history_page_by_cursor(qs, cursor, limit=2)
+    assert entries == expected[2:4]
+
+    entries, cursor = services.get_history_page_by_cursor(qs, cursor, limit=2)
+    assert entries == expected[4:]
+    assert cursor is None
+
+
+def test_history_invalid_cursor():
+    issue = f.IssueFactory.create()
+    qs = services.get_history_queryset_by_model_instance(issue)
+
+    with pytest.raises(exc.WrongArguments):
+        services.get_history_page_by_cursor(qs, "invalid", limit=2)
+
+
+def _make_changes(issue, count):
+    for counter in range(count):
+        issue.description = "desc{}".format(counter)
+        issue.save()
+        services.take_snapshot(issue, user=issue.owner)
+
+
+def test_compact_history_keeps_latest_snapshot(settings):
+    settings.MAX_PARTIAL_DIFFS = 1
+
+    issue = f.IssueFactory.create()
+    key = services.make_key_from_model_object(issue)
+    _make_changes(issue, 6)
+
+    qs_snapshots = HistoryEntry.objects.filter(key=key, is_snapshot=True)
+    assert qs_snapshots.count() == 3
+
+    before = services.get_last_snapshot_for_key(key)
+    stats = services.compact_history_keys([key], checkpoint_window=4)
+
+    # The first one (window start) and the latest one are kept
+    assert stats["snapshots"] == 1
+    assert stats["checkpoints"] == 0
+    assert qs_snapshots.count() == 2
+    assert HistoryEntry.objects.filter(key=key).count() == 6
+    assert services.get_last_snapshot_for_key(key) == before
+
+    # Without materialized state it is rebuilt from the latest checkpoint
+    LastSnapshot.objects.all().delete()
+    assert services.get_last_snapshot_for_key(key)[0] == before[0]
+
+
+def test_compact_history_collapses_partial_chains_into_checkpoints(settings):
+    settings.MAX_PARTIAL_DIFFS = 100
+
+    issue = f.IssueFactory.create()
+    key = services.make_key_from_model_object(issue)
+    _make_changes(issue, 6)
+
+    before = services.get_last_snapshot_for_key(key)
+    stats = services.compact_history_keys([key], checkpoint_window=2)
+
+    entries = list(HistoryEntry.objects.filter(key=key).order_by("created_at"))
+    assert [entry.is_snapshot for entry in entries] == [True, False, True, False, True, False]
+    assert entries[2].snapshot["description"] == "desc2"
+    assert entries[4].snapshot["description"] == "desc4"
+    assert stats["snapshots"] == 0
+    assert stats["checkpoints"] == 2
+    assert stats["bytes"] < 0
+
+    # Without materialized state it is rebuilt from the latest checkpoint
+    LastSnapshot.objects.all().delete()
+    assert services.get_last_snapshot_for_key(key)[0] == before[0]
+
+
+def test_compact_history_of_deleted_objects():
+    issue = f.IssueFactory.create()
+    key = services.make_key_from_model_object(issue)
+    _make_changes(issue, 2)
+
+    assert LastSnapshot.objects.filter(key=key).exists()
+    issue.delete()
+
+    stats = services.compact_history_keys([key])
+
+    # The state of removed objects is not longer needed
+    assert stats["snapshots"] == 1
+    assert stats["bytes"] > 0
+    assert HistoryEntry.objects.filter(key=key, is_snapshot=True).count() == 0
+    assert not LastSnapshot.objects.filter(key=key).exists()
+
+
+def test_compact_history_archive():
+    issue = f.IssueFactory.create()
+    key = services.make_key_from_model_object(issue)
+    _make_changes(issue, 3)
+
+    before = services.get_last_snapshot_for_key(key)
+    archive_before = timezone.now() + datetime.timedelta(days=1)
+    stats = services.compact_history_keys([key], archive_before=archive_before)
+
+    assert stats["archived"] == 3
+    assert HistoryEntry.objects.filter(key=key).count() == 0
+    assert ArchivedHistoryEntry.objects.filter(key=key).count() == 3
+    assert services.get_last_snapshot_for_key(key) == before
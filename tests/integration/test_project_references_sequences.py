@@ -77,3 +77,39 @@ def test_unique_reference_per_project(seq, refmodels):
 
     project.delete()
     assert not seq.exists(seqname)
+
+
+@pytest.mark.django_db
+def test_reference_blocks_are_unique_per_project(seq, refmodels):
+    from taiga.projects.references import services
+
+    project = factories.ProjectFactory.create()
+
+    assert refmodels.make_unique_reference_id(project) == 1
+    assert services.make_unique_reference_ids(project, 3) == [2, 3, 4]
+    assert refmodels.make_unique_reference_id(project) == 5
+
+
+@pytest.mark.django_db
+def test_sequence_exists_check_is_cached(seq, refmodels, monkeypatch):
+    project = factories.ProjectFactory.create()
+    monkeypatch.setattr(seq, "exists", lambda seqname: pytest.fail("sequence looked up"))
+
+    assert refmodels.make_unique_reference_id(project, create=True) == 1
+
+
+@pytest.mark.django_db
+def test_ref_is_stored_by_the_insert():
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    project = factories.ProjectFactory.create()
+
+    with CaptureQueriesContext(connection) as captured:
+        us = factories.UserStoryFactory.create(project=project)
+
+    assert us.ref == 1
+    assert us.__class__.objects.get(pk=us.pk).ref == 1
+    assert project.references.get(ref=us.ref).object_id == us.pk
+    assert not [query for query in captured
+                if query["sql"].startswith("UPDATE") and '"ref"' in query["sql"]]
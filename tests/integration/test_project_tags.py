@@ -0,0 +1,39 @@
+import pytest
+
+from taiga.projects.services import filters
+from taiga.projects.services import tags as tags_services
+
+from .. import factories as f
+
+pytestmark = pytest.mark.django_db
+
+
+def test_project_tags_are_maintained_on_save_and_delete():
+    project = f.ProjectFactory.create()
+    us = f.UserStoryFactory.create(project=project, tags=["Foo", "bar"])
+    issue = f.create_issue(project=project, tags=["foo"])
+    f.TaskFactory.create(project=project, tags=["baz"])
+
+    assert tags_services.get_project_tags(project) == [("bar", 1), ("baz", 1), ("foo", 2)]
+    assert filters.get_all_tags(project) == ["bar", "foo"]
+
+    us.tags = ["bar", "qux"]
+    us.save()
+    assert tags_services.get_project_tags(project) == [("bar", 1), ("baz", 1), ("foo", 1), ("qux", 1)]
+
+    # Saves without the tags field don't change the counters
+    us.tags = ["other"]
+    us.save(update_fields=["subject"])
+    assert tags_services.get_project_tags(project, "user_stories_count") == [("bar", 1), ("qux", 1)]
+
+    issue.delete()
+    us.__class__.objects.get(pk=us.pk).delete()
+    assert tags_services.get_project_tags(project) == [("baz", 1)]
+    assert project.tags_counters.count() == 1
+
+
+def test_issues_filters_tags_are_read_from_project_tags():
+    issue = f.create_issue(tags=["foo", "bar"])
+    f.IssueFactory.create(project=issue.project, tags=["foo"])
+
+    assert filters.get_issues_filters_data(issue.project)["tags"] == [("bar", 1), ("foo", 2)]
@@ -47,3 +47,23 @@ def test_archived_filter(client):
     data = {"is_archived": 1}
     response = client.get(url, data)
     assert len(json.loads(response.content.decode('utf-8'))) == 1
+
+
+def test_neighbors_can_be_skipped(client):
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user)
+    f.MembershipFactory.create(project=project, user=user)
+    user_story_1 = f.UserStoryFactory.create(project=project)
+    user_story_2 = f.UserStoryFactory.create(project=project)
+
+    client.login(user)
+
+    url = reverse("userstories-detail", args=[user_story_2.pk])
+
+    response = client.get(url)
+    data = json.loads(response.content.decode('utf-8'))
+    assert data["neighbors"]["previous"]["id"] == user_story_1.id
+    assert data["neighbors"]["next"] is None
+
+    response = client.get(url, {"neighbors": "false"})
+    assert "neighbors" not in json.loads(response.content.decode('utf-8'))
@@ -16,9 +16,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import pytest
+from unittest.mock import patch
 
 from django.core.urlresolvers import reverse
 
+from taiga.searches import services
+
 from .. import factories as f
 
 
@@ -96,3 +99,55 @@ def test_search_text_query_in_my_project(client, searches_initial_data):
     assert len(response.data["tasks"]) == 1
     assert len(response.data["issues"]) == 0
     assert len(response.data["wikipages"]) == 0
+
+
+def test_search_results_are_ranked():
+    project = f.ProjectFactory.create()
+    us1 = f.UserStoryFactory.create(project=project, subject="Login page",
+                                    description="Users need a new password form")
+    us2 = f.UserStoryFactory.create(project=project, subject="Password recovery",
+                                    description="Send the password by email")
+    f.UserStoryFactory.create(project=project, subject="Other", description="Nothing")
+
+    assert list(services.search_user_stories(project, "password")) == [us2, us1]
+
+
+def test_search_entries_are_updated_on_save_and_delete():
+    project = f.ProjectFactory.create()
+    issue = f.create_issue(project=project, subject="Broken link")
+
+    assert list(services.search_issues(project, "broken")) == [issue]
+
+    issue.subject = "Fixed link"
+    issue.save()
+    assert list(services.search_issues(project, "broken")) == []
+    assert list(services.search_issues(project, "fixed")) == [issue]
+
+    issue.delete()
+    assert project.search_entries.count() == 0
+
+
+def test_search_entries_are_only_updated_when_searchable_fields_change():
+    issue = f.create_issue(subject="Broken link")
+
+    with patch("taiga.searches.services.update_search_entries") as update_mock:
+        issue.tags = ["foo"]
+        issue.save()
+        assert update_mock.call_count == 0
+
+        issue.description = "The link is broken"
+        issue.save()
+        assert update_mock.call_count == 1
+
+
+def test_search_uses_the_project_search_language():
+    project = f.ProjectFactory.create(search_language="simple")
+    wiki_page = f.WikiPageFactory.create(project=project, content="The running dogs")
+
+    # The simple configuration has neither stop words nor stemming
+    assert list(services.search_wiki_pages(project, "the")) == [wiki_page]
+    assert list(services.search_wiki_pages(project, "run")) == []
+
+    project.search_language = "english"
+    project.save()
+    assert list(services.search_wiki_pages(project, "run")) == [wiki_page]
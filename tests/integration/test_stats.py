@@ -0,0 +1,201 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# Copyright (C) 2014 Anler Hernández <hello@anler.me>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import datetime
+import json
+
+import pytest
+
+from django.core.urlresolvers import reverse
+from django.utils import timezone
+
+from taiga.projects.services import stats
+from taiga.projects.milestones import services as milestone_services
+
+from .. import factories as f
+
+pytestmark = pytest.mark.django_db
+
+
+def test_get_stats_for_project_issues():
+    issue1 = f.create_issue()
+    project = issue1.project
+    closed_status = f.IssueStatusFactory.create(project=project, is_closed=True)
+    issue2 = f.IssueFactory.create(project=project, status=closed_status, severity=issue1.severity,
+                                   priority=issue1.priority, type=issue1.type, assigned_to=issue1.owner)
+
+    # Created two days ago
+    two_days_ago = timezone.now() - datetime.timedelta(days=2)
+    issue1.__class__.objects.filter(pk=issue1.pk).update(created_date=two_days_ago)
+
+    result = stats.get_stats_for_project_issues(project)
+
+    assert result["total_issues"] == 2
+    assert result["opened_issues"] == 1
+    assert result["closed_issues"] == 1
+    assert result["issues_per_type"] == {issue1.type.id: {"count": 2, "name": issue1.type.name,
+                                                          "id": issue1.type.id, "color": issue1.type.color}}
+    assert {status_id: data["count"] for status_id, data in result["issues_per_status"].items()} == {
+        issue1.status.id: 1, closed_status.id: 1}
+    assert result["issues_per_assigned_to"][0]["count"] == 1
+    assert result["issues_per_assigned_to"][issue1.owner.id] == {
+        "count": 1, "username": issue1.owner.username, "name": issue1.owner.get_full_name(),
+        "id": issue1.owner.id, "color": issue1.owner.color}
+
+    days = result["last_four_weeks_days"]
+    assert days["by_open_closed"]["open"] == [0] * 25 + [1, 0, 1]
+    assert days["by_open_closed"]["closed"] == [0] * 27 + [1]
+    assert days["by_severity"][issue1.severity.id]["data"] == [0] * 25 + [1, 1, 2]
+    assert days["by_priority"][issue1.priority.id]["data"] == [0] * 25 + [1, 1, 2]
+    assert "count" not in days["by_severity"][issue1.severity.id]
+    assert days["by_status"] == {}
+
+
+def test_project_stats_are_cached_with_etag(client):
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user, total_milestones=2, total_story_points=10)
+    f.MembershipFactory.create(project=project, user=user)
+    client.login(user)
+
+    url = reverse("projects-stats", args=[project.pk])
+
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response["ETag"]
+    assert json.loads(response.content.decode("utf-8"))["total_milestones"] == 2
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    # Updated by the (eager) deferred task
+    f.MilestoneFactory.create(project=project)
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert len(json.loads(response.content.decode("utf-8"))["milestones"]) == 3
+
+
+@pytest.mark.parametrize("change", ["points_value", "us_status_is_closed"])
+def test_project_stats_are_invalidated_when_points_attributes_change(client, change):
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user)
+    f.MembershipFactory.create(project=project, user=user)
+    points = f.PointsFactory.create(project=project, value=3)
+    us_status = project.us_statuses.filter(is_closed=False).first()
+    us = f.UserStoryFactory.create(project=project, status=us_status)
+    f.RolePointsFactory.create(user_story=us, role=f.RoleFactory.create(project=project), points=points)
+    client.login(user)
+
+    url = reverse("projects-stats", args=[project.pk])
+    etag = client.get(url)["ETag"]
+
+    if change == "points_value":
+        points.value = 5
+        points.save()
+    else:
+        us_status.is_closed = True
+        us_status.save()
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+def test_points_per_role_aggregation():
+    project = f.ProjectFactory.create()
+    milestone = f.MilestoneFactory.create(project=project)
+    role1 = f.RoleFactory.create(project=project)
+    role2 = f.RoleFactory.create(project=project)
+
+    us1 = f.UserStoryFactory.create(project=project, milestone=milestone, is_closed=True)
+    us2 = f.UserStoryFactory.create(project=project, milestone=milestone)
+    us3 = f.UserStoryFactory.create(project=project)
+
+    f.RolePointsFactory.create(user_story=us1, role=role1, points=f.PointsFactory.create(project=project, value=3))
+    f.RolePointsFactory.create(user_story=us1, role=role2, points=f.PointsFactory.create(project=project, value=None))
+    f.RolePointsFactory.create(user_story=us2, role=role1, points=f.PointsFactory.create(project=project, value=5))
+    f.RolePointsFactory.create(user_story=us3, role=role2, points=f.PointsFactory.create(project=project, value=1))
+
+    assert milestone.total_points == {role1.id: 8}
+    assert milestone.closed_points == {role1.id: 3}
+    assert project.closed_points == {role1.id: 3}
+    assert project.defined_points == {role1.id: 8, role2.id: 1}
+    assert project.assigned_points == {role1.id: 8}
+    assert us1.get_total_points() == 3
+    assert us3.get_total_points() == 1
+
+
+def test_milestone_burndown():
+    project = f.ProjectFactory.create()
+    today = timezone.now().date()
+    milestone = f.MilestoneFactory.create(project=project, estimated_start=today - datetime.timedelta(days=3),
+                                          estimated_finish=today + datetime.timedelta(days=3))
+    role = f.RoleFactory.create(project=project)
+
+    us1 = f.UserStoryFactory.create(project=project, milestone=milestone)
+    us2 = f.UserStoryFactory.create(project=project, milestone=milestone)
+    us3 = f.UserStoryFactory.create(project=project, milestone=milestone)
+    f.RolePointsFactory.create(user_story=us1, role=role, points=f.PointsFactory.create(project=project, value=3))
+    f.RolePointsFactory.create(user_story=us2, role=role, points=f.PointsFactory.create(project=project, value=5))
+    f.RolePointsFactory.create(user_story=us3, role=role, points=f.PointsFactory.create(project=project, value=2))
+
+    us1.__class__.objects.filter(pk=us1.pk).update(is_closed=True,
+                                                   finish_date=timezone.now() - datetime.timedelta(days=5))
+    us2.__class__.objects.filter(pk=us2.pk).update(is_closed=True, finish_date=timezone.now())
+
+    days = milestone_services.get_stats_for_milestone(milestone)["days"]
+    total_points = sum(milestone.total_points.values())
+
+    assert len(days) == 7
+    assert [day["open_points"] for day in days] == [7, 7, 7, 2, 2, 2, 2]
+    assert [day["open_points"] for day in days] == [
+        total_points - sum(milestone.closed_points_by_date(day["day"]).values()) for day in days]
+    assert days[0]["optimal_points"] == total_points
+    assert milestone.burndown_days.count() == 0
+
+    # The burndown of closed milestones is stored
+    milestone.closed = True
+    milestone.save()
+    assert milestone_services.get_stats_for_milestone(milestone)["days"] == days
+    assert milestone.burndown_days.count() == 7
+    assert milestone_services.get_stats_for_milestone(milestone)["days"] == days
+
+    # and removed when its user stories change
+    us3.save()
+    assert milestone.burndown_days.count() == 0
+
+
+def test_milestone_burndown_is_invalidated_when_user_stories_are_moved():
+    project = f.ProjectFactory.create()
+    today = timezone.now().date()
+    milestone1 = f.MilestoneFactory.create(project=project, estimated_start=today - datetime.timedelta(days=3),
+                                           estimated_finish=today + datetime.timedelta(days=3), closed=True)
+    milestone2 = f.MilestoneFactory.create(project=project, estimated_start=today - datetime.timedelta(days=3),
+                                           estimated_finish=today + datetime.timedelta(days=3), closed=True)
+    us = f.UserStoryFactory.create(project=project, milestone=milestone1)
+
+    milestone_services.get_stats_for_milestone(milestone1)
+    milestone_services.get_stats_for_milestone(milestone2)
+    assert milestone1.burndown_days.count() == 7
+    assert milestone2.burndown_days.count() == 7
+
+    us = us.__class__.objects.get(pk=us.pk)
+    us.milestone = milestone2
+    us.save()
+    assert milestone1.burndown_days.count() == 0
+    assert milestone2.burndown_days.count() == 0
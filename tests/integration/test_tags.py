@@ -1,9 +1,15 @@
+from contextlib import closing
+
 import pytest
 
+from django.db import connection
 from django.db import models
+from django.db.models.loading import get_model
 
 from taiga.base import tags
 
+from .. import factories as f
+
 pytestmark = pytest.mark.django_db
 
 
@@ -26,3 +32,49 @@ def test():
 
     assert list(tags.filter(TaggedModel, index__1="bar")) == [tags1]
     assert list(tags.filter(TaggedModel, index__1="bar", id__isnull=False)) == [tags1]
+
+
+def test_any_all_none():
+    tags1 = TaggedModel.objects.create(tags=["foo", "bar"])
+    tags2 = TaggedModel.objects.create(tags=["foo"])
+    tags3 = TaggedModel.objects.create(tags=[])
+
+    assert list(tags.filter(TaggedModel, all=["foo", "bar"])) == [tags1]
+    assert list(tags.filter(TaggedModel, any="bar,baz")) == [tags1]
+    assert list(tags.filter(TaggedModel, none=["bar"]).order_by("id")) == [tags2, tags3]
+
+
+def _explain(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with closing(connection.cursor()) as cursor:
+        cursor.execute("EXPLAIN ANALYZE " + sql, params)
+        return "\n".join(row[0] for row in cursor.fetchall())
+
+
+@pytest.mark.slow
+def test_benchmark_tags_filters_use_gin_index():
+    user_story_model = get_model("userstories", "UserStory")
+    table = user_story_model._meta.db_table
+    us = f.UserStoryFactory.create(tags=["tag-0"])
+
+    columns = ", ".join('"{}"'.format(field.column) for field in user_story_model._meta.local_fields
+                        if field.column not in ("id", "ref", "tags"))
+    with closing(connection.cursor()) as cursor:
+        # The tests database is not migrated, so the index is created here
+        cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = %s", ["{}_tags_gin".format(table)])
+        if cursor.fetchone() is None:
+            cursor.execute("CREATE INDEX {0}_tags_gin ON {0} USING gin (tags)".format(table))
+
+        cursor.execute("""
+            INSERT INTO {table} ({columns}, "ref", "tags")
+                 SELECT {columns}, i, ARRAY['tag-' || (i % 1000), 'common']
+                   FROM {table}, generate_series(1, 100000) AS i
+                  WHERE id = %s
+        """.format(table=table, columns=columns), [us.id])
+        cursor.execute("ANALYZE {}".format(table))
+
+    for filters, expected_count in (({"all": ["tag-1", "common"]}, 100),
+                                    ({"any": ["tag-1", "tag-2"]}, 200)):
+        qs = tags.filter(user_story_model, **filters)
+        assert "{}_tags_gin".format(table) in _explain(qs)
+        assert qs.count() == expected_count
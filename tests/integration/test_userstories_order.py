@@ -0,0 +1,107 @@
+import pytest
+import json
+
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from taiga.projects.userstories import services
+from taiga.projects.userstories.models import UserStory
+
+from .. import factories as f
+
+pytestmark = pytest.mark.django_db
+
+
+def _get_orders(project):
+    return list(UserStory.objects.filter(project=project)
+                                 .order_by("order", "ref")
+                                 .values_list("id", "order"))
+
+
+def test_move_only_changes_the_moved_user_story():
+    project = f.ProjectFactory.create()
+    us1, us2, us3 = f.UserStoryFactory.create_batch(3, project=project)
+    services.UserStoriesService().rebalance_order(project.id)
+
+    services.UserStoriesService().move(us3, previous=us1, next=us2)
+
+    gap = services.ORDER_GAP
+    assert _get_orders(project) == [(us1.id, gap), (us3.id, gap + gap // 2), (us2.id, 2 * gap)]
+
+
+def test_move_to_the_top_and_to_the_bottom():
+    project = f.ProjectFactory.create()
+    us1, us2 = f.UserStoryFactory.create_batch(2, project=project)
+    services.UserStoriesService().rebalance_order(project.id)
+
+    services.UserStoriesService().move(us2, next=us1)
+    assert [id for id, order in _get_orders(project)] == [us2.id, us1.id]
+
+    services.UserStoriesService().move(us2, previous=us1)
+    assert [id for id, order in _get_orders(project)] == [us1.id, us2.id]
+
+
+def test_move_rebalances_when_there_is_no_gap():
+    project = f.ProjectFactory.create()
+    us1 = f.UserStoryFactory.create(project=project, order=1)
+    us2 = f.UserStoryFactory.create(project=project, order=2)
+    us3 = f.UserStoryFactory.create(project=project, order=3)
+
+    services.UserStoriesService().move(us3, previous=us1, next=us2)
+
+    assert _get_orders(project) == [(us1.id, 1024), (us3.id, 1536), (us2.id, 2048)]
+
+
+def test_move_requests_a_rebalance_when_gaps_run_out():
+    project = f.ProjectFactory.create()
+    us1 = f.UserStoryFactory.create(project=project, order=1)
+    us2 = f.UserStoryFactory.create(project=project, order=3)
+    us3 = f.UserStoryFactory.create(project=project, order=4)
+
+    services.UserStoriesService().move(us3, previous=us1, next=us2)
+
+    # The deferred rebalance runs eagerly on tests
+    assert _get_orders(project) == [(us1.id, 1024), (us3.id, 2048), (us2.id, 3072)]
+
+
+def test_api_move_user_story(client):
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user)
+    f.MembershipFactory.create(project=project, user=user)
+    us1, us2 = f.UserStoryFactory.create_batch(2, project=project)
+    services.UserStoriesService().rebalance_order(project.id)
+
+    client.login(user)
+
+    url = reverse("userstories-move")
+    data = {"userStoryId": us2.id, "previousId": None, "nextId": us1.id}
+    response = client.post(url, json.dumps(data), content_type="application/json")
+
+    assert response.status_code == 200
+    assert [id for id, order in _get_orders(project)] == [us2.id, us1.id]
+
+
+def test_new_user_stories_go_to_the_end_of_the_backlog():
+    project = f.ProjectFactory.create()
+    us1 = f.UserStoryFactory.create(project=project)
+    us2 = f.UserStoryFactory.create(project=project, order=5000)
+    us3 = f.UserStoryFactory.create(project=project)
+    user_stories = services.UserStoriesService().bulk_insert(project, project.owner, "US 1\nUS 2")
+
+    gap = services.ORDER_GAP
+    assert _get_orders(project) == [(us1.id, gap), (us2.id, 5000), (us3.id, 5000 + gap),
+                                    (user_stories[0].id, 5000 + 2 * gap),
+                                    (user_stories[1].id, 5000 + 3 * gap)]
+
+
+def test_new_user_stories_orders_are_locked():
+    project = f.ProjectFactory.create()
+
+    with CaptureQueriesContext(connection) as ctx:
+        f.UserStoryFactory.create(project=project)
+
+    queries = [query["sql"] for query in ctx.captured_queries]
+    lock_index = next(i for i, sql in enumerate(queries) if "pg_advisory_xact_lock" in sql)
+    max_index = next(i for i, sql in enumerate(queries) if 'MAX("userstories_userstory"."order")' in sql)
+    assert lock_index < max_index
@@ -15,8 +15,16 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import random
+import timeit
 from unittest.mock import patch, MagicMock
 
+import pytest
+
+from django.conf import settings
+
+from taiga.mdrender import service
+from taiga.mdrender.cache import RenderCache
 from taiga.mdrender.extensions import emojify
 from taiga.mdrender.service import render, cache_by_sha, get_diff_of_htmls, render_and_extract
 
@@ -191,3 +199,147 @@ def test_render_and_extract_references():
         instance.content_object.subject = "test"
         (_, extracted) = render_and_extract(dummy_project, "**#1**")
         assert extracted['references'] == [instance.content_object]
+
+
+def test_markdown_engines_are_reused_between_projects():
+    other_project = MagicMock()
+    other_project.id = 2
+    other_project.slug = "other"
+
+    with service._get_markdown(dummy_project) as md1:
+        md1.convert("*[HTML]: Hyper Text Markup Language\n\nHTML")
+
+    with service._get_markdown(other_project) as md2:
+        result = md2.convert("[[test]] HTML")
+
+    assert md1 is md2
+    assert md2.project is None
+    assert result == "<p><a class=\"wikilink\" href=\"#/project/other/wiki/test\">test</a> HTML</p>"
+
+
+def test_render_and_extract_data_is_not_shared():
+    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
+        instance = mock.return_value
+        instance.content_type.model = "issue"
+        instance.content_object.subject = "test"
+        (_, extracted1) = render_and_extract(dummy_project, "**#1**")
+        (_, extracted2) = render_and_extract(dummy_project, "**#1**")
+        assert extracted1['references'] == [instance.content_object]
+        assert extracted2['references'] == [instance.content_object]
+
+
+def test_markdown_engines_are_reused():
+    text = "Some **markdown** text with a [[wikilink]] and ~~strike~~ and a www.example.com link"
+    render_uncached = render.__wrapped__
+
+    md = service._make_markdown()
+    md.project = dummy_project
+    md.extracted_data = {"mentions": [], "references": []}
+    expected = md.convert(text)
+
+    with patch.object(service, "_markdown_pool", []), \
+            patch("taiga.mdrender.service._make_markdown", wraps=service._make_markdown) as make_markdown_mock:
+        assert render_uncached(dummy_project, text) == expected
+        assert render_uncached(dummy_project, text) == expected
+        assert len(service._markdown_pool) == 1
+
+    assert make_markdown_mock.call_count == 1
+
+
+@pytest.mark.slow
+def test_benchmark_markdown_engines_pool():
+    text = "Some **markdown** text with a [[wikilink]] and ~~strike~~ and a www.example.com link"
+    render_uncached = render.__wrapped__
+
+    def render_with_new_engine():
+        md = service._make_markdown()
+        md.project = dummy_project
+        md.extracted_data = {"mentions": [], "references": []}
+        return md.convert(text)
+
+    assert render_with_new_engine() == render_uncached(dummy_project, text)
+
+    number = 200
+    new_engine_time = timeit.timeit(render_with_new_engine, number=number)
+    pooled_engine_time = timeit.timeit(lambda: render_uncached(dummy_project, text), number=number)
+
+    assert pooled_engine_time < new_engine_time
+
+
+def test_render_cache_local_tier_is_bounded():
+    render_cache = RenderCache(local_size=2)
+    render_cache.set_many(dummy_project, {"lru-1": "html1", "lru-2": "html2", "lru-3": "html3"})
+
+    assert render_cache.stats["evictions"] == 1
+    assert render_cache.get(dummy_project, "lru-3") == "html3"
+    assert render_cache.get(dummy_project, "lru-1") == "html1"
+    assert render_cache.get(dummy_project, "lru-missing") is None
+    assert render_cache.stats == {"local_hits": 1, "shared_hits": 1, "misses": 1, "evictions": 2}
+
+
+def test_render_cache_project_version():
+    render_cache = RenderCache()
+    render_cache.set(dummy_project, "versioned", "html")
+    assert render_cache.get(dummy_project, "versioned") == "html"
+
+    render_cache.bump_version(dummy_project.id)
+    assert render_cache.get(dummy_project, "versioned") is None
+
+
+def _make_large_document(lines, seed):
+    rnd = random.Random(seed)
+    words = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit"]
+    return "\n".join(" ".join(rnd.choice(words) for i in range(12)) for j in range(lines))
+
+
+def test_get_diff_of_htmls_append_only():
+    result = get_diff_of_htmls("<p>test</p>", "<p>test</p><p>appended</p>")
+    assert result == "<span>&lt;p&gt;test&lt;/p&gt;</span><ins style=\"background:#e6ffe6;\">&lt;p&gt;appended&lt;/p&gt;</ins>"
+
+
+def test_get_diff_of_htmls_is_cached():
+    with patch("taiga.mdrender.service._make_diffs", wraps=service._make_diffs) as make_diffs_mock:
+        result1 = get_diff_of_htmls("<p>cached1</p>", "<p>cached2</p>")
+        result2 = get_diff_of_htmls("<p>cached1</p>", "<p>cached2</p>")
+
+    assert result1 == result2
+    assert make_diffs_mock.call_count == 1
+
+
+def test_get_diff_of_htmls_large_documents_are_diffed_by_lines():
+    # ~35KB documents, with a change every 25 lines
+    old_text = _make_large_document(500, seed=1)
+    lines = old_text.split("\n")
+    for i in range(0, len(lines), 25):
+        lines[i] = "{} changed {}".format(lines[i], i)
+    new_text = "\n".join(lines)
+
+    assert len(old_text) > settings.MDRENDER_DIFF_LINE_MODE_SIZE
+
+    with patch("taiga.mdrender.service.DiffMatchPatch.diff_lines", autospec=True,
+               side_effect=service.DiffMatchPatch.diff_lines) as diff_lines_mock:
+        diffutil, diffs = service._make_diffs(old_text, new_text)
+        service._make_diffs(old_text, new_text + "\nappended")
+
+    # Append only edits skip the diff
+    assert diff_lines_mock.call_count == 1
+    assert diffutil.Diff_Timeout == settings.MDRENDER_DIFF_TIMEOUT
+    assert diffutil.diff_text1(diffs) == old_text
+    assert diffutil.diff_text2(diffs) == new_text
+
+
+@pytest.mark.slow
+def test_benchmark_get_diff_of_htmls_large_documents():
+    # ~200KB documents, with a change every 25 lines
+    old_text = _make_large_document(2500, seed=1)
+    lines = old_text.split("\n")
+    for i in range(0, len(lines), 25):
+        lines[i] = "{} changed {}".format(lines[i], i)
+    new_text = "\n".join(lines)
+
+    number = 3
+    edit_time = timeit.timeit(lambda: service._make_diffs(old_text, new_text), number=number)
+    append_time = timeit.timeit(lambda: service._make_diffs(old_text, new_text + "\nappended"), number=number)
+
+    assert edit_time / number < 2
+    assert append_time < edit_time